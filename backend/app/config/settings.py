@@ -9,12 +9,14 @@ Loads environment variables and defines project-wide constants for:
 """
 
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Literal, Optional
 
-from opensearchpy import OpenSearch
 from pydantic import Field, computed_field
 from pydantic_settings import BaseSettings
 
+if TYPE_CHECKING:
+    from opensearchpy import AsyncOpenSearch, OpenSearch
+
 
 class AppSettings(BaseSettings):
     """
@@ -33,6 +35,14 @@ class AppSettings(BaseSettings):
     FRONTEND_ORIGIN: str = Field(
         default="http://localhost:3000", description="Frontend URL for CORS"
     )
+    ENABLED_FEATURES: List[Literal["chat", "search", "csv_chat"]] = Field(
+        default=["chat", "search", "csv_chat"],
+        description=(
+            "API features served by this deployment: rulebook RAG chat, "
+            "OpenSearch document search and CSV chat. Disabled features' "
+            "routers and dependencies are never imported"
+        ),
+    )
 
     PDF_PARSER_SERVICE_URL: str = Field(
         default="http://localhost:8001/api/parse", description="PDF parser service URL"
@@ -52,6 +62,33 @@ class AppSettings(BaseSettings):
     CHUNK_OVERLAP: int = Field(
         default=100, ge=0, description="Overlap between text chunks"
     )
+    INGESTION_WORKERS: int = Field(
+        default=4,
+        ge=1,
+        description="Worker processes for parallel PDF parsing during index builds",
+    )
+    INDEX_STORAGE_FORMAT: Literal["json", "mmap"] = Field(
+        default="json",
+        description=(
+            "Format indexes are loaded from for querying: the default LlamaIndex "
+            "JSON storage, or an additional memory-mapped float32 layout"
+        ),
+    )
+    HRAG_PARTITIONED: bool = Field(
+        default=False,
+        description=(
+            "Persist the HRAG index as one sub-index per rulebook file and route "
+            "queries to the selected volumes' partitions"
+        ),
+    )
+    INDEX_VERSIONS_RETAINED: int = Field(
+        default=2,
+        ge=2,
+        description=(
+            "Index versions kept on disk per index, including the active one; "
+            "older versions are deleted after each successful build"
+        ),
+    )
 
     # LLM runtime parameters
     LLM_MAX_TOKENS: int = Field(
@@ -62,6 +99,151 @@ class AppSettings(BaseSettings):
     )
     LLM_CONTEXT_SIZE: int = Field(default=200000, description="Context size for LLM")
 
+    # Volume selection
+    VOLUME_SCORING_MODE: Literal["parallel", "batched", "embedding"] = Field(
+        default="parallel",
+        description=(
+            "Volume ranking strategy: one LLM call per volume ('parallel'), "
+            "a single JSON-scored prompt covering all volumes ('batched'), "
+            "or cosine similarity against precomputed description embeddings "
+            "('embedding')"
+        ),
+    )
+    VOLUME_SCORING_CONCURRENCY: int = Field(
+        default=8, gt=0, description="Maximum concurrent volume scoring LLM calls"
+    )
+    VOLUME_SCORING_TIMEOUT: float = Field(
+        default=20.0, gt=0, description="Timeout in seconds per volume scoring call"
+    )
+    VOLUME_FILTER_MIN_RESULTS: int = Field(
+        default=3,
+        ge=0,
+        description=(
+            "Minimum nodes retrieved from the selected volumes before falling "
+            "back to a search over all volumes"
+        ),
+    )
+
+    # Auto-merging retrieval
+    HRAG_AUTO_MERGE: bool = Field(
+        default=True,
+        description=(
+            "Replace retrieved sibling leaf chunks with their parent node in HRAG "
+            "retrieval"
+        ),
+    )
+    HRAG_MERGE_RATIO_THRESHOLD: float = Field(
+        default=0.5,
+        ge=0,
+        lt=1,
+        description=(
+            "Fraction of a parent's children that must be retrieved for them to "
+            "be merged into the parent"
+        ),
+    )
+
+    # Vector search backend
+    VECTOR_BACKEND: Literal["simple", "numpy", "faiss_ivf", "faiss_hnsw"] = Field(
+        default="simple",
+        description=(
+            "Similarity search used by the query engines: LlamaIndex's "
+            "SimpleVectorStore ('simple'), exact NumPy matrix search ('numpy'), "
+            "or approximate FAISS IVF / HNSW search. Compact memory-mapped "
+            "indexes treat 'simple' as 'numpy'"
+        ),
+    )
+    FAISS_MIN_NODES: int = Field(
+        default=5000,
+        ge=0,
+        description="Indexes smaller than this use exact search with FAISS backends",
+    )
+    FAISS_IVF_NLIST: int = Field(
+        default=0,
+        ge=0,
+        description="IVF inverted lists (0 = 4 * sqrt(number of nodes))",
+    )
+    FAISS_IVF_NPROBE: int = Field(
+        default=16, gt=0, description="IVF lists probed per query"
+    )
+    FAISS_HNSW_M: int = Field(default=32, gt=0, description="HNSW graph degree")
+    FAISS_HNSW_EF_SEARCH: int = Field(
+        default=64, gt=0, description="HNSW candidate list size per query"
+    )
+
+    # Query execution
+    QUERY_WORKERS: int = Field(
+        default=8,
+        gt=0,
+        description=(
+            "Threads running blocking retrieval and LLM synthesis for RAG queries"
+        ),
+    )
+    QUERY_MAX_IN_FLIGHT: int = Field(
+        default=32,
+        gt=0,
+        description=(
+            "Maximum RAG queries admitted at once; further queries are rejected "
+            "with 503 until one completes"
+        ),
+    )
+
+    # Startup warm-up
+    WARMUP_ENABLED: bool = Field(
+        default=True,
+        description=(
+            "Run synthetic requests through the models and query engines after "
+            "startup; the instance reports ready only once warm-up finishes"
+        ),
+    )
+    WARMUP_LLM: bool = Field(
+        default=True, description="Include a short LLM completion in warm-up"
+    )
+    WARMUP_QUERY: str = Field(
+        default="What are the capital adequacy requirements for banks?",
+        description="Synthetic query used to warm up the embedding model and engines",
+    )
+
+    # Query response cache
+    QUERY_CACHE_ENABLED: bool = Field(
+        default=True, description="Cache HRAG and TradRAG query responses"
+    )
+    # Off by default: questions differing only by a negation or a volume embed
+    # nearly identically, so a semantic hit can return another question's answer
+    QUERY_CACHE_SEMANTIC_ENABLED: bool = Field(
+        default=False, description="Reuse responses for semantically similar queries"
+    )
+    QUERY_CACHE_MAX_ENTRIES: int = Field(
+        default=512, gt=0, description="Maximum cached query responses (LRU)"
+    )
+    QUERY_CACHE_TTL_SECONDS: float = Field(
+        default=3600.0, gt=0, description="Time-to-live of cached responses"
+    )
+    QUERY_CACHE_SIMILARITY_THRESHOLD: float = Field(
+        default=0.95,
+        gt=0,
+        le=1.0,
+        description="Minimum cosine similarity for a semantic cache hit",
+    )
+
+    # Embedding stage of index builds
+    EMBED_BATCH_SIZE: int = Field(
+        default=32, gt=0, description="Texts per embedding request during builds"
+    )
+    EMBED_MAX_CONCURRENCY: int = Field(
+        default=4, gt=0, description="Maximum concurrent embedding requests"
+    )
+    EMBED_MAX_RETRIES: int = Field(
+        default=5, ge=0, description="Retries for throttled embedding requests"
+    )
+    EMBED_RETRY_BASE_DELAY: float = Field(
+        default=1.0, gt=0, description="Base delay in seconds for retry backoff"
+    )
+
+    EMBEDDING_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Reuse persisted document embeddings across index builds",
+    )
+
     # Different embedding models for LlamaIndex and LangChain
     LLAMAINDEX_EMBEDDING_MODEL: str = Field(
         default="cohere.embed-multilingual-v3",
@@ -130,6 +312,13 @@ class AppSettings(BaseSettings):
         path.mkdir(parents=True, exist_ok=True)
         return path
 
+    @computed_field
+    @property
+    def EMBEDDING_CACHE_DIR(self) -> Path:
+        path = self.PROJECT_ROOT / "storage/embedding_cache"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
     @computed_field
     @property
     def LOG_FILE(self) -> Path:
@@ -172,6 +361,90 @@ class OpenSearchSettings(BaseSettings):
         default=None, description="Full OpenSearch endpoint URL"
     )
 
+    # Connection pool
+    MAX_CONNECTIONS: int = Field(
+        default=50, gt=0, description="Maximum pooled HTTP connections per client"
+    )
+    TIMEOUT: float = Field(default=30.0, gt=0, description="Request timeout in seconds")
+    KEEPALIVE_TIMEOUT: float = Field(
+        default=60.0,
+        gt=0,
+        description=(
+            "Seconds an idle pooled connection of the async client is kept open"
+        ),
+    )
+
+    # Hybrid search
+    INGEST_EMBEDDINGS: bool = Field(
+        default=True,
+        description="Store a dense embedding of each chunk for vector search",
+    )
+    EMBEDDING_DIMENSION: int = Field(
+        default=1024,
+        gt=0,
+        description=(
+            "Dimension of the k-NN vector field; must match the LlamaIndex "
+            "embedding model"
+        ),
+    )
+    SEARCH_MODE: Literal["bm25", "vector", "hybrid"] = Field(
+        default="hybrid",
+        description=(
+            "Default search mode: BM25 full-text matching, k-NN over chunk "
+            "embeddings, or both fused"
+        ),
+    )
+    SEARCH_FUSION: Literal["rrf", "weighted"] = Field(
+        default="rrf",
+        description=(
+            "Default hybrid fusion: reciprocal rank fusion ('rrf') or a weighted "
+            "sum of min-max normalized scores ('weighted')"
+        ),
+    )
+    SEARCH_BM25_WEIGHT: float = Field(
+        default=0.5, ge=0, description="Default weight of BM25 results in fusion"
+    )
+    SEARCH_VECTOR_WEIGHT: float = Field(
+        default=0.5, ge=0, description="Default weight of k-NN results in fusion"
+    )
+    SEARCH_RRF_K: int = Field(
+        default=60, gt=0, description="Rank constant of reciprocal rank fusion"
+    )
+    SEARCH_CANDIDATES: int = Field(
+        default=50,
+        gt=0,
+        description="Results retrieved per query before hybrid fusion",
+    )
+
+    # Bulk indexing
+    BULK_MAX_DOCS: int = Field(
+        default=500, gt=0, description="Maximum documents per _bulk request"
+    )
+    BULK_MAX_BYTES: int = Field(
+        default=5 * 1024 * 1024,
+        gt=0,
+        description="Maximum payload bytes per _bulk request",
+    )
+    BULK_WORKERS: int = Field(
+        default=4, gt=0, description="Concurrent _bulk requests per ingest"
+    )
+    BULK_MAX_RETRIES: int = Field(
+        default=3,
+        ge=0,
+        description="Retries of items rejected with a retryable status (e.g. 429)",
+    )
+    BULK_RETRY_BASE_DELAY: float = Field(
+        default=1.0, gt=0, description="Base delay in seconds for retry backoff"
+    )
+    BULK_REFRESH_THRESHOLD: int = Field(
+        default=1000,
+        ge=0,
+        description=(
+            "Ingests of at least this many documents disable the index refresh "
+            "interval until all batches are written (0 = never)"
+        ),
+    )
+
     model_config = {
         "extra": "ignore",
         "env_prefix": "OPENSEARCH_",
@@ -180,15 +453,15 @@ class OpenSearchSettings(BaseSettings):
         "case_sensitive": False,
     }
 
-    def get_client(self) -> OpenSearch:
-        """
-        Initializes and returns an OpenSearch client using provided credentials.
-        """
+    def _client_args(self) -> dict:
+        """Hosts, credentials and connection pool arguments shared by both clients."""
         connection_args = {
             "use_ssl": self.USE_SSL,
             "verify_certs": self.VERIFY_CERTS,
             "ssl_assert_hostname": False,
             "ssl_show_warn": False,
+            "maxsize": self.MAX_CONNECTIONS,
+            "timeout": self.TIMEOUT,
         }
 
         # Only add authentication if both user and password are provided
@@ -196,12 +469,27 @@ class OpenSearchSettings(BaseSettings):
             connection_args["http_auth"] = (self.USER, self.PASS)  # type: ignore
 
         if self.ENDPOINT:
-            return OpenSearch(hosts=[self.ENDPOINT], **connection_args)  # type: ignore
+            connection_args["hosts"] = [self.ENDPOINT]
         else:
-            return OpenSearch(
-                hosts=[{"host": self.HOST, "port": self.PORT}],
-                **connection_args,  # type: ignore
-            )
+            connection_args["hosts"] = [{"host": self.HOST, "port": self.PORT}]
+        return connection_args
+
+    def get_client(self) -> "OpenSearch":
+        """
+        Initializes and returns an OpenSearch client using provided credentials.
+        """
+        from opensearchpy import OpenSearch
+
+        return OpenSearch(**self._client_args())
+
+    def get_async_client(self, **kwargs) -> "AsyncOpenSearch":
+        """
+        Initializes and returns an asyncio OpenSearch client using provided
+        credentials. Extra keyword arguments are passed to the client.
+        """
+        from opensearchpy import AsyncOpenSearch
+
+        return AsyncOpenSearch(**self._client_args(), **kwargs)
 
 
 # Global instances to be used throughout the app
@@ -5,8 +5,11 @@ This includes uploading documents and querying indexed rulebooks
 via a global query engine instance.
 """
 
+import json
 import os
 import shutil
+from pathlib import Path
+from typing import Any, AsyncGenerator, List, NamedTuple
 
 from config.settings import settings
 from fastapi import HTTPException, UploadFile, status
@@ -14,16 +17,32 @@ from logger import logger
 from models.api_models import (
     ClearRAGResponse,
     FileUploadResult,
+    IndexJobResponse,
     QueryResponse,
+    QuerySource,
     UploadResponse,
 )
+from services.bot.index_jobs import BuildProgress, index_jobs
 from services.bot.index_service import (
-    build_hierarchical_index,
     build_traditional_index,
     get_hrag_query_engine,
     get_traditional_query_engine,
+    query_with_filters,
+    retrieve_with_filters,
+    stream_response,
+    update_hierarchical_index,
+    warm_up_query_engine,
 )
-from services.bot.volume_selector import score_volumes_with_llm
+from services.bot.index_versions import (
+    activate_version,
+    create_version,
+    current_version_path,
+    discard_version,
+    gc_versions,
+)
+from services.bot.query_cache import query_cache
+from services.bot.query_executor import QueryRejectedError, query_executor
+from services.bot.volume_selector import select_volumes
 from utils.file_utils import save_uploaded_file
 
 from app.prompts.queries import RULEBOOK_QUERY_PROMPT, TRADITIONAL_RAG_QUERY_PROMPT
@@ -67,58 +86,151 @@ def set_query_engine(engine, engine_type):
         logger.error("Invalid engine type for set_query_engine: %s", engine_type)
         raise ValueError(f"Invalid engine type: {engine_type}")
 
+    # Responses produced from the previous index are no longer valid
+    query_cache.invalidate(engine_type)
+
+
+class EngineVersion(NamedTuple):
+    """A query engine loaded from a built, not yet active, index version."""
+
+    engine: Any
+    root: Path
+    version_path: Path
+
+
+def _build_engine_version(
+    root, build_index, load_engine, progress, incremental
+) -> EngineVersion:
+    """
+    Build an index into a new version directory and load its query engine.
+
+    The active version is never modified: incremental builds start from a
+    copy of it. The new engine is loaded and warmed up here, and a failed
+    build leaves the active version in place. Runs as a build job; the
+    version is activated by `_swap_engine_version`.
+    """
+    current = current_version_path(root)
+    version_path = create_version(root, copy_from=current if incremental else None)
+    try:
+        build_index(settings.DATA_DIR, version_path, progress)
+        progress.start_stage("loading engine")
+        engine = load_engine(version_path)
+        progress.start_stage("warming up")
+        warm_up_query_engine(engine)
+    except Exception:
+        discard_version(version_path)
+        raise
+    return EngineVersion(engine, Path(root), version_path)
+
+
+def _swap_engine_version(engine_type: str, built: EngineVersion) -> None:
+    """
+    Swap a built engine in, then point its index root at the new version.
+
+    Runs on the event loop when the build job succeeds. The pointer is
+    switched only after the in-memory swap, and if switching it fails the
+    previous engine is swapped back in. Either way a failed job leaves the
+    serving engine and the active version both unchanged.
+    """
+    previous = _hrag_query_engine if engine_type == "HRAG" else _trad_rag_query_engine
+    try:
+        set_query_engine(built.engine, engine_type)
+    except Exception:
+        discard_version(built.version_path)
+        raise
+    try:
+        activate_version(built.root, built.version_path)
+    except Exception:
+        logger.error(
+            "Activating %s index version %s failed; restoring the previous "
+            "query engine.",
+            engine_type,
+            built.version_path.name,
+        )
+        set_query_engine(previous, engine_type)
+        discard_version(built.version_path)
+        raise
+
+
+def _gc_engine_versions(built: EngineVersion) -> None:
+    """Delete old versions of a swapped-in index. Runs on the build thread."""
+    gc_versions(built.root, settings.INDEX_VERSIONS_RETAINED)
+
+
+def _build_hrag_engine(progress: BuildProgress):
+    """Update the HRAG index in a new version and load its query engine."""
+    return _build_engine_version(
+        settings.HRAG_INDEX_PATH,
+        update_hierarchical_index,
+        get_hrag_query_engine,
+        progress,
+        incremental=True,
+    )
+
+
+def _build_trad_rag_engine(progress: BuildProgress):
+    """Rebuild the traditional RAG index in a new version and load its query engine."""
+    return _build_engine_version(
+        settings.TRAD_RAG_INDEX_PATH,
+        build_traditional_index,
+        get_traditional_query_engine,
+        progress,
+        incremental=False,
+    )
+
+
+ENGINE_BUILDERS = {
+    "HRAG": _build_hrag_engine,
+    "TradRAG": _build_trad_rag_engine,
+}
+
 
 async def upload_document(file: UploadFile, rag_type: str) -> UploadResponse:
     """
-    Upload a document to the server and (re)build the selected RAG index.
+    Upload a document to the server and queue a rebuild of the selected RAG index.
 
-    Saves the uploaded file to the configured upload directory,
-    then builds the selected index and sets the global query engine.
+    Saves the uploaded file to the configured upload directory, then
+    enqueues a background job that builds the selected index and loads a
+    new query engine. The current engine keeps serving queries until the
+    job swaps in the new one. The HRAG index is updated incrementally,
+    re-embedding only new or changed files.
 
     Args:
         file (UploadFile): The file to upload.
         rag_type (str): The type of RAG index to build ("HRAG" or "TradRAG").
 
     Returns:
-        UploadFileResponse: Metadata confirming successful upload and indexing.
+        UploadResponse: Status "accepted" with the id of the index build job.
 
     Raises:
-        HTTPException: If no filename is provided or an error occurs
-        while saving or indexing.
+        HTTPException: If no filename or an invalid RAG type is provided, or
+        an error occurs while saving the file.
     """
     if not file.filename:
         logger.warning("Attempted to upload a file with no filename.")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="No filename provided"
         )
+    if rag_type not in ENGINE_BUILDERS:
+        logger.error("Invalid RAG type: %s", rag_type)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid RAG type. Must be 'HRAG' or 'TradRAG'.",
+        )
 
     try:
         file_location = await save_uploaded_file(file, settings.UPLOAD_DIR)
         logger.info("File '%s' successfully saved to %s", file.filename, file_location)
 
-        if rag_type == "HRAG":
-            if os.path.exists(settings.HRAG_INDEX_PATH):
-                shutil.rmtree(settings.HRAG_INDEX_PATH)
-            build_hierarchical_index(settings.DATA_DIR, settings.HRAG_INDEX_PATH)
-            query_engine = get_hrag_query_engine(settings.HRAG_INDEX_PATH)
-            set_query_engine(query_engine, "HRAG")
-            logger.info("HRAG index built and query engine set.")
-        elif rag_type == "TradRAG":
-            if os.path.exists(settings.TRAD_RAG_INDEX_PATH):
-                shutil.rmtree(settings.TRAD_RAG_INDEX_PATH)
-            build_traditional_index(settings.DATA_DIR, settings.TRAD_RAG_INDEX_PATH)
-            query_engine = get_traditional_query_engine(settings.TRAD_RAG_INDEX_PATH)
-            set_query_engine(query_engine, "TradRAG")
-            logger.info("Traditional RAG index built and query engine set.")
-        else:
-            logger.error("Invalid RAG type: %s", rag_type)
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid RAG type. Must be 'HRAG' or 'TradRAG'.",
-            )
-
+        job = index_jobs.submit(
+            rag_type,
+            ENGINE_BUILDERS[rag_type],
+            lambda built: _swap_engine_version(rag_type, built),
+            cleanup=_gc_engine_versions,
+        )
         return UploadResponse(
-            status="success",
+            status="accepted",
+            job_id=job.job_id,
             results=[
                 FileUploadResult(
                     filename=file.filename,
@@ -132,11 +244,27 @@ async def upload_document(file: UploadFile, rag_type: str) -> UploadResponse:
         logger.error("Failed to upload file '%s': %s", file.filename, e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Could not upload file or build index: {e}",
+            detail=f"Could not upload file or queue index build: {e}",
         ) from e
 
 
-async def _query_engine(engine, prompt_template, query: str) -> QueryResponse:
+def get_index_job(job_id: str) -> IndexJobResponse:
+    """
+    Return the progress and timings of an index build job.
+
+    Raises:
+        HTTPException: If no job with this id is known.
+    """
+    job = index_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Index build job '{job_id}' not found.",
+        )
+    return IndexJobResponse(**job.snapshot())
+
+
+def _ensure_engine_ready(engine) -> None:
     if engine is None:
         logger.error("Query engine is not ready. Index might not be built or loaded.")
         raise HTTPException(
@@ -144,7 +272,10 @@ async def _query_engine(engine, prompt_template, query: str) -> QueryResponse:
             detail="Query engine is not initialized. Please upload documents first.",
         )
 
-    top_volumes = score_volumes_with_llm(query, 3)
+
+async def _select_volume_files(query: str) -> List[str]:
+    """Return the rulebook files of the volumes most relevant to the query."""
+    top_volumes = await select_volumes(query, 3)
     logger.info("Selected volumes for query: %s", [v[0]["name"] for v in top_volumes])
     volumes = []
     for v in top_volumes:
@@ -156,12 +287,59 @@ async def _query_engine(engine, prompt_template, query: str) -> QueryResponse:
             file_names.append("rulebook_vol" + vol[7] + ".pdf")
         else:
             file_names.append(COMMON_VOLUME_FILE)
+    return file_names
+
+
+def _query_rejected(e: QueryRejectedError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": "1"},
+    )
+
 
+async def _query_engine(
+    engine, engine_type: str, prompt_template, query: str
+) -> QueryResponse:
+    _ensure_engine_ready(engine)
+    try:
+        with query_executor.admit():
+            return await _run_query(engine, engine_type, prompt_template, query)
+    except QueryRejectedError as e:
+        raise _query_rejected(e) from e
+
+
+async def _run_query(
+    engine, engine_type: str, prompt_template, query: str
+) -> QueryResponse:
+    lookup = None
+    if settings.QUERY_CACHE_ENABLED:
+        lookup = await query_cache.alookup(engine_type, query)
+        if lookup.response is not None:
+            return QueryResponse(response=lookup.response)
+
+    file_names = await _select_volume_files(query)
     formatted_prompt = prompt_template.format(query=query, filters=file_names)
     logger.debug("Querying rulebook with: %s", formatted_prompt)
     try:
-        response = engine.query(formatted_prompt)
+        # Retrieval and synthesis block, so they run on the query thread pool
+        response = await query_executor.run(
+            query_with_filters,
+            engine,
+            formatted_prompt,
+            filters={"filename": file_names},
+            min_results=settings.VOLUME_FILTER_MIN_RESULTS,
+        )
         logger.debug("Received response from query engine.")
+        if lookup is not None:
+            query_cache.store(
+                engine_type,
+                query,
+                str(response),
+                lookup.version,
+                lookup.embedding,
+                _query_sources(getattr(response, "source_nodes", None) or []),
+            )
         return QueryResponse(response=str(response))
     except Exception as e:
         logger.error("Error querying rulebook: %s", e, exc_info=True)
@@ -171,13 +349,132 @@ async def _query_engine(engine, prompt_template, query: str) -> QueryResponse:
         ) from e
 
 
+def _sse_event(event: str, data) -> str:
+    """Format a server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _query_sources(nodes) -> List[dict]:
+    return [
+        QuerySource(
+            node_id=node.node.node_id,
+            filename=node.node.metadata.get("filename"),
+            page_label=node.node.metadata.get("page_label"),
+            score=node.score,
+        ).model_dump()
+        for node in nodes
+    ]
+
+
+async def _stream_query_engine(
+    engine, engine_type: str, prompt_template, query: str
+) -> AsyncGenerator[str, None]:
+    """
+    Answer a query as a stream of server-sent events.
+
+    A `sources` event lists the retrieved nodes as soon as retrieval
+    finishes, followed by one `token` event per chunk of generated text and
+    a final `done` event. Failures after the stream has started are sent as
+    an `error` event, since the response status has already been sent.
+
+    The admission slot is taken when the response body starts streaming,
+    so a response that is never sent cannot leak it, and is held until the
+    stream is exhausted or closed by the client. If the slots fill up
+    between the admission check and the first event, the stream consists of
+    a single `error` event.
+
+    Raises:
+        HTTPException: If the query engine is not initialized, or with 503
+        if too many queries are in flight.
+    """
+    _ensure_engine_ready(engine)
+    # The index version of `engine`; the stream body may run after a swap
+    index_version = query_cache.index_version(engine_type)
+    try:
+        query_executor.check_admission()
+    except QueryRejectedError as e:
+        raise _query_rejected(e) from e
+
+    async def stream():
+        try:
+            query_executor.acquire()
+        except QueryRejectedError as e:
+            yield _sse_event("error", {"detail": str(e)})
+            return
+        try:
+            async for event in _stream_events(
+                engine, engine_type, index_version, prompt_template, query
+            ):
+                yield event
+        finally:
+            query_executor.release()
+
+    return stream()
+
+
+async def _stream_events(
+    engine, engine_type: str, index_version: int, prompt_template, query: str
+) -> AsyncGenerator[str, None]:
+    full_response = ""
+    try:
+        query_embedding = None
+        if settings.QUERY_CACHE_ENABLED:
+            lookup = await query_cache.alookup(engine_type, query)
+            query_embedding = lookup.embedding
+            if lookup.response is not None:
+                yield _sse_event("sources", lookup.sources or [])
+                yield _sse_event("token", {"text": lookup.response})
+                yield _sse_event("done", {})
+                return
+
+        file_names = await _select_volume_files(query)
+        formatted_prompt = prompt_template.format(query=query, filters=file_names)
+        logger.debug("Streaming rulebook query: %s", formatted_prompt)
+        nodes = await query_executor.run(
+            retrieve_with_filters,
+            engine,
+            formatted_prompt,
+            filters={"filename": file_names},
+            min_results=settings.VOLUME_FILTER_MIN_RESULTS,
+        )
+        sources = _query_sources(nodes)
+        yield _sse_event("sources", sources)
+        async for text in query_executor.iterate(
+            stream_response(formatted_prompt, nodes)
+        ):
+            full_response += text
+            yield _sse_event("token", {"text": text})
+    except Exception as e:
+        logger.error("Error streaming rulebook query: %s", e, exc_info=True)
+        yield _sse_event("error", {"detail": f"Error processing query: {e}"})
+        return
+
+    if settings.QUERY_CACHE_ENABLED:
+        query_cache.store(
+            engine_type, query, full_response, index_version, query_embedding, sources
+        )
+    yield _sse_event("done", {})
+
+
 async def query_hrag(query: str) -> QueryResponse:
-    return await _query_engine(_hrag_query_engine, RULEBOOK_QUERY_PROMPT, query)
+    return await _query_engine(_hrag_query_engine, "HRAG", RULEBOOK_QUERY_PROMPT, query)
 
 
 async def query_trad_rag(query: str) -> QueryResponse:
     return await _query_engine(
-        _trad_rag_query_engine, TRADITIONAL_RAG_QUERY_PROMPT, query
+        _trad_rag_query_engine, "TradRAG", TRADITIONAL_RAG_QUERY_PROMPT, query
+    )
+
+
+async def stream_query_hrag(query: str) -> AsyncGenerator[str, None]:
+    return await _stream_query_engine(
+        _hrag_query_engine, "HRAG", RULEBOOK_QUERY_PROMPT, query
+    )
+
+
+async def stream_query_trad_rag(query: str) -> AsyncGenerator[str, None]:
+    return await _stream_query_engine(
+        _trad_rag_query_engine, "TradRAG", TRADITIONAL_RAG_QUERY_PROMPT, query
     )
 
 
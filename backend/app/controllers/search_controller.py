@@ -8,18 +8,38 @@ from pathlib import Path
 from typing import Dict, List
 
 import httpx
-from anyio import to_thread
-from config.settings import settings
+from config.settings import opensearch_config, settings
 from fastapi import UploadFile
 from logger import logger
-from services.stores.opensearch import OpenSearchStore
+from services.search.hybrid import embed_texts
+from services.stores.opensearch import AsyncOpenSearchStore
 from services.stores.s3 import upload_file_to_s3
 from utils.file_utils import save_uploaded_file
 
-from app.services.bot.metadata_extractor import generate_structured_data_from_chunk
+# Single async store sharing one connection pool; closed on shutdown
+opensearch_store = AsyncOpenSearchStore()
 
-# Create a single OpenSearchStore instance
-opensearch_store = OpenSearchStore()
+
+async def add_chunk_embeddings(docs: List[Dict]) -> None:
+    """
+    Attach a dense embedding of each chunk's text for vector and hybrid search.
+    Chunks are still indexed for BM25 search if embedding fails.
+    """
+    embeddable = [doc for doc in docs if doc["text"]]
+    if not embeddable:
+        return
+    try:
+        vectors = await embed_texts([doc["text"] for doc in embeddable])
+    except Exception as e:
+        logger.warning(
+            "Failed to embed %d chunks; indexing them for BM25 search only: %s",
+            len(embeddable),
+            e,
+            exc_info=True,
+        )
+        return
+    for doc, vector in zip(embeddable, vectors):
+        doc["embedding"] = vector
 
 
 async def process_single_pdf(
@@ -54,6 +74,13 @@ async def process_single_pdf(
         if not chunks_raw:
             raise ValueError("No chunks returned from parser service.")
 
+        from services.bot.llm_service import ensure_llm_settings
+
+        from app.services.bot.metadata_extractor import (
+            generate_structured_data_from_chunk,
+        )
+
+        ensure_llm_settings()
         logger.info("Trying to generate structured data for chunks.")
         processing_tasks = [
             generate_structured_data_from_chunk(str(chunk)) for chunk in chunks_raw
@@ -98,14 +125,17 @@ async def process_single_pdf(
             }
             opensearch_docs.append(doc)
 
-        await to_thread.run_sync(
-            opensearch_store.index_chunks, index_name, opensearch_docs
-        )
+        # An index without a k-NN mapping would map the embeddings as floats
+        if opensearch_config.INGEST_EMBEDDINGS:
+            if await opensearch_store.supports_knn(index_name):
+                await add_chunk_embeddings(opensearch_docs)
+
+        indexed_count = await opensearch_store.index_chunks(index_name, opensearch_docs)
 
         return {
             "filename": file.filename,
             "status": "success",
-            "indexed_chunks": len(opensearch_docs),
+            "indexed_chunks": indexed_count,
         }
     except Exception as e:
         logger.error("Failed to process file '%s': %s", file.filename, e, exc_info=True)
@@ -123,10 +153,8 @@ async def handle_pdf_upload(files: List[UploadFile], index_name: str) -> Dict:
         "Received upload request for %d files for index: '%s'", len(files), index_name
     )
     try:
-        await to_thread.run_sync(opensearch_store.create_index, index_name)
-        batch_number = await to_thread.run_sync(
-            opensearch_store.get_next_batch_number, index_name
-        )
+        await opensearch_store.create_index(index_name)
+        batch_number = await opensearch_store.get_next_batch_number(index_name)
         logger.info(
             "Processing upload as batch number: %d for index '%s'.",
             batch_number,
@@ -159,14 +187,14 @@ async def handle_pdf_upload(files: List[UploadFile], index_name: str) -> Dict:
     return {"status": overall_status, "results": results_per_file}
 
 
-def handle_search(index_name: str, query: str) -> dict:
+async def handle_search(index_name: str, query: str, **search_options) -> dict:
     if not query or not index_name:
         logger.warning(
             "Search request failed: 'index_name' or 'query' parameter is missing."
         )
         return {"status": "failed", "reason": "Missing index_name or query parameters."}
     logger.info("Processing search in index '%s' for query: '%s'.", index_name, query)
-    results = opensearch_store.search_chunks(index_name, query)
+    results = await opensearch_store.search_chunks(index_name, query, **search_options)
     if results is None:
         logger.error(
             "Search operation for query '%s' in '%s' returned an error.",
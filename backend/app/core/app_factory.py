@@ -1,19 +1,30 @@
+import importlib
+
 from config.cors import configure_cors
+from config.settings import settings
 from core.lifespan import lifespan
 from fastapi import FastAPI
 
-from app.router import chat_router, csv_chat_router, health_router, search_router
+from app.router import health_router
+
+# Router module of each optional feature; only enabled features are imported,
+# so their dependencies (LlamaIndex, LangChain, pandas, ...) stay unloaded otherwise
+FEATURE_ROUTERS = {
+    "chat": "app.router.chat_router",
+    "search": "app.router.search_router",
+    "csv_chat": "app.router.csv_chat_router",
+}
 
 
 def create_app() -> FastAPI:
     """
     Factory function to initialize and return a FastAPI application instance.
-    Applies middleware, lifespan handler, and routes.
+    Applies middleware, lifespan handler, and the routes of enabled features.
     """
     app = FastAPI(lifespan=lifespan, root_path="/api")
     configure_cors(app)
-    app.include_router(chat_router.router)
-    app.include_router(search_router.router)
-    app.include_router(csv_chat_router.router)
+    for feature, module_name in FEATURE_ROUTERS.items():
+        if feature in settings.ENABLED_FEATURES:
+            app.include_router(importlib.import_module(module_name).router)
     app.include_router(health_router.router)
     return app
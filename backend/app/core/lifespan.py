@@ -2,7 +2,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from logger import logger
-from startup import initialize_application
+from startup import initialize_application, shutdown_application
 
 
 @asynccontextmanager
@@ -16,4 +16,5 @@ async def lifespan(app: FastAPI):
     logger.info("Application startup sequence completed.")
     yield
     logger.info("Application shutdown sequence initiated.")
+    await shutdown_application(app)
     logger.info("Application shutdown sequence completed.")
@@ -33,6 +33,23 @@ class QueryResponse(BaseModel):
     response: str
 
 
+class QuerySource(BaseModel):
+    """
+    Model for a source node used to answer a query, sent by the streaming endpoints.
+
+    Attributes:
+        node_id (str): The id of the retrieved node.
+        filename (Optional[str]): The source document of the node.
+        page_label (Optional[str]): The page of the source document, if known.
+        score (Optional[float]): The similarity score of the node.
+    """
+
+    node_id: str
+    filename: Optional[str] = None
+    page_label: Optional[str] = None
+    score: Optional[float] = None
+
+
 class ClearRAGResponse(BaseModel):
     """
     Model for the response returned after clearing the RAG index.
@@ -68,14 +85,57 @@ class UploadResponse(BaseModel):
     It indicates the overall status of the upload and provides detailed results for each file.
 
     Attributes:
-        status (str): "success", "partially_successful", or "failed" for the entire operation.
+        status (str): "success", "partially_successful", or "failed" for the entire
+            operation, or "accepted" when indexing continues in a background job.
         reason (Optional[str]): A general reason for failure, if the entire operation failed.
         results (Optional[List[FileUploadResult]]): A list of results for each file processed.
+        job_id (Optional[str]): The background index build job, polled via
+            `/chat/jobs/{job_id}`.
     """
 
     status: str
     reason: Optional[str] = None
     results: Optional[List[FileUploadResult]] = None
+    job_id: Optional[str] = None
+
+
+class IndexJobResponse(BaseModel):
+    """
+    Model for the status of a background index build job.
+
+    Attributes:
+        job_id (str): The job identifier returned by the upload endpoint.
+        rag_type (str): The index being built ("HRAG" or "TradRAG").
+        status (str): "queued", "running", "succeeded" or "failed".
+        stage (Optional[str]): The current build stage while running
+            (e.g. "parsing", "embedding").
+        files_parsed (int): PDF files parsed so far.
+        files_total (int): PDF files to parse.
+        nodes_embedded (int): Nodes embedded so far.
+        nodes_total (int): Nodes to embed.
+        created_at (float): Unix time the job was queued.
+        started_at (Optional[float]): Unix time the job started running.
+        finished_at (Optional[float]): Unix time the job finished.
+        elapsed_seconds (Optional[float]): Running time so far, or in total once
+            finished.
+        stage_seconds (Dict[str, float]): Time spent in each completed build stage.
+        error (Optional[str]): The failure reason of a failed job.
+    """
+
+    job_id: str
+    rag_type: str
+    status: str
+    stage: Optional[str] = None
+    files_parsed: int
+    files_total: int
+    nodes_embedded: int
+    nodes_total: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    elapsed_seconds: Optional[float] = None
+    stage_seconds: Dict[str, float]
+    error: Optional[str] = None
 
 
 class SearchResultItem(BaseModel):
@@ -194,6 +254,12 @@ class HealthResponse(BaseModel):
 
     Attributes:
         status (str): The health status of the service ("healthy" or "unhealthy").
+        readiness (Optional[str]): Warm-up state ("starting", "warming_up" or "ready").
+        warmup_seconds (Optional[Dict[str, float]]): Warm-up duration per component.
+        warmup_errors (Optional[Dict[str, str]]): Components whose warm-up failed.
     """
 
     status: str
+    readiness: Optional[str] = None
+    warmup_seconds: Optional[Dict[str, float]] = None
+    warmup_errors: Optional[Dict[str, str]] = None
@@ -61,3 +61,22 @@ Here is the text chunk to analyze:
 Produce a JSON object with the following exact keys: "title", "chapter", "section", "header", "content_markdown".
 Ensure that the JSON is well-formed and valid, with all string values properly escaped for newlines and control characters.
 """
+
+VOLUME_RANKING_PROMPT = """
+You are Claude, an expert legal assistant for the Central Bank of Bahrain (CBB)
+rulebook. Score how likely the answer to the user query is to be found in each
+of the rulebook volumes listed below.
+
+User query: {query}
+
+Volumes:
+{volumes}
+
+Rules:
+1. Give every volume a score between 0.0 and 1.0, where 1.0 means the query's
+   subject is mentioned in the volume name or description, and 0.0 means it is
+   extremely unlikely to be found in the volume.
+2. Your entire output MUST be ONLY a single JSON array of {count} numbers, one
+   score per volume, in the same order as the volumes are listed.
+3. Do not include any extra text, commentary, or markdown fences (like ```json).
+"""
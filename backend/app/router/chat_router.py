@@ -7,9 +7,11 @@ for uploading files and querying indexed documents.
 
 from controllers import chat_controller
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
 from logger import logger
 from models.api_models import (
     ClearRAGResponse,
+    IndexJobResponse,
     QueryRequest,
     QueryResponse,
     UploadResponse,
@@ -18,19 +20,23 @@ from models.api_models import (
 router = APIRouter(prefix="/chat", tags=["RAG"])
 
 
-@router.post("/upload/", response_model=UploadResponse)
+@router.post("/upload/", response_model=UploadResponse, status_code=202)
 async def upload_document(
     file: UploadFile = File(...), rag_type: str = Form(..., regex="^(HRAG|TradRAG)$")
 ):
     """
-    Upload a document to the server and (re)build the selected RAG index.
+    Upload a document to the server and queue a rebuild of the selected RAG index.
+
+    The index is built by a background job; poll `/chat/jobs/{job_id}` for
+    its progress. Queries are served by the current index until the job
+    completes.
 
     Args:
         file (UploadFile): The document file to be uploaded.
         rag_type (str): The type of RAG index to build ("HRAG" or "TradRAG").
 
     Returns:
-        UploadFileResponse: Upload metadata including filename and message.
+        UploadResponse: Upload metadata including the build job id.
 
     Raises:
         HTTPException: If an error occurs during file handling or saving.
@@ -43,7 +49,10 @@ async def upload_document(
     try:
         response = await chat_controller.upload_document(file, rag_type)
         logger.info(
-            "File %s uploaded and %s index built successfully.", file.filename, rag_type
+            "File %s uploaded and %s index build job %s queued.",
+            file.filename,
+            rag_type,
+            response.job_id,
         )
         return response
     except HTTPException as e:
@@ -58,6 +67,23 @@ async def upload_document(
         ) from e
 
 
+@router.get("/jobs/{job_id}", response_model=IndexJobResponse)
+async def get_index_job(job_id: str):
+    """
+    Report the status, progress and stage timings of an index build job.
+
+    Args:
+        job_id (str): The job id returned by the upload endpoint.
+
+    Returns:
+        IndexJobResponse: The job status.
+
+    Raises:
+        HTTPException: If the job is unknown.
+    """
+    return chat_controller.get_index_job(job_id)
+
+
 @router.post("/queryHRAG", response_model=QueryResponse)
 async def query_hrag(request: QueryRequest):
     """
@@ -131,6 +157,90 @@ async def query_trad_rag(request: QueryRequest):
         ) from e
 
 
+def _event_stream(stream) -> StreamingResponse:
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/queryHRAG/stream")
+async def stream_query_hrag(request: QueryRequest):
+    """
+    Stream an HRAG answer as server-sent events.
+
+    Emits a `sources` event once retrieval finishes, then `token` events as
+    the answer is generated, and finally `done` (or `error`).
+
+    Args:
+        request (QueryRequest): Contains the user's query text.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` response.
+
+    Raises:
+        HTTPException: If the query engine is not initialized.
+    """
+    logger.info("Received streaming query request: %s", request.query)
+    try:
+        stream = await chat_controller.stream_query_hrag(request.query)
+        return _event_stream(stream)
+    except HTTPException as e:
+        logger.error(
+            "HTTPException during streaming rulebook query: %s", e.detail, exc_info=True
+        )
+        raise e
+    except Exception as e:
+        logger.error(
+            "An unexpected error occurred during streaming rulebook query: %s",
+            e,
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=500, detail=f"Internal server error: {e}"
+        ) from e
+
+
+@router.post("/queryTradRAG/stream")
+async def stream_query_trad_rag(request: QueryRequest):
+    """
+    Stream a traditional RAG answer as server-sent events.
+
+    Emits the same events as `/queryHRAG/stream`.
+
+    Args:
+        request (QueryRequest): Contains the user's query text.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` response.
+
+    Raises:
+        HTTPException: If the query engine is not initialized.
+    """
+    logger.info("Received streaming traditional RAG query request: '%s'", request.query)
+    try:
+        stream = await chat_controller.stream_query_trad_rag(request.query)
+        return _event_stream(stream)
+    except HTTPException as e:
+        logger.error(
+            "HTTPException during streaming traditional RAG query: %s",
+            e.detail,
+            exc_info=True,
+        )
+        raise e
+    except Exception as e:
+        logger.error(
+            "An unexpected error occurred during streaming traditional RAG query: %s",
+            e,
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=500, detail=f"Internal server error: {e}"
+        ) from e
+
+
 @router.post("/clearRAGDocs", response_model=ClearRAGResponse)
 async def clear_rag_docs():
     """
@@ -2,30 +2,56 @@
 API routes for application health checks and status monitoring.
 
 Provides endpoints for checking the health status of the application
-and its dependencies.
+and its dependencies, and whether the instance has finished warming up.
 """
 
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 from logger import logger
 from models.api_models import HealthResponse
+from services.bot.warmup import readiness
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
 
+def _health_response() -> HealthResponse:
+    return HealthResponse(
+        status="healthy",
+        readiness=readiness.status,
+        warmup_seconds=dict(readiness.component_seconds),
+        warmup_errors=dict(readiness.errors),
+    )
+
+
 @router.get("/", response_model=HealthResponse)
 async def health_check():
     """
     Basic health check endpoint.
 
     Returns:
-        HealthResponse: Simple status indicating the service is running.
+        HealthResponse: Status indicating the service is running, with its
+        warm-up state and per-component warm-up timings.
     """
     try:
-        return HealthResponse(status="healthy")
+        return _health_response()
     except Exception as e:
         logger.error("Health check failed: %s", e, exc_info=True)
         return JSONResponse(
             status_code=503,
             content={"status": "unhealthy", "message": f"Service error: {e}"},
         )
+
+
+@router.get("/ready", response_model=HealthResponse)
+async def readiness_check():
+    """
+    Readiness check endpoint for load balancers.
+
+    Returns:
+        HealthResponse: The health response once warm-up has finished;
+        503 with the same body while the instance is still warming up.
+    """
+    response = _health_response()
+    if not readiness.is_ready:
+        return JSONResponse(status_code=503, content=response.model_dump())
+    return response
@@ -5,7 +5,7 @@ This module defines FastAPI endpoints for uploading PDF files to OpenSearch inde
 and performing search queries within those indexes.
 """
 
-from typing import List
+from typing import List, Optional
 
 from controllers.search_controller import handle_pdf_upload, handle_search
 from fastapi import (
@@ -19,6 +19,7 @@ from fastapi import (
 )
 from logger import logger
 from models.api_models import SearchResponse, UploadResponse
+from services.stores.opensearch import FusionMethod, SearchMode
 
 from router.constants import upload_settings
 
@@ -128,11 +129,28 @@ async def upload_pdfs(
     response_model=SearchResponse,
     status_code=status.HTTP_200_OK,
 )
-def search(
+async def search(
     index_name: str = Query(
         ..., description="Name of the OpenSearch index to search within."
     ),
     query: str = Query(..., description="The search query string."),
+    mode: Optional[SearchMode] = Query(
+        None,
+        description=(
+            "'bm25' full-text, 'vector' k-NN or 'hybrid' search "
+            "(defaults to OPENSEARCH_SEARCH_MODE)."
+        ),
+    ),
+    fusion: Optional[FusionMethod] = Query(
+        None,
+        description="Hybrid fusion: 'rrf' (reciprocal rank) or 'weighted' scores.",
+    ),
+    bm25_weight: Optional[float] = Query(
+        None, ge=0, description="Weight of BM25 results in hybrid fusion."
+    ),
+    vector_weight: Optional[float] = Query(
+        None, ge=0, description="Weight of k-NN results in hybrid fusion."
+    ),
 ) -> SearchResponse:
     """
     Performs a search on a specified OpenSearch index using the provided query string.
@@ -140,6 +158,10 @@ def search(
     Args:
         index_name (str): The OpenSearch index to search.
         query (str): The query string to search for.
+        mode (Optional[SearchMode]): The retrieval mode.
+        fusion (Optional[FusionMethod]): How hybrid results are fused.
+        bm25_weight (Optional[float]): Weight of BM25 results in fusion.
+        vector_weight (Optional[float]): Weight of k-NN results in fusion.
 
     Returns:
         SearchResponse: Contains the search status and list of matching document chunks.
@@ -150,7 +172,14 @@ def search(
         query,
     )
     try:
-        result = handle_search(index_name, query)
+        result = await handle_search(
+            index_name,
+            query,
+            mode=mode,
+            fusion=fusion,
+            bm25_weight=bm25_weight,
+            vector_weight=vector_weight,
+        )
         if result.get("status") == "success":
             logger.info(
                 "Search completed for '%s' in '%s'. Found %d results.",
@@ -0,0 +1,184 @@
+"""
+Service module for the embedding stage of index builds.
+
+Embeds parsed nodes in explicit batches with bounded concurrency against
+the configured embedding model, retrying throttled requests with
+exponential backoff and reporting progress as batches complete. Nodes are
+embedded in place so that `VectorStoreIndex` skips its own embedding pass.
+`CachedEmbedding` wraps the configured model to serve document embeddings
+from the persistent embedding cache.
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional, Sequence
+
+from botocore.exceptions import ClientError
+from config.settings import settings
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from llama_index.core.schema import BaseNode, MetadataMode
+from llama_index.core.settings import Settings
+from logger import logger
+from pydantic import PrivateAttr
+
+from services.stores.embedding_cache import EmbeddingCache
+
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def _is_throttling_error(exc: Exception) -> bool:
+    """Return True if the exception signals a throttled or unavailable model."""
+    if isinstance(exc, ClientError):
+        return exc.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+    message = str(exc).lower()
+    return "throttl" in message or "too many requests" in message
+
+
+def _embed_batch_with_retry(
+    embed_model: BaseEmbedding, texts: List[str], batch_number: int
+) -> List[List[float]]:
+    """Embed one batch of texts, backing off and retrying when throttled."""
+    for attempt in range(settings.EMBED_MAX_RETRIES + 1):
+        try:
+            return embed_model.get_text_embedding_batch(texts)
+        except Exception as e:
+            if attempt >= settings.EMBED_MAX_RETRIES or not _is_throttling_error(e):
+                raise
+            delay = settings.EMBED_RETRY_BASE_DELAY * (2**attempt)
+            delay += random.uniform(0, delay / 2)
+            logger.warning(
+                "Embedding batch %d throttled (attempt %d/%d). Retrying in %.1fs.",
+                batch_number,
+                attempt + 1,
+                settings.EMBED_MAX_RETRIES,
+                delay,
+            )
+            time.sleep(delay)
+    raise RuntimeError("Unreachable: embedding retries exhausted.")
+
+
+def embed_nodes(
+    nodes: Sequence[BaseNode],
+    embed_model: Optional[BaseEmbedding] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+) -> None:
+    """
+    Embed nodes in place using batched, concurrent requests.
+
+    Nodes that already carry an embedding are skipped. Texts are sent in
+    batches of `EMBED_BATCH_SIZE`, with at most `EMBED_MAX_CONCURRENCY`
+    batches in flight.
+
+    Args:
+        nodes (Sequence[BaseNode]): Nodes to embed.
+        embed_model (Optional[BaseEmbedding]): Embedding model to use.
+            Defaults to `Settings.embed_model`.
+        progress_callback (Optional[ProgressCallback]): Called with
+            (embedded_nodes, total_nodes) after each completed batch.
+
+    Raises:
+        Exception: If a batch still fails after all retries.
+    """
+    embed_model = embed_model or Settings.embed_model
+    pending = [node for node in nodes if node.embedding is None]
+    total = len(pending)
+    if not total:
+        return
+
+    batch_size = settings.EMBED_BATCH_SIZE
+    batches = [pending[i : i + batch_size] for i in range(0, total, batch_size)]
+    logger.info(
+        "Embedding %d nodes in %d batches (batch size %d, concurrency %d).",
+        total,
+        len(batches),
+        batch_size,
+        settings.EMBED_MAX_CONCURRENCY,
+    )
+
+    start = time.perf_counter()
+    embedded = 0
+    with ThreadPoolExecutor(max_workers=settings.EMBED_MAX_CONCURRENCY) as executor:
+        futures = {
+            executor.submit(
+                _embed_batch_with_retry,
+                embed_model,
+                [node.get_content(metadata_mode=MetadataMode.EMBED) for node in batch],
+                batch_number,
+            ): batch
+            for batch_number, batch in enumerate(batches, start=1)
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            for node, embedding in zip(batch, future.result()):
+                node.embedding = embedding
+            previous, embedded = embedded, embedded + len(batch)
+            if progress_callback:
+                progress_callback(embedded, total)
+            # Log progress at every 10% step
+            if embedded * 10 // total > previous * 10 // total:
+                logger.info("Embedded %d/%d nodes.", embedded, total)
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        "Embedded %d nodes in %.2fs (%.1f nodes/s).",
+        total,
+        elapsed,
+        total / elapsed if elapsed else float(total),
+    )
+    cache = getattr(embed_model, "cache", None)
+    if cache is not None:
+        logger.info("Embedding cache stats: %s", cache.stats())
+
+
+class CachedEmbedding(BaseEmbedding):
+    """LlamaIndex embedding model backed by an `EmbeddingCache` for documents."""
+
+    embed_model: BaseEmbedding
+    _cache: EmbeddingCache = PrivateAttr()
+
+    def __init__(self, embed_model: BaseEmbedding, cache: EmbeddingCache, **kwargs):
+        super().__init__(
+            embed_model=embed_model,
+            model_name=embed_model.model_name,
+            embed_batch_size=embed_model.embed_batch_size,
+            **kwargs,
+        )
+        self._cache = cache
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    @property
+    def cache(self) -> EmbeddingCache:
+        return self._cache
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self.embed_model.get_query_embedding(query)
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        return await self.embed_model.aget_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._get_text_embeddings([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        return (await self._aget_text_embeddings([text]))[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        return self._cache.embed_with_cache(
+            texts, self.embed_model.get_text_embedding_batch
+        )
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        return await self._cache.aembed_with_cache(
+            texts, self.embed_model.aget_text_embedding_batch
+        )
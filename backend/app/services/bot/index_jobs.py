@@ -0,0 +1,230 @@
+"""
+Service module for running index builds as background jobs.
+
+Uploads enqueue a build job instead of building inside the request. Jobs
+run one at a time on a dedicated worker thread, so two builds never write
+the same index directory, and the previous query engine keeps serving
+until the job has built and loaded its replacement. The new engine is then
+swapped in from the event loop, and any cleanup (such as deleting old
+index versions) runs on the build thread afterwards. Jobs record their
+progress (files parsed, nodes embedded) and per-stage timings for the job
+status endpoint.
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from logger import logger
+
+# Finished jobs kept for status polling
+MAX_JOB_HISTORY = 100
+
+
+class BuildProgress:
+    """
+    Progress of an index build.
+
+    Build functions report their current stage and counts through this
+    object. The base class only records them, so builds can run without a
+    job; stage durations are accumulated in `stage_seconds`.
+    """
+
+    def __init__(self):
+        self.stage: Optional[str] = None
+        self.files_total = 0
+        self.files_parsed = 0
+        self.nodes_total = 0
+        self.nodes_embedded = 0
+        self.stage_seconds: Dict[str, float] = {}
+        self._stage_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def start_stage(self, stage: str) -> None:
+        """Finish the current stage, if any, and start timing `stage`."""
+        with self._lock:
+            self._finish_stage()
+            self.stage = stage
+            self._stage_started = time.perf_counter()
+
+    def _finish_stage(self) -> None:
+        if self.stage is not None and self._stage_started is not None:
+            elapsed = time.perf_counter() - self._stage_started
+            self.stage_seconds[self.stage] = (
+                self.stage_seconds.get(self.stage, 0.0) + elapsed
+            )
+        self._stage_started = None
+
+    def files_parsed_progress(self, parsed: int, total: int) -> None:
+        with self._lock:
+            self.files_parsed, self.files_total = parsed, total
+
+    def nodes_embedded_progress(self, embedded: int, total: int) -> None:
+        """Progress callback for `embed_nodes`."""
+        with self._lock:
+            self.nodes_embedded, self.nodes_total = embedded, total
+
+
+class IndexJob(BuildProgress):
+    """A queued, running or finished index build."""
+
+    def __init__(self, rag_type: str):
+        super().__init__()
+        self.job_id = uuid.uuid4().hex
+        self.rag_type = rag_type
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def mark_running(self) -> None:
+        with self._lock:
+            self.status = "running"
+            self.started_at = time.time()
+
+    def mark_finished(self, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            self._finish_stage()
+            self.stage = None
+            self.status = "failed" if error else "succeeded"
+            self.error = str(error) if error else None
+            self.finished_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a consistent copy of the job state."""
+        with self._lock:
+            end = self.finished_at or time.time()
+            return {
+                "job_id": self.job_id,
+                "rag_type": self.rag_type,
+                "status": self.status,
+                "stage": self.stage,
+                "files_parsed": self.files_parsed,
+                "files_total": self.files_total,
+                "nodes_embedded": self.nodes_embedded,
+                "nodes_total": self.nodes_total,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "elapsed_seconds": end - self.started_at if self.started_at else None,
+                "stage_seconds": dict(self.stage_seconds),
+                "error": self.error,
+            }
+
+
+class IndexJobManager:
+    """Runs index build jobs sequentially on a background thread."""
+
+    def __init__(self, max_history: int = MAX_JOB_HISTORY):
+        self.max_history = max_history
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="index-build"
+        )
+        self._jobs: "OrderedDict[str, IndexJob]" = OrderedDict()
+        # Strong references keep running job tasks from being garbage collected
+        self._tasks = set()
+
+    def submit(
+        self,
+        rag_type: str,
+        build: Callable[[IndexJob], Any],
+        on_success: Callable[[Any], None],
+        cleanup: Optional[Callable[[Any], None]] = None,
+    ) -> IndexJob:
+        """
+        Enqueue a build job. Must be called from the event loop.
+
+        Args:
+            rag_type (str): The index being built ("HRAG" or "TradRAG").
+            build (Callable[[IndexJob], Any]): Blocking build function, run on
+                the build thread with the job as its progress reporter. Its
+                return value is passed to `on_success`.
+            on_success (Callable[[Any], None]): Called on the event loop once
+                the build succeeds, e.g. to swap in the new query engine. The
+                job fails if it raises.
+            cleanup (Optional[Callable[[Any], None]]): Blocking filesystem
+                cleanup run on the build thread with the build result after
+                `on_success`. Its `OSError`s are logged but do not fail the job.
+
+        Returns:
+            IndexJob: The queued job.
+        """
+        job = IndexJob(rag_type)
+        self._jobs[job.job_id] = job
+        self._prune()
+        task = asyncio.get_running_loop().create_task(
+            self._run(job, build, on_success, cleanup)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info("Queued %s index build job %s.", rag_type, job.job_id)
+        return job
+
+    def get(self, job_id: str) -> Optional[IndexJob]:
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: IndexJob, build, on_success, cleanup) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._executor, self._execute, job, build
+            )
+            on_success(result)
+        # Job boundary: any build or swap failure fails the job
+        except Exception as e:
+            logger.error(
+                "%s index build job %s failed: %s",
+                job.rag_type,
+                job.job_id,
+                e,
+                exc_info=True,
+            )
+            job.mark_finished(e)
+            return
+        job.mark_finished()
+        logger.info(
+            "%s index build job %s finished in %.2fs.",
+            job.rag_type,
+            job.job_id,
+            job.finished_at - job.started_at,
+        )
+        if cleanup is None:
+            return
+        try:
+            await loop.run_in_executor(self._executor, cleanup, result)
+        except OSError as e:
+            logger.error(
+                "Cleanup after %s index build job %s failed: %s",
+                job.rag_type,
+                job.job_id,
+                e,
+                exc_info=True,
+            )
+
+    @staticmethod
+    def _execute(job: IndexJob, build) -> Any:
+        job.mark_running()
+        logger.info("Running %s index build job %s.", job.rag_type, job.job_id)
+        return build(job)
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond `max_history`."""
+        excess = len(self._jobs) - self.max_history
+        if excess <= 0:
+            return
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.status in ("succeeded", "failed")
+        ]
+        for job_id in finished[:excess]:
+            del self._jobs[job_id]
+
+
+# Shared job manager for index builds triggered by uploads
+index_jobs = IndexJobManager()
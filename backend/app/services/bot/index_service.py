@@ -6,41 +6,354 @@ from rulebook documents and provides access to a query engine based
 on the persisted index.
 """
 
+import multiprocessing
 import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from config.settings import settings
 from llama_index.core import (
+    Document,
     SimpleDirectoryReader,
     StorageContext,
     VectorStoreIndex,
     get_response_synthesizer,
     load_index_from_storage,
 )
-from llama_index.core.node_parser import HierarchicalNodeParser
+from llama_index.core.base.response.schema import StreamingResponse
+from llama_index.core.node_parser import HierarchicalNodeParser, get_leaf_nodes
 from llama_index.core.query_engine import RetrieverQueryEngine
+from llama_index.core.retrievers import AutoMergingRetriever, VectorIndexRetriever
+from llama_index.core.schema import BaseNode, NodeWithScore, QueryBundle
+from llama_index.core.settings import Settings
 from logger import logger
 
-from .metadata_extractor import (
-    RulebookMetadataExtractor,
-    calculate_importance_score,
-    determine_hierarchy_level,
-    enhance_node_metadata,
-    generate_search_tags,
+from services.stores.mmap_vector_store import (
+    MmapVectorStore,
+    load_compact_index,
+    persist_compact_index,
 )
+from services.stores.vector_search import ArrayVectorStore
+
+from .embedding_service import embed_nodes
+from .index_jobs import BuildProgress
+from .ingestion_manifest import (
+    ManifestDiff,
+    compute_file_hashes,
+    diff_manifest,
+    load_manifest,
+    save_manifest,
+)
+from .metadata_extractor import RulebookMetadataExtractor, enhance_nodes_metadata
+
+# Subdirectory of a partitioned HRAG index holding one sub-index per source file
+PARTITIONS_DIRNAME = "partitions"
+# Subdirectory of an index holding its compact memory-mapped layout
+COMPACT_DIRNAME = "compact"
+
+# Shared by every PartitionedRetriever, so replaced engines leave no threads behind
+_partition_executor = ThreadPoolExecutor(thread_name_prefix="hrag-partition")
+
+
+def _list_pdf_files(data_dir: str) -> List[str]:
+    """Return the PDF filenames in the data directory in deterministic order."""
+    return sorted(
+        fname for fname in os.listdir(data_dir) if fname.lower().endswith(".pdf")
+    )
+
+
+def _extract_rulebook_metadata(
+    doc: Document, fname: str, extractor: RulebookMetadataExtractor
+) -> None:
+    """Attach structured rulebook metadata to a loaded document in place."""
+    doc.metadata = doc.metadata or {}
+    doc.metadata["filename"] = fname
+    doc.metadata.update(extractor.extract_document_metadata(doc.text))
+
+
+def _load_hrag_file(
+    data_dir: str, fname: str
+) -> Tuple[str, Optional[List[Document]], float]:
+    """
+    Load a single PDF and attach its metadata. Runs inside an ingestion worker.
+
+    Rulebook PDFs get the full structured metadata; other PDFs are loaded
+    with only their filename.
+
+    Returns:
+        Tuple[str, Optional[List[Document]], float]: The filename, its
+        documents (None if loading failed) and the elapsed seconds.
+    """
+    start = time.perf_counter()
+    path = os.path.join(data_dir, fname)
+    try:
+        doc_objs = SimpleDirectoryReader(input_files=[path]).load_data()
+        logger.debug("Loaded %d document objects from file: %s", len(doc_objs), fname)
+
+        if "rulebook" in fname.lower():
+            extractor = RulebookMetadataExtractor()
+            for doc in doc_objs:
+                _extract_rulebook_metadata(doc, fname, extractor)
+        else:
+            # For non-rulebook PDFs, just load them without metadata extraction
+            for doc in doc_objs:
+                doc.metadata = {"filename": fname}
+    except Exception as e:
+        logger.error("Error processing document %s: %s", fname, e, exc_info=True)
+        doc_objs = None
+    return fname, doc_objs, time.perf_counter() - start
 
 
-def build_hierarchical_index(data_dir: str, index_path: str) -> None:
+def _load_hrag_documents(
+    data_dir: str, fnames: List[str], progress: Optional[BuildProgress] = None
+) -> Dict[str, List[Document]]:
+    """
+    Load the named PDFs and attach rulebook metadata, in parallel across processes.
+
+    Files are parsed by a process pool of `INGESTION_WORKERS` workers and the
+    results are merged back in the order of `fnames`. Files that fail to load
+    are logged and skipped. Per-file timings are logged so slow volumes are
+    easy to spot.
+
+    Returns:
+        Dict[str, List[Document]]: Loaded documents keyed by filename.
+    """
+    progress = progress or BuildProgress()
+    progress.files_parsed_progress(0, len(fnames))
+    workers = min(settings.INGESTION_WORKERS, len(fnames))
+    start = time.perf_counter()
+    if workers > 1:
+        # Spawn rather than fork: builds run on a thread of the multithreaded
+        # server, and a forked child can inherit locks held by other threads
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [
+                executor.submit(_load_hrag_file, data_dir, fname) for fname in fnames
+            ]
+            for parsed, _ in enumerate(as_completed(futures), start=1):
+                progress.files_parsed_progress(parsed, len(fnames))
+            results = [future.result() for future in futures]
+    else:
+        results = []
+        for fname in fnames:
+            results.append(_load_hrag_file(data_dir, fname))
+            progress.files_parsed_progress(len(results), len(fnames))
+
+    docs_by_file = {}
+    timings = []
+    for fname, doc_objs, elapsed in results:
+        timings.append((fname, elapsed))
+        if doc_objs is not None:
+            docs_by_file[fname] = doc_objs
+            logger.info(
+                "Parsed %s (%d documents) in %.2fs.", fname, len(doc_objs), elapsed
+            )
+
+    logger.info(
+        "Loaded %d of %d files with %d worker(s) in %.2fs. Slowest: %s",
+        len(docs_by_file),
+        len(fnames),
+        max(workers, 1),
+        time.perf_counter() - start,
+        ", ".join(
+            f"{fname} ({elapsed:.2f}s)"
+            for fname, elapsed in sorted(timings, key=lambda t: t[1], reverse=True)[:3]
+        ),
+    )
+    return docs_by_file
+
+
+def _build_hierarchical_nodes(
+    documents: List[Document], extractor: RulebookMetadataExtractor
+) -> List[BaseNode]:
+    """Split documents into hierarchical nodes and enrich their metadata."""
+    # Hierarchical chunking configuration
+    parser = HierarchicalNodeParser.from_defaults(
+        chunk_sizes=settings.CHUNK_SIZES,
+        chunk_overlap=settings.CHUNK_OVERLAP,
+        include_metadata=True,
+        include_prev_next_rel=True,
+    )
+
+    # Convert to hierarchical nodes
+    nodes = parser.get_nodes_from_documents(documents)
+    logger.info("Generated %d hierarchical nodes from documents.", len(nodes))
+
+    # Enhance metadata for all nodes in batches
+    start = time.perf_counter()
+    enhance_nodes_metadata(nodes, extractor, max_workers=settings.INGESTION_WORKERS)
+    logger.info(
+        "Enhanced metadata for %d nodes in %.2fs.",
+        len(nodes),
+        time.perf_counter() - start,
+    )
+    return nodes
+
+
+def _manifest_entries(
+    file_hashes: Dict[str, str],
+    docs_by_file: Dict[str, List[Document]],
+    partitions: Optional[Dict[str, str]] = None,
+) -> Dict[str, Dict]:
+    """Build manifest entries for the files that were successfully loaded."""
+    entries = {
+        fname: {
+            "hash": file_hashes[fname],
+            "doc_ids": [doc.doc_id for doc in doc_objs],
+        }
+        for fname, doc_objs in docs_by_file.items()
+    }
+    for fname, partition in (partitions or {}).items():
+        entries[fname]["partition"] = partition
+    return entries
+
+
+def _persist_index(index: VectorStoreIndex, index_path: str) -> None:
+    """
+    Persist an index in the default JSON storage and, when enabled, the compact
+    memory-mapped layout used for serving.
+
+    The JSON storage remains the source of truth for incremental updates.
+    """
+    index.storage_context.persist(index_path)
+    compact_path = os.path.join(index_path, COMPACT_DIRNAME)
+    if settings.INDEX_STORAGE_FORMAT == "mmap":
+        persist_compact_index(index, compact_path, FILTERABLE_METADATA_KEYS)
+    elif os.path.exists(compact_path):
+        # A compact layout left from an earlier build would now be stale
+        shutil.rmtree(compact_path)
+
+
+def _load_query_index(index_path: str) -> VectorStoreIndex:
+    """
+    Load a persisted index for querying in the configured storage format,
+    searched with the configured vector backend.
+    """
+    compact_path = os.path.join(index_path, COMPACT_DIRNAME)
+    if settings.INDEX_STORAGE_FORMAT == "mmap":
+        if os.path.isdir(compact_path):
+            return load_compact_index(compact_path)
+        logger.warning(
+            "No compact index at %s; loading JSON storage instead.", compact_path
+        )
+    if settings.VECTOR_BACKEND == "simple":
+        storage_context = StorageContext.from_defaults(persist_dir=index_path)
+    else:
+        # Swap the per-node Python scoring of SimpleVectorStore for a matrix backend
+        storage_context = StorageContext.from_defaults(
+            persist_dir=index_path,
+            vector_store=ArrayVectorStore.from_persist_dir(
+                index_path, settings.VECTOR_BACKEND
+            ),
+        )
+    return load_index_from_storage(storage_context)
+
+
+def _vector_retriever(index: VectorStoreIndex, top_k: int) -> VectorIndexRetriever:
+    """
+    Create a similarity retriever over every node in the index.
+
+    Unlike `index.as_retriever`, this does not pin the retriever to the ids in
+    the index struct, which is empty for indexes opened from the compact layout.
+    """
+    return VectorIndexRetriever(index, similarity_top_k=top_k)
+
+
+def _leaf_node_index(nodes: List[BaseNode]) -> VectorStoreIndex:
+    """
+    Create an index over the leaf nodes of a node hierarchy.
+
+    Only leaf nodes are added to the vector store. Their parents are kept,
+    unembedded, in the docstore so that auto-merging retrieval can replace
+    sibling leaves with the parent they belong to.
+    """
+    storage_context = StorageContext.from_defaults()
+    storage_context.docstore.add_documents(nodes)
+    return VectorStoreIndex(get_leaf_nodes(nodes), storage_context=storage_context)
+
+
+def _delete_hierarchical_ref_doc(index: VectorStoreIndex, ref_doc_id: str) -> None:
+    """Delete every node of a source document, indexed leaves and parents alike."""
+    ref_doc_info = index.docstore.get_ref_doc_info(ref_doc_id)
+    if ref_doc_info is not None:
+        # delete_ref_doc expects every node of the document in the index struct
+        for node_id in list(ref_doc_info.node_ids):
+            if node_id not in index.index_struct.nodes_dict:
+                index.docstore.delete_document(node_id, raise_error=False)
+    index.delete_ref_doc(ref_doc_id, delete_from_docstore=True)
+
+
+def _is_partitioned_index(index_path: str) -> bool:
+    """Return True if the index at `index_path` uses the per-file partition layout."""
+    return os.path.isdir(os.path.join(index_path, PARTITIONS_DIRNAME))
+
+
+def _partition_dirname(fname: str) -> str:
+    """Directory name of the partition holding a source file's nodes."""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", os.path.splitext(fname)[0])
+
+
+def _persist_partitions(
+    nodes: List[BaseNode], index_path: str, fnames: Iterable[str]
+) -> Dict[str, str]:
+    """
+    Group hierarchical nodes by source file and persist one sub-index per file.
+
+    Returns:
+        Dict[str, str]: Mapping of filename to its partition directory name.
+    """
+    nodes_by_file: Dict[str, List[BaseNode]] = {}
+    for node in nodes:
+        nodes_by_file.setdefault(node.metadata.get("filename"), []).append(node)
+
+    partitions = {}
+    for fname in fnames:
+        file_nodes = nodes_by_file.get(fname)
+        if not file_nodes:
+            continue
+        partition = _partition_dirname(fname)
+        partition_path = os.path.join(index_path, PARTITIONS_DIRNAME, partition)
+        if os.path.exists(partition_path):
+            shutil.rmtree(partition_path)
+        _persist_index(_leaf_node_index(file_nodes), partition_path)
+        partitions[fname] = partition
+        logger.info(
+            "Persisted partition '%s' with %d nodes.", partition, len(file_nodes)
+        )
+    return partitions
+
+
+def build_hierarchical_index(
+    data_dir: str,
+    index_path: str,
+    partitioned: Optional[bool] = None,
+    progress: Optional[BuildProgress] = None,
+) -> None:
     """
     Build a hierarchical RAG index from rulebook documents and persist it to disk.
 
     This function loads PDF files from the specified directory, extracts
     structured metadata, splits the documents into hierarchical nodes,
     enriches the nodes with domain-specific tags and importance scores,
-    and then stores the index in the specified location.
+    and then stores the index in the specified location together with
+    an ingestion manifest used for incremental updates. Only leaf nodes are
+    embedded and indexed; parent nodes are kept in the docstore for
+    auto-merging retrieval.
+
+    In partitioned mode, one sub-index is persisted per source file under
+    `<index_path>/partitions/`, and the manifest records which partition
+    holds each file.
 
     Args:
         data_dir (str): Path to the directory containing input PDF documents.
         index_path (str): Path where the index will be saved.
+        partitioned (Optional[bool]): Persist per-file partitions. Defaults
+            to `HRAG_PARTITIONED`.
+        progress (Optional[BuildProgress]): Receives build stages and counts.
 
     Raises:
         Exception: If index persistence fails.
@@ -48,103 +361,39 @@ def build_hierarchical_index(data_dir: str, index_path: str) -> None:
     logger.info(
         "Starting hierarchical index build from '%s' to '%s'", data_dir, index_path
     )
+    progress = progress or BuildProgress()
     extractor = RulebookMetadataExtractor()
-    documents = []
-
-    for fname in os.listdir(data_dir):
-        if fname.lower().endswith(".pdf") and "rulebook" in fname.lower():
-            path = os.path.join(data_dir, fname)
-            try:
-                doc_objs = SimpleDirectoryReader(input_files=[path]).load_data()
-                logger.debug(
-                    "Loaded %d document objects from file: %s", len(doc_objs), fname
-                )
-
-                for doc in doc_objs:
-                    doc.metadata = doc.metadata or {}
-                    doc.metadata["filename"] = fname
-                    text = doc.text
-
-                    # Extract structured metadata
-                    doc.metadata.update(extractor.extract_volume_info(text))
-                    doc.metadata.update(extractor.extract_module_info(text))
-                    doc.metadata.update(extractor.extract_chapter_info(text))
-                    doc.metadata.update(extractor.extract_section_info(text))
-                    doc.metadata.update(extractor.extract_date_info(text))
-                    doc.metadata.update(extractor.extract_regulatory_context(text))
-
-                    # Determine content type
-                    doc.metadata["content_type"] = extractor.determine_content_type(
-                        text
-                    )
-
-                    # Determine hierarchy level
-                    doc.metadata["hierarchy_level"] = determine_hierarchy_level(
-                        doc.metadata
-                    )
-
-                    # Add search tags
-                    skip_tags = ["Unknown", "Other"]
-                    if (
-                        doc.metadata.get("content_type") not in skip_tags
-                        and doc.metadata.get("volume_type") not in skip_tags
-                        and doc.metadata.get("module_category") not in skip_tags
-                    ):
-                        doc.metadata["search_tags"] = generate_search_tags(
-                            doc.metadata, text
-                        )
-
-                    # Assign importance score
-                    doc.metadata["regulatory_importance"] = calculate_importance_score(
-                        doc.metadata, text
-                    )
-
-                documents.extend(doc_objs)
-            except Exception as e:
-                logger.error(
-                    "Error processing document %s: %s", fname, e, exc_info=True
-                )
-                continue
-        elif fname.lower().endswith(".pdf"):
-            # For non-rulebook PDFs, just load them without metadata extraction
-            path = os.path.join(data_dir, fname)
-            try:
-                doc_objs = SimpleDirectoryReader(input_files=[path]).load_data()
-                for doc in doc_objs:
-                    doc.metadata = doc.metadata or {}
-                    doc.metadata = {"filename": fname}
-                documents.extend(doc_objs)
-            except Exception as e:
-                logger.error(
-                    "Error processing document %s: %s", fname, e, exc_info=True
-                )
-                continue
+    fnames = _list_pdf_files(data_dir)
+    progress.start_stage("parsing")
+    file_hashes = compute_file_hashes(data_dir, fnames)
+    docs_by_file = _load_hrag_documents(data_dir, fnames, progress)
+    documents = [doc for doc_objs in docs_by_file.values() for doc in doc_objs]
 
     if not documents:
         logger.warning("No valid documents found. Index will not be built.")
         return
 
-    # Hierarchical chunking configuration
-    parser = HierarchicalNodeParser.from_defaults(
-        chunk_sizes=settings.CHUNK_SIZES,
-        chunk_overlap=settings.CHUNK_OVERLAP,
-        include_metadata=True,
-        include_prev_next_rel=True,
+    progress.start_stage("chunking")
+    nodes = _build_hierarchical_nodes(documents, extractor)
+    progress.start_stage("embedding")
+    embed_nodes(
+        get_leaf_nodes(nodes), progress_callback=progress.nodes_embedded_progress
     )
 
-    # Convert to hierarchical nodes
-    nodes = parser.get_nodes_from_documents(documents)
-    logger.info("Generated %d hierarchical nodes from documents.", len(nodes))
-
-    # Enhance metadata for each node
-    for node in nodes:
-        enhance_node_metadata(node, extractor)
-    logger.info("Enhanced metadata for all nodes.")
+    if partitioned is None:
+        partitioned = settings.HRAG_PARTITIONED
 
     # Build and persist the index
+    progress.start_stage("persisting")
     try:
-        index = VectorStoreIndex(nodes)
-        index.storage_context.persist(index_path)
+        partitions = None
+        if partitioned:
+            partitions = _persist_partitions(nodes, index_path, docs_by_file)
+        else:
+            _persist_index(_leaf_node_index(nodes), index_path)
+        save_manifest(
+            index_path, _manifest_entries(file_hashes, docs_by_file, partitions)
+        )
         logger.info("Successfully built hierarchical index with %d nodes", len(nodes))
         logger.info("Index saved to: %s", index_path)
     except Exception as e:
@@ -152,7 +401,150 @@ def build_hierarchical_index(data_dir: str, index_path: str) -> None:
         raise
 
 
-def build_traditional_index(data_dir: str, index_path: str) -> None:
+def update_hierarchical_index(
+    data_dir: str, index_path: str, progress: Optional[BuildProgress] = None
+) -> None:
+    """
+    Incrementally bring a persisted hierarchical index in line with the data directory.
+
+    Compares the content hash of every PDF in the data directory with the
+    ingestion manifest stored alongside the index. Only new or changed files
+    are parsed and embedded; their nodes are inserted into the existing
+    index, and nodes from changed or removed files are deleted. Falls back
+    to a full rebuild when no usable index or manifest exists.
+
+    Args:
+        data_dir (str): Path to the directory containing input PDF documents.
+        index_path (str): Path where the index is stored.
+        progress (Optional[BuildProgress]): Receives build stages and counts.
+
+    Raises:
+        Exception: If loading or persisting the index fails.
+    """
+    progress = progress or BuildProgress()
+    partitioned = settings.HRAG_PARTITIONED
+    manifest = load_manifest(index_path)
+    if partitioned:
+        has_index = _is_partitioned_index(index_path)
+    else:
+        has_index = os.path.exists(os.path.join(index_path, "docstore.json"))
+    if not manifest or not has_index:
+        logger.info(
+            "No matching index and manifest at '%s'. Running full build.", index_path
+        )
+        if os.path.exists(index_path):
+            shutil.rmtree(index_path)
+        build_hierarchical_index(data_dir, index_path, progress=progress)
+        return
+
+    file_hashes = compute_file_hashes(data_dir, _list_pdf_files(data_dir))
+    diff = diff_manifest(manifest, file_hashes)
+    if not diff.has_changes:
+        logger.info("Hierarchical index at '%s' is up to date.", index_path)
+        return
+
+    logger.info(
+        "Updating hierarchical index: %d added, %d changed, %d removed files.",
+        len(diff.added),
+        len(diff.changed),
+        len(diff.removed),
+    )
+    try:
+        if partitioned:
+            _update_partitions(
+                data_dir, index_path, manifest, diff, file_hashes, progress
+            )
+            return
+
+        progress.start_stage("loading index")
+        storage_context = StorageContext.from_defaults(persist_dir=index_path)
+        index = load_index_from_storage(storage_context)
+
+        for fname in diff.changed + diff.removed:
+            for doc_id in manifest.pop(fname).get("doc_ids", []):
+                _delete_hierarchical_ref_doc(index, doc_id)
+            logger.debug("Deleted nodes for file: %s", fname)
+
+        extractor = RulebookMetadataExtractor()
+        progress.start_stage("parsing")
+        docs_by_file = _load_hrag_documents(
+            data_dir, diff.added + diff.changed, progress
+        )
+        documents = [doc for doc_objs in docs_by_file.values() for doc in doc_objs]
+        if documents:
+            progress.start_stage("chunking")
+            nodes = _build_hierarchical_nodes(documents, extractor)
+            leaf_nodes = get_leaf_nodes(nodes)
+            progress.start_stage("embedding")
+            embed_nodes(leaf_nodes, progress_callback=progress.nodes_embedded_progress)
+            index.docstore.add_documents(nodes)
+            index.insert_nodes(leaf_nodes)
+            logger.info(
+                "Inserted %d nodes (%d leaves) into hierarchical index.",
+                len(nodes),
+                len(leaf_nodes),
+            )
+
+        manifest.update(_manifest_entries(file_hashes, docs_by_file))
+        progress.start_stage("persisting")
+        _persist_index(index, index_path)
+        save_manifest(index_path, manifest)
+        logger.info("Hierarchical index updated at: %s", index_path)
+    except Exception as e:
+        logger.error(
+            "Failed to update hierarchical index at %s: %s",
+            index_path,
+            e,
+            exc_info=True,
+        )
+        raise
+
+
+def _update_partitions(
+    data_dir: str,
+    index_path: str,
+    manifest: Dict[str, Dict],
+    diff: ManifestDiff,
+    file_hashes: Dict[str, str],
+    progress: BuildProgress,
+) -> None:
+    """Rebuild only the partitions of added, changed or removed files."""
+    for fname in diff.changed + diff.removed:
+        partition = manifest.pop(fname).get("partition")
+        if partition:
+            shutil.rmtree(
+                os.path.join(index_path, PARTITIONS_DIRNAME, partition),
+                ignore_errors=True,
+            )
+        logger.debug("Dropped partition for file: %s", fname)
+
+    extractor = RulebookMetadataExtractor()
+    progress.start_stage("parsing")
+    docs_by_file = _load_hrag_documents(data_dir, diff.added + diff.changed, progress)
+    documents = [doc for doc_objs in docs_by_file.values() for doc in doc_objs]
+    partitions = {}
+    if documents:
+        progress.start_stage("chunking")
+        nodes = _build_hierarchical_nodes(documents, extractor)
+        progress.start_stage("embedding")
+        embed_nodes(
+            get_leaf_nodes(nodes), progress_callback=progress.nodes_embedded_progress
+        )
+        progress.start_stage("persisting")
+        partitions = _persist_partitions(nodes, index_path, docs_by_file)
+
+    manifest.update(_manifest_entries(file_hashes, docs_by_file, partitions))
+    save_manifest(index_path, manifest)
+    logger.info(
+        "Rebuilt %d partitions of hierarchical index at: %s",
+        len(partitions),
+        index_path,
+    )
+
+
+def build_traditional_index(
+    data_dir: str, index_path: str, progress: Optional[BuildProgress] = None
+) -> None:
     """
     Build a traditional (flat) RAG index from documents and persist it to disk.
 
@@ -163,6 +555,7 @@ def build_traditional_index(data_dir: str, index_path: str) -> None:
     Args:
         data_dir (str): Path to the directory containing input PDF documents.
         index_path (str): Path where the index will be saved.
+        progress (Optional[BuildProgress]): Receives build stages and counts.
 
     Raises:
         Exception: If index persistence fails.
@@ -170,18 +563,18 @@ def build_traditional_index(data_dir: str, index_path: str) -> None:
     logger.info(
         "Building traditional RAG index from '%s' to '%s'", data_dir, index_path
     )
+    progress = progress or BuildProgress()
+    progress.start_stage("parsing")
+    fnames = [fname for fname in os.listdir(data_dir) if fname.lower().endswith(".pdf")]
     documents = []
-    for fname in os.listdir(data_dir):
-        if fname.lower().endswith(".pdf"):
-            path = os.path.join(data_dir, fname)
-            try:
-                doc_objs = SimpleDirectoryReader(input_files=[path]).load_data()
-                documents.extend(doc_objs)
-            except Exception as e:
-                logger.error(
-                    "Error processing document %s: %s", fname, e, exc_info=True
-                )
-                continue
+    for parsed, fname in enumerate(fnames, start=1):
+        path = os.path.join(data_dir, fname)
+        try:
+            doc_objs = SimpleDirectoryReader(input_files=[path]).load_data()
+            documents.extend(doc_objs)
+        except Exception as e:
+            logger.error("Error processing document %s: %s", fname, e, exc_info=True)
+        progress.files_parsed_progress(parsed, len(fnames))
 
     if not documents:
         logger.warning("No valid documents found. Index will not be built.")
@@ -189,9 +582,11 @@ def build_traditional_index(data_dir: str, index_path: str) -> None:
 
     # Flat chunking (no hierarchy)
     nodes = [doc for doc in documents]
+    progress.start_stage("embedding")
+    embed_nodes(nodes, progress_callback=progress.nodes_embedded_progress)
+    progress.start_stage("persisting")
     try:
-        index = VectorStoreIndex(nodes)
-        index.storage_context.persist(index_path)
+        _persist_index(VectorStoreIndex(nodes), index_path)
         logger.info("Traditional RAG index built and saved to: %s", index_path)
     except Exception as e:
         logger.error("Failed to persist traditional index: %s", e, exc_info=True)
@@ -216,38 +611,308 @@ def build_traditional_index(data_dir: str, index_path: str) -> None:
 #         return getattr(self.retriever, name)
 
 
+# Node metadata fields that retrieval filters can be applied to
+FILTERABLE_METADATA_KEYS = (
+    "volume_number",
+    "volume_type",
+    "filename",
+    "module_code",
+    "content_type",
+)
+
+
+def _build_metadata_inverted_index(
+    index: VectorStoreIndex, keys: Iterable[str] = FILTERABLE_METADATA_KEYS
+) -> Dict[str, Dict[str, Set[str]]]:
+    """
+    Map each filterable metadata field and value to the ids of embedded nodes.
+
+    Values are stored as strings so lookups match the string comparison
+    used for retrieval filters.
+    """
+    if isinstance(index.vector_store, MmapVectorStore):
+        return index.vector_store.metadata_index(keys)
+
+    inverted: Dict[str, Dict[str, Set[str]]] = {key: {} for key in keys}
+    for node_id in index.index_struct.nodes_dict:
+        node = index.docstore.get_node(node_id, raise_error=False)
+        if node is None:
+            continue
+        for key in inverted:
+            if key in node.metadata:
+                value = str(node.metadata[key])
+                inverted[key].setdefault(value, set()).add(node_id)
+    return inverted
+
+
+def _merge_storage_context(index: VectorStoreIndex) -> StorageContext:
+    """Storage context whose docstore resolves the parent nodes of an index."""
+    if isinstance(index.vector_store, MmapVectorStore):
+        return StorageContext.from_defaults(docstore=index.vector_store.docstore)
+    return index.storage_context
+
+
 class FilteringRetriever:
-    def __init__(self, retriever):
+    """
+    Vector retriever that applies metadata filters before similarity search.
+
+    Filters map a metadata key to the allowed values; a node is eligible if
+    any of its filtered fields matches. When the underlying index is known,
+    eligible node ids are resolved from an inverted index over
+    `FILTERABLE_METADATA_KEYS` and top-k is computed over those nodes only.
+    Other keys, or retrievers without an index, fall back to filtering the
+    retrieved results.
+
+    With `auto_merge`, retrieved leaf nodes are merged into their parent
+    node from the index docstore once more than `HRAG_MERGE_RATIO_THRESHOLD`
+    of the parent's children were retrieved.
+    """
+
+    def __init__(
+        self,
+        retriever,
+        index: Optional[VectorStoreIndex] = None,
+        auto_merge: bool = False,
+    ):
         self.retriever = retriever
+        self.index = index
+        self._inverted_index = (
+            _build_metadata_inverted_index(index) if index is not None else {}
+        )
+        self._merge_context = (
+            _merge_storage_context(index) if auto_merge and index is not None else None
+        )
+
+    def _retrieve(self, retriever, query, *args, **kwargs):
+        if self._merge_context is None:
+            return retriever.retrieve(query, *args, **kwargs)
+        return AutoMergingRetriever(
+            retriever,
+            self._merge_context,
+            simple_ratio_thresh=settings.HRAG_MERGE_RATIO_THRESHOLD,
+        ).retrieve(query)
+
+    def _eligible_node_ids(self, filters: Dict[str, Iterable[str]]) -> Set[str]:
+        eligible: Set[str] = set()
+        for key, allowed in filters.items():
+            values = self._inverted_index[key]
+            for value in allowed:
+                eligible.update(values.get(str(value), ()))
+        return eligible
+
+    def _post_filter(self, results, filters):
+        filtered = []
+        for node in results:
+            meta = getattr(node, "metadata", {})
+            keep = False
+            for key, allowed in filters.items():
+                if str(meta.get(key)) in allowed:
+                    keep = True
+                    break
+            if keep:
+                filtered.append(node)
+        return filtered
 
     def retrieve(self, query, *args, filters=None, **kwargs):
-        results = self.retriever.retrieve(query, *args, **kwargs)
-        if filters:
-            filtered = []
-            for node in results:
-                meta = getattr(node, "metadata", {})
-                keep = False
-                for key, allowed in filters.items():
-                    if str(meta.get(key)) in allowed:
-                        keep = True
-                        break
-                if keep:
-                    filtered.append(node)
-            return filtered
-        return results
+        if not filters:
+            return self._retrieve(self.retriever, query, *args, **kwargs)
+
+        if self.index is None or not set(filters) <= set(self._inverted_index):
+            results = self._retrieve(self.retriever, query, *args, **kwargs)
+            return self._post_filter(results, filters)
+
+        eligible = self._eligible_node_ids(filters)
+        logger.debug("Retrieval filters matched %d nodes.", len(eligible))
+        if not eligible:
+            return []
+        retriever = VectorIndexRetriever(
+            self.index,
+            similarity_top_k=self.retriever.similarity_top_k,
+            node_ids=list(eligible),
+        )
+        return self._retrieve(retriever, query, *args, **kwargs)
 
     def __getattr__(self, name):
         return getattr(self.retriever, name)
 
 
+class PartitionedRetriever:
+    """
+    Router over per-file partition indexes.
+
+    The query is embedded once and searched against each selected partition
+    in parallel; the results are merged by similarity score. A filter on
+    `filename` alone selects which partitions are searched. Any other
+    filters are applied within every partition.
+    """
+
+    def __init__(
+        self,
+        indexes: Dict[str, VectorStoreIndex],
+        similarity_top_k: int,
+        auto_merge: bool = False,
+    ):
+        self.similarity_top_k = similarity_top_k
+        self.partitions = {
+            fname: FilteringRetriever(
+                _vector_retriever(index, similarity_top_k), index, auto_merge
+            )
+            for fname, index in indexes.items()
+        }
+        self._embed_model = Settings.embed_model
+
+    def retrieve(self, query, filters=None):
+        query_bundle = QueryBundle(query) if isinstance(query, str) else query
+        targets = list(self.partitions.values())
+        if filters and set(filters) == {"filename"}:
+            allowed = {str(fname) for fname in filters["filename"]}
+            targets = [r for f, r in self.partitions.items() if f in allowed]
+            filters = None
+        if not targets:
+            return []
+
+        if query_bundle.embedding is None:
+            query_bundle.embedding = self._embed_model.get_agg_embedding_from_queries(
+                query_bundle.embedding_strs
+            )
+        if len(targets) == 1:
+            results = targets[0].retrieve(query_bundle, filters=filters)
+        else:
+            futures = [
+                _partition_executor.submit(r.retrieve, query_bundle, filters=filters)
+                for r in targets
+            ]
+            results = [node for future in futures for node in future.result()]
+
+        results.sort(key=lambda node: node.score or 0.0, reverse=True)
+        return results[: self.similarity_top_k]
+
+
+def _load_partitioned_retriever(index_path: str, top_k: int) -> PartitionedRetriever:
+    """Load every partition listed in the manifest and wrap them in a router."""
+    indexes = {}
+    for fname, entry in load_manifest(index_path).items():
+        partition = entry.get("partition")
+        if not partition:
+            continue
+        indexes[fname] = _load_query_index(
+            os.path.join(index_path, PARTITIONS_DIRNAME, partition)
+        )
+    logger.info("Loaded %d HRAG index partitions.", len(indexes))
+    return PartitionedRetriever(indexes, top_k, settings.HRAG_AUTO_MERGE)
+
+
+def retrieve_with_filters(
+    query_engine, query: Union[str, QueryBundle], filters=None, min_results: int = 1
+):
+    """
+    Retrieve nodes with metadata-restricted retrieval, falling back to global search.
+
+    When the engine retrieves through a `FilteringRetriever`, nodes are first
+    retrieved from the nodes matching `filters` only. If that yields fewer
+    than `min_results` nodes, the query is retrieved over the whole index
+    instead. Other engines, or queries without filters, retrieve unchanged.
+
+    Args:
+        query_engine: A `RetrieverQueryEngine` instance.
+        query (Union[str, QueryBundle]): The query.
+        filters (Optional[Dict[str, Iterable[str]]]): Allowed values per metadata key.
+        min_results (int): Minimum filtered nodes required to skip the fallback.
+
+    Returns:
+        List[NodeWithScore]: The retrieved nodes.
+    """
+    query_bundle = QueryBundle(query) if isinstance(query, str) else query
+    retriever = query_engine.retriever
+    if not filters or not isinstance(
+        retriever, (FilteringRetriever, PartitionedRetriever)
+    ):
+        return query_engine.retrieve(query_bundle)
+
+    nodes = retriever.retrieve(query_bundle, filters=filters)
+    if len(nodes) < min_results:
+        logger.info(
+            "Filtered retrieval returned %d nodes (minimum %d); "
+            "falling back to global search.",
+            len(nodes),
+            min_results,
+        )
+        return retriever.retrieve(query_bundle)
+    logger.info("Filtered retrieval returned %d nodes.", len(nodes))
+    return nodes
+
+
+def query_with_filters(query_engine, query: str, filters=None, min_results: int = 1):
+    """
+    Run a query with metadata-restricted retrieval, falling back to global search.
+
+    See `retrieve_with_filters` for the retrieval step.
+
+    Args:
+        query_engine: A `RetrieverQueryEngine` instance.
+        query (str): The query text.
+        filters (Optional[Dict[str, Iterable[str]]]): Allowed values per metadata key.
+        min_results (int): Minimum filtered nodes required to skip the fallback.
+
+    Returns:
+        The synthesized response.
+    """
+    if not filters:
+        return query_engine.query(query)
+
+    query_bundle = QueryBundle(query)
+    nodes = retrieve_with_filters(query_engine, query_bundle, filters, min_results)
+    return query_engine.synthesize(query_bundle, nodes)
+
+
+def stream_response(query: str, nodes: List[NodeWithScore]) -> Iterator[str]:
+    """
+    Synthesize a response from retrieved nodes, yielding text as it is generated.
+
+    Uses the same response mode as the query engines, with LLM streaming.
+    The LLM call is made lazily on the first `next()`, so the whole
+    generator can be consumed off the event loop.
+
+    Args:
+        query (str): The query text.
+        nodes (List[NodeWithScore]): The retrieved nodes to answer from.
+    """
+    synthesizer = get_response_synthesizer(streaming=True)
+    response = synthesizer.synthesize(query, nodes)
+    if isinstance(response, StreamingResponse):
+        yield from response.response_gen
+    else:
+        # No nodes to synthesize from; the synthesizer answers without the LLM
+        yield str(response)
+
+
+def warm_up_query_engine(query_engine, query: str = "warm-up query") -> None:
+    """
+    Run a retrieval through a freshly loaded engine before it serves queries.
+
+    Initializes the embedding client and any retrieval structures built on
+    first use, so the first user query does not pay for them. No LLM call
+    is made.
+    """
+    start = time.perf_counter()
+    nodes = retrieve_with_filters(query_engine, query)
+    logger.info(
+        "Warmed up query engine in %.2fs (%d nodes retrieved).",
+        time.perf_counter() - start,
+        len(nodes),
+    )
+
+
 def get_hrag_query_engine(index_path: str, top_k: int = 20):
     """
     Load a query engine from the persisted index storage with auto-merging retrieval.
 
     This function restores the hierarchical index from disk and
     returns a query engine instance capable of answering natural language
-    questions over the indexed documents, using auto-merging retrieval
-    to provide richer context.
+    questions over the indexed documents. With `HRAG_AUTO_MERGE`, the top-k
+    leaf nodes are retrieved and siblings covering more than
+    `HRAG_MERGE_RATIO_THRESHOLD` of a parent are replaced by that parent,
+    so the synthesizer receives fewer, larger contexts.
 
     Args:
         index_path (str): Directory path where the index is stored.
@@ -261,16 +926,22 @@ def get_hrag_query_engine(index_path: str, top_k: int = 20):
 
     logger.info("Attempting to load query engine from storage: %s", index_path)
     try:
-        storage_context = StorageContext.from_defaults(persist_dir=index_path)
-        index = load_index_from_storage(storage_context)
-        retriever = index.as_retriever(similarity_top_k=top_k)
-        filtering_retriever = FilteringRetriever(retriever)
+        if _is_partitioned_index(index_path):
+            retriever = _load_partitioned_retriever(index_path, top_k)
+        else:
+            index = _load_query_index(index_path)
+            retriever = FilteringRetriever(
+                _vector_retriever(index, top_k), index, settings.HRAG_AUTO_MERGE
+            )
         response_synthesizer = get_response_synthesizer()
         query_engine = RetrieverQueryEngine(
-            retriever=filtering_retriever,
+            retriever=retriever,
             response_synthesizer=response_synthesizer,
         )
-        logger.info("HRAG query engine with auto-merging loaded successfully.")
+        logger.info(
+            "HRAG query engine loaded successfully (auto-merging %s).",
+            "enabled" if settings.HRAG_AUTO_MERGE else "disabled",
+        )
         return query_engine
     except Exception as e:
         logger.error(
@@ -282,9 +953,8 @@ def get_hrag_query_engine(index_path: str, top_k: int = 20):
 def get_traditional_query_engine(index_path: str, top_k: int = 20):
     logger.info("Loading traditional RAG query engine from: %s", index_path)
     try:
-        storage_context = StorageContext.from_defaults(persist_dir=index_path)
-        index = load_index_from_storage(storage_context)
-        retriever = index.as_retriever(similarity_top_k=top_k)
+        index = _load_query_index(index_path)
+        retriever = _vector_retriever(index, top_k)
         query_engine = RetrieverQueryEngine.from_args(retriever=retriever)
         logger.info(
             "Traditional RAG query engine loaded successfully with top_k=%d.", top_k
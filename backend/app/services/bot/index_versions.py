@@ -0,0 +1,135 @@
+"""
+Service module for versioned (blue/green) index storage.
+
+Each build writes a complete index into a new directory under
+`<index root>/versions/` while the active version keeps serving. A pointer
+file (`<index root>/CURRENT`) names the active version and is replaced
+atomically once the new version is built and warmed up; older versions are
+then garbage collected.
+
+Index roots written before versioning hold the index files directly; they
+are served as the active version until the first versioned build, which
+starts from a copy of them.
+"""
+
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional, Union
+
+from logger import logger
+
+VERSIONS_DIRNAME = "versions"
+POINTER_FILENAME = "CURRENT"
+
+PathLike = Union[str, Path]
+
+
+def _versions_dir(root: PathLike) -> Path:
+    return Path(root) / VERSIONS_DIRNAME
+
+
+def _legacy_entries(root: PathLike) -> List[Path]:
+    """Index files stored directly in the root by the pre-versioning layout."""
+    root = Path(root)
+    if not root.is_dir():
+        return []
+    reserved = {VERSIONS_DIRNAME, POINTER_FILENAME, f"{POINTER_FILENAME}.tmp"}
+    return [path for path in root.iterdir() if path.name not in reserved]
+
+
+def current_version_path(root: PathLike) -> Optional[Path]:
+    """
+    Return the directory of the active index version.
+
+    Falls back to the root itself when it holds an unversioned index, and
+    returns None when no index has been built yet.
+    """
+    pointer = Path(root) / POINTER_FILENAME
+    if pointer.exists():
+        path = _versions_dir(root) / pointer.read_text(encoding="utf-8").strip()
+        if path.is_dir():
+            return path
+        logger.error("Index pointer %s names a missing version: %s", pointer, path)
+        return None
+    if _legacy_entries(root):
+        return Path(root)
+    return None
+
+
+def create_version(root: PathLike, copy_from: Optional[PathLike] = None) -> Path:
+    """
+    Create a new, inactive version directory.
+
+    Args:
+        root (PathLike): The index root.
+        copy_from (Optional[PathLike]): A version to start from, so that
+            incremental updates never modify the active version.
+
+    Returns:
+        Path: The new version directory.
+    """
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    path = _versions_dir(root) / name
+    if copy_from is not None:
+        copy_from = Path(copy_from)
+        # A legacy root contains the versions directory being created
+        ignore = (
+            shutil.ignore_patterns(VERSIONS_DIRNAME, POINTER_FILENAME + "*")
+            if copy_from == Path(root)
+            else None
+        )
+        shutil.copytree(copy_from, path, ignore=ignore)
+    else:
+        path.mkdir(parents=True)
+    logger.info("Created index version %s", path)
+    return path
+
+
+def activate_version(root: PathLike, version_path: PathLike) -> None:
+    """Atomically point the index root at `version_path`."""
+    pointer = Path(root) / POINTER_FILENAME
+    tmp_pointer = pointer.with_name(f"{POINTER_FILENAME}.tmp")
+    tmp_pointer.write_text(Path(version_path).name, encoding="utf-8")
+    os.replace(tmp_pointer, pointer)
+    logger.info("Activated index version %s", version_path)
+
+
+def gc_versions(root: PathLike, retain: int) -> None:
+    """
+    Delete all but the `retain` newest versions, always keeping the active one.
+
+    Index files of the pre-versioning layout are deleted once a version is active.
+    """
+    active = current_version_path(root)
+    if active is None or active == Path(root):
+        return
+    for path in _legacy_entries(root):
+        logger.info("Removing unversioned index file %s", path)
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+
+    versions = sorted(
+        (path for path in _versions_dir(root).iterdir() if path.is_dir()),
+        key=lambda path: path.name,
+        reverse=True,
+    )
+    kept = {active}
+    for path in versions:
+        if len(kept) >= retain:
+            break
+        kept.add(path)
+    for path in versions:
+        if path not in kept:
+            logger.info("Removing old index version %s", path)
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def discard_version(version_path: PathLike) -> None:
+    """Delete a version that failed to build."""
+    shutil.rmtree(version_path, ignore_errors=True)
+    logger.info("Discarded index version %s", version_path)
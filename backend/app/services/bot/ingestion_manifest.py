@@ -0,0 +1,80 @@
+"""
+Service module for tracking which source files an index was built from.
+
+The manifest is a small JSON file persisted next to an index that maps
+each ingested filename to its content hash and the document ids it
+produced, so that index updates only need to re-process files that were
+added, changed or removed since the last build.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from logger import logger
+from utils.file_utils import get_file_hash
+
+MANIFEST_FILENAME = "ingestion_manifest.json"
+
+
+@dataclass
+class ManifestDiff:
+    """Files that differ between the data directory and a stored manifest."""
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+def load_manifest(index_path: str) -> Dict[str, Dict]:
+    """
+    Load the ingestion manifest stored alongside an index.
+
+    Returns:
+        Dict[str, Dict]: Mapping of filename to {"hash", "doc_ids"}, or an
+        empty dict if no manifest exists.
+    """
+    manifest_path = Path(index_path) / MANIFEST_FILENAME
+    if not manifest_path.exists():
+        return {}
+    try:
+        with manifest_path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("Ignoring unreadable manifest %s: %s", manifest_path, e)
+        return {}
+
+
+def save_manifest(index_path: str, manifest: Dict[str, Dict]) -> None:
+    """Persist the ingestion manifest alongside an index."""
+    manifest_path = Path(index_path) / MANIFEST_FILENAME
+    with manifest_path.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    logger.debug("Saved ingestion manifest with %d files.", len(manifest))
+
+
+def compute_file_hashes(data_dir: str, fnames: Iterable[str]) -> Dict[str, str]:
+    """Return the content hash of each named file in the data directory."""
+    return {
+        fname: get_file_hash(Path(os.path.join(data_dir, fname))) for fname in fnames
+    }
+
+
+def diff_manifest(
+    manifest: Dict[str, Dict], file_hashes: Dict[str, str]
+) -> ManifestDiff:
+    """Compare current file hashes against a stored manifest."""
+    diff = ManifestDiff()
+    for fname, file_hash in sorted(file_hashes.items()):
+        if fname not in manifest:
+            diff.added.append(fname)
+        elif manifest[fname].get("hash") != file_hash:
+            diff.changed.append(fname)
+    diff.removed = sorted(set(manifest) - set(file_hashes))
+    return diff
@@ -11,6 +11,11 @@ from llama_index.embeddings.bedrock import BedrockEmbedding
 from llama_index.llms.bedrock import Bedrock
 from logger import logger
 
+from services.bot.embedding_service import CachedEmbedding
+from services.stores.embedding_cache import EmbeddingCache
+
+_initialized = False
+
 
 def initialize_llm_settings():
     """
@@ -18,11 +23,13 @@ def initialize_llm_settings():
 
     Sets the default LLM and embedding model to use AWS Bedrock (Claude 3.7 sonnet),
     using the AWS credentials key configured in environment variables.
+    When enabled, document embeddings are served from the on-disk embedding cache.
 
     Raises:
         ValueError: If AWS credentials are not set in the environment.
         RuntimeError: If initialization of LLM or embedding model fails.
     """
+    global _initialized
 
     try:
         llm = Bedrock(
@@ -36,9 +43,17 @@ def initialize_llm_settings():
             model=settings.LLAMAINDEX_EMBEDDING_MODEL,
             region_name=settings.AWS_REGION,
         )
+        if settings.EMBEDDING_CACHE_ENABLED:
+            embed_model = CachedEmbedding(
+                embed_model,
+                EmbeddingCache(
+                    settings.EMBEDDING_CACHE_DIR, settings.LLAMAINDEX_EMBEDDING_MODEL
+                ),
+            )
 
         Settings.llm = llm
         Settings.embed_model = embed_model
+        _initialized = True
         logger.info(
             "LlamaIndex LLM and Embedding models initialized successfully with AWS Bedrock."
         )
@@ -50,3 +65,14 @@ def initialize_llm_settings():
         raise RuntimeError(
             "Failed to initialize LLM services. Check AWS credentials and network."
         ) from exc
+
+
+def ensure_llm_settings():
+    """
+    Initialize the LLM and embedding models unless that has already happened.
+
+    Startup only initializes them for the RAG chat feature; other features
+    call this before their first LLM use.
+    """
+    if not _initialized:
+        initialize_llm_settings()
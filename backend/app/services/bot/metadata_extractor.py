@@ -8,13 +8,21 @@ hierarchical indexing and search relevance.
 
 import asyncio
 import json
+import multiprocessing
 import re
-from typing import Any, Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from llama_index.core.settings import Settings
 from logger import logger
 from app.prompts.queries import STRUCTURED_EXTRACTION_PROMPT
 
+PARAGRAPH_REFERENCE_RE = re.compile(r"([A-Z]{2,3}-[A-Z0-9]+\.[0-9]+\.[0-9]+)")
+
+# Below this many nodes, process start-up and pickling cost more than the
+# enrichment itself, so batches are handled in-process
+MIN_NODES_PER_WORKER = 2000
+
 
 class RulebookMetadataExtractor:
     """
@@ -45,9 +53,77 @@ class RulebookMetadataExtractor:
         # Rule vs Guidance identification
         self.rule_indicators = ["must", "shall", "required", "obliged", "mandatory"]
 
+        # Compile patterns once instead of on every search
+        self._volume_re = re.compile(self.volume_pattern, re.IGNORECASE)
+        self._module_re = re.compile(self.module_pattern, re.IGNORECASE)
+        self._chapter_re = re.compile(self.chapter_pattern, re.IGNORECASE)
+        self._section_re = re.compile(self.section_pattern, re.IGNORECASE)
+        self._date_re = re.compile(self.date_pattern)
+
+    def extract_document_metadata(self, text: str) -> Dict[str, Any]:
+        """
+        Extract every document-level metadata field in a single call.
+
+        Produces the same fields, values and key order as calling the
+        individual extract_* methods followed by `determine_content_type`,
+        `determine_hierarchy_level`, `generate_search_tags` and
+        `calculate_importance_score`, but lowercases the text only once and
+        runs each precompiled pattern a single time.
+
+        Args:
+            text (str): Raw document text.
+
+        Returns:
+            Dict[str, Any]: The extracted metadata.
+        """
+        text_lower = text.lower()
+        metadata: Dict[str, Any] = {}
+
+        volume_match = self._volume_re.search(text)
+        if volume_match:
+            metadata["volume_number"] = volume_match.group(1)
+            metadata["volume_type"] = self._determine_volume_type(volume_match.group(2))
+
+        module_match = self._module_re.search(text)
+        if module_match:
+            metadata["module_code"] = module_match.group(1)
+            metadata["module_category"] = self._categorize_module(module_match.group(2))
+
+        chapter_match = self._chapter_re.search(text)
+        if chapter_match:
+            metadata["chapter_reference"] = chapter_match.group(1)
+            metadata["chapter_type"] = self._determine_chapter_type(
+                chapter_match.group(1)
+            )
+
+        section_match = self._section_re.search(text)
+        if section_match:
+            metadata["section_reference"] = section_match.group(1)
+            metadata["page_number"] = int(section_match.group(2))
+            metadata["total_pages"] = int(section_match.group(3))
+
+        metadata.update(self._latest_date(self._date_re.findall(text)))
+        metadata.update(self.extract_regulatory_context(text, text_lower))
+        metadata["content_type"] = self.determine_content_type(text, text_lower)
+        metadata["hierarchy_level"] = determine_hierarchy_level(metadata)
+
+        skip_tags = ["Unknown", "Other"]
+        if (
+            metadata.get("content_type") not in skip_tags
+            and metadata.get("volume_type") not in skip_tags
+            and metadata.get("module_category") not in skip_tags
+        ):
+            metadata["search_tags"] = generate_search_tags(metadata, text, text_lower)
+
+        metadata["regulatory_importance"] = calculate_importance_score(
+            metadata, text, text_lower
+        )
+        logger.debug("Extracted document metadata: %s", metadata)
+        return metadata
+
     def extract_volume_info(self, text: str) -> Dict[str, Any]:
         """Extract volume number and type from document text."""
-        volume_match = re.search(self.volume_pattern, text, re.IGNORECASE)
+        volume_match = self._volume_re.search(text)
         if volume_match:
             logger.debug(
                 "Extracted Volume: %s, Type: %s",
@@ -62,7 +138,7 @@ class RulebookMetadataExtractor:
 
     def extract_module_info(self, text: str) -> Dict[str, Any]:
         """Extract module code and category from document text."""
-        module_match = re.search(self.module_pattern, text, re.IGNORECASE)
+        module_match = self._module_re.search(text)
         if module_match:
             logger.debug(
                 "Extracted Module: %s, Category: %s",
@@ -77,7 +153,7 @@ class RulebookMetadataExtractor:
 
     def extract_chapter_info(self, text: str) -> Dict[str, Any]:
         """Extract chapter reference and type from document text."""
-        chapter_match = re.search(self.chapter_pattern, text, re.IGNORECASE)
+        chapter_match = self._chapter_re.search(text)
         if chapter_match:
             logger.debug(
                 "Extracted Chapter: %s, Type: %s",
@@ -92,7 +168,7 @@ class RulebookMetadataExtractor:
 
     def extract_section_info(self, text: str) -> Dict[str, Any]:
         """Extract section reference and pagination from document text."""
-        section_match = re.search(self.section_pattern, text, re.IGNORECASE)
+        section_match = self._section_re.search(text)
         if section_match:
             logger.debug(
                 "Extracted Section: %s, Page: %s",
@@ -108,7 +184,10 @@ class RulebookMetadataExtractor:
 
     def extract_date_info(self, text: str) -> Dict[str, Any]:
         """Extract most recent date from the document."""
-        date_matches = re.findall(self.date_pattern, text)
+        return self._latest_date(self._date_re.findall(text))
+
+    def _latest_date(self, date_matches: List[tuple]) -> Dict[str, Any]:
+        """Build date metadata from the most recent (month, year) match."""
         if date_matches:
             latest_date = max(
                 date_matches, key=lambda x: (int(x[1]), self._month_to_number(x[0]))
@@ -121,24 +200,36 @@ class RulebookMetadataExtractor:
             }
         return {}
 
-    def determine_content_type(self, text: str) -> str:
+    def determine_content_type(
+        self, text: str, text_lower: Optional[str] = None
+    ) -> str:
         """
         Determine if a document contains Rule or Guidance based on heuristics.
 
+        Args:
+            text (str): Raw text content.
+            text_lower (Optional[str]): Precomputed `text.lower()`, if available.
+
         Returns:
             str: One of "Rule", "Guidance", or "Unknown"
         """
+        if text_lower is None:
+            text_lower = text.lower()
         rule_score = sum(
-            1 for indicator in self.rule_indicators if indicator.lower() in text.lower()
+            1 for indicator in self.rule_indicators if indicator in text_lower
         )
         if rule_score >= 2:
             return "Rule"
-        elif "guidance" in text.lower() or "may" in text.lower():
+        elif "guidance" in text_lower or "may" in text_lower:
             return "Guidance"
         return "Unknown"
 
-    def extract_regulatory_context(self, text: str) -> Dict[str, Any]:
+    def extract_regulatory_context(
+        self, text: str, text_lower: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Extract legal basis, instrument type, and applicable entities from text."""
+        if text_lower is None:
+            text_lower = text.lower()
         context = {}
 
         if "Article" in text and "CBB Law" in text:
@@ -148,11 +239,11 @@ class RulebookMetadataExtractor:
         elif "Directive" in text and "pursuant to" in text:
             context["instrument_type"] = "Directive"
 
-        if "Islamic bank" in text.lower():
+        if "Islamic bank" in text_lower:
             context["applies_to"] = "Islamic Banks"
-        elif "conventional bank" in text.lower():
+        elif "conventional bank" in text_lower:
             context["applies_to"] = "Conventional Banks"
-        elif "licensee" in text.lower():
+        elif "licensee" in text_lower:
             context["applies_to"] = "All Licensees"
 
         if context:
@@ -237,13 +328,16 @@ def determine_hierarchy_level(metadata: Dict[str, Any]) -> str:
     return "Document"
 
 
-def generate_search_tags(metadata: Dict[str, Any], text: str) -> List[str]:
+def generate_search_tags(
+    metadata: Dict[str, Any], text: str, text_lower: Optional[str] = None
+) -> List[str]:
     """
     Generate a list of semantic tags to improve retrieval and filtering.
 
     Args:
         metadata (dict): Extracted metadata from the document.
         text (str): Raw text content of the document.
+        text_lower (Optional[str]): Precomputed `text.lower()`, if available.
 
     Returns:
         List[str]: A list of relevant tags.
@@ -269,20 +363,25 @@ def generate_search_tags(metadata: Dict[str, Any], text: str) -> List[str]:
         "licensing",
         "governance",
     ]
+    if text_lower is None:
+        text_lower = text.lower()
     for term in key_terms:
-        if term in text.lower():
+        if term in text_lower:
             tags.append(term.title())
 
     return list(set(tags))  # Remove duplicates
 
 
-def calculate_importance_score(metadata: Dict[str, Any], text: str) -> float:
+def calculate_importance_score(
+    metadata: Dict[str, Any], text: str, text_lower: Optional[str] = None
+) -> float:
     """
     Calculate a regulatory importance score between 0.0 and 1.0.
 
     Args:
         metadata (dict): Extracted metadata for a document or node.
         text (str): The text content of the node.
+        text_lower (Optional[str]): Precomputed `text.lower()`, if available.
 
     Returns:
         float: Importance score based on rule status, recency, legal references, etc.
@@ -296,10 +395,12 @@ def calculate_importance_score(metadata: Dict[str, Any], text: str) -> float:
     if metadata.get("update_year", 0) >= (current_year - 5):
         score += 0.2
 
+    if text_lower is None:
+        text_lower = text.lower()
     if (
-        "enforcement" in text.lower()
-        or "penalty" in text.lower()
-        or "sanction" in text.lower()
+        "enforcement" in text_lower
+        or "penalty" in text_lower
+        or "sanction" in text_lower
     ):
         score += 0.2
 
@@ -312,6 +413,39 @@ def calculate_importance_score(metadata: Dict[str, Any], text: str) -> float:
     return min(score, 1.0)
 
 
+def _analyze_node_text(
+    text: str, extractor: RulebookMetadataExtractor
+) -> Tuple[str, List[str]]:
+    """
+    Run the text-level node heuristics over a single lowercased copy of the text.
+
+    Returns:
+        Tuple[str, List[str]]: The node content type and its unique
+        paragraph references.
+    """
+    text_lower = text.lower()
+    content_type = extractor.determine_content_type(text, text_lower)
+    paragraph_matches = PARAGRAPH_REFERENCE_RE.findall(text)
+    return content_type, list(set(paragraph_matches))
+
+
+def _apply_node_metadata(
+    node: Any, content_type: str, paragraph_references: List[str]
+) -> None:
+    """Write enrichment results onto a node, preserving the metadata key order."""
+    node.metadata["node_content_type"] = content_type
+    node.metadata["node_length"] = len(node.text)
+    node.metadata["node_id"] = getattr(node, "node_id", "unknown")
+    # The node id changes on every build; keep it out of the embedded text
+    # so identical chunks produce identical (cacheable) embedding inputs
+    excluded_keys = getattr(node, "excluded_embed_metadata_keys", None)
+    if excluded_keys is not None and "node_id" not in excluded_keys:
+        excluded_keys.append("node_id")
+
+    if paragraph_references:
+        node.metadata["paragraph_references"] = paragraph_references
+
+
 def enhance_node_metadata(node: Any, extractor: RulebookMetadataExtractor) -> None:
     """
     Enrich a LlamaIndex node with additional metadata.
@@ -321,15 +455,58 @@ def enhance_node_metadata(node: Any, extractor: RulebookMetadataExtractor) -> No
         extractor (RulebookMetadataExtractor): Instance for extracting content-based metadata.
     """
     if hasattr(node, "metadata") and hasattr(node, "text"):
-        node.metadata["node_content_type"] = extractor.determine_content_type(node.text)
-        node.metadata["node_length"] = len(node.text)
-        node.metadata["node_id"] = getattr(node, "node_id", "unknown")
+        _apply_node_metadata(node, *_analyze_node_text(node.text, extractor))
 
-        paragraph_matches = re.findall(
-            r"([A-Z]{2,3}-[A-Z0-9]+\.[0-9]+\.[0-9]+)", node.text
-        )
-        if paragraph_matches:
-            node.metadata["paragraph_references"] = list(set(paragraph_matches))
+
+def _analyze_node_texts(texts: List[str]) -> List[Tuple[str, List[str]]]:
+    """Analyze a batch of node texts. Runs inside an enrichment worker."""
+    extractor = RulebookMetadataExtractor()
+    return [_analyze_node_text(text, extractor) for text in texts]
+
+
+def enhance_nodes_metadata(
+    nodes: Sequence[Any],
+    extractor: RulebookMetadataExtractor,
+    max_workers: int = 1,
+) -> None:
+    """
+    Enrich a list of LlamaIndex nodes with additional metadata in batches.
+
+    Produces the same metadata as calling `enhance_node_metadata` on each
+    node. Node texts are analyzed in contiguous batches, spread across a
+    process pool when the node list is large enough to benefit, and the
+    results are applied to the nodes in the calling process.
+
+    Args:
+        nodes (Sequence[Any]): Node objects with `text` and `metadata` attributes.
+        extractor (RulebookMetadataExtractor): Instance for extracting
+            content-based metadata.
+        max_workers (int): Upper bound on worker processes.
+    """
+    targets = [
+        node for node in nodes if hasattr(node, "metadata") and hasattr(node, "text")
+    ]
+    workers = min(max_workers, len(targets) // MIN_NODES_PER_WORKER)
+    if workers > 1:
+        texts = [node.text for node in targets]
+        # A few batches per worker keeps the pool busy without per-node overhead
+        batch_size = -(-len(texts) // (workers * 4))
+        batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+        # Spawned workers do not inherit locks held by the server's other threads
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results = [
+                result
+                for batch_results in executor.map(_analyze_node_texts, batches)
+                for result in batch_results
+            ]
+    else:
+        results = [_analyze_node_text(node.text, extractor) for node in targets]
+
+    for node, (content_type, paragraph_references) in zip(targets, results):
+        _apply_node_metadata(node, content_type, paragraph_references)
+    logger.debug("Enriched %d nodes with %d worker(s).", len(targets), max(workers, 1))
 
 
 async def generate_structured_data_from_chunk(chunk_text: str) -> dict:
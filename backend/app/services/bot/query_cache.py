@@ -0,0 +1,219 @@
+"""
+Service module for caching RAG query responses.
+
+Provides a two-tier response cache for the HRAG and TradRAG engines:
+an exact-match tier keyed on the normalized query, and a semantic tier
+that reuses answers for near-identical questions based on embedding
+similarity. Entries are scoped to the index version they were produced
+from and are evicted by LRU order and TTL.
+
+The semantic tier is off by default: rulebook questions that differ only
+by a negation or a volume ("... for Islamic banks" vs "... for conventional
+banks") embed almost identically but need different answers.
+"""
+
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from botocore.exceptions import BotoCoreError, ClientError
+from config.settings import settings
+from llama_index.core.settings import Settings
+from logger import logger
+
+
+@dataclass
+class _CacheEntry:
+    response: str
+    embedding: Optional[np.ndarray]
+    created_at: float
+    sources: Optional[List[Dict]] = None
+
+
+@dataclass
+class CacheLookup:
+    """
+    Result of a cache lookup.
+
+    `version` is the index version current when the lookup started; pass it
+    to `QueryResponseCache.store` so a response produced from an index that
+    was swapped out in the meantime is not cached under the new version.
+    """
+
+    response: Optional[str]
+    embedding: Optional[np.ndarray]
+    version: int
+    sources: Optional[List[Dict]] = None
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, collapse whitespace and strip trailing punctuation from a query."""
+    normalized = re.sub(r"\s+", " ", query.strip().lower())
+    return normalized.rstrip("?!. ")
+
+
+class QueryResponseCache:
+    """
+    LRU/TTL cache of query responses keyed on (engine type, index version,
+    normalized query), with an optional embedding-similarity lookup tier.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        similarity_threshold: float,
+        semantic_enabled: bool = False,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.semantic_enabled = semantic_enabled
+        self._entries: "OrderedDict[Tuple[str, int, str], _CacheEntry]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+
+    def index_version(self, engine_type: str) -> int:
+        """Return the current index version for the given engine type."""
+        return self._versions.get(engine_type, 0)
+
+    def invalidate(self, engine_type: str) -> None:
+        """
+        Bump the index version for an engine type and drop its cached entries.
+
+        Called whenever the engine's index is rebuilt or reloaded.
+        """
+        self._versions[engine_type] = self.index_version(engine_type) + 1
+        stale = [key for key in self._entries if key[0] == engine_type]
+        for key in stale:
+            del self._entries[key]
+        logger.info(
+            "Query cache invalidated for %s (version %d, %d entries dropped).",
+            engine_type,
+            self._versions[engine_type],
+            len(stale),
+        )
+
+    def _is_expired(self, entry: _CacheEntry, now: float) -> bool:
+        return now - entry.created_at > self.ttl_seconds
+
+    def _evict_expired(self, now: float) -> None:
+        expired = [k for k, e in self._entries.items() if self._is_expired(e, now)]
+        for key in expired:
+            del self._entries[key]
+
+    async def alookup(self, engine_type: str, query: str) -> CacheLookup:
+        """
+        Look up a cached response for the query.
+
+        The index version is read before the first await, so it matches the
+        query engine the caller read just before the lookup.
+
+        Returns:
+            CacheLookup: The cached response (or None on a miss), the
+            normalized query embedding computed for the semantic tier, so
+            callers can reuse it when storing, and the index version.
+        """
+        now = time.monotonic()
+        self._evict_expired(now)
+
+        version = self.index_version(engine_type)
+        key = (engine_type, version, normalize_query(query))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            logger.info("Query cache exact hit for %s.", engine_type)
+            return CacheLookup(entry.response, entry.embedding, version, entry.sources)
+
+        if not self.semantic_enabled:
+            return CacheLookup(None, None, version)
+
+        try:
+            embedding = await self._aembed(query)
+        except (BotoCoreError, ClientError) as e:
+            logger.warning(
+                "Query cache embedding failed, skipping semantic tier: %s", e
+            )
+            return CacheLookup(None, None, version)
+
+        candidates = [
+            (k, e)
+            for k, e in self._entries.items()
+            if k[:2] == key[:2] and e.embedding is not None
+        ]
+        if not candidates:
+            return CacheLookup(None, embedding, version)
+
+        matrix = np.stack([e.embedding for _, e in candidates])
+        similarities = matrix @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.similarity_threshold:
+            best_key, best_entry = candidates[best]
+            self._entries.move_to_end(best_key)
+            logger.info(
+                "Query cache semantic hit for %s (similarity %.3f).",
+                engine_type,
+                float(similarities[best]),
+            )
+            return CacheLookup(
+                best_entry.response, embedding, version, best_entry.sources
+            )
+        return CacheLookup(None, embedding, version)
+
+    def store(
+        self,
+        engine_type: str,
+        query: str,
+        response: str,
+        version: int,
+        embedding: Optional[np.ndarray] = None,
+        sources: Optional[List[Dict]] = None,
+    ) -> bool:
+        """
+        Cache a response produced from index `version`, evicting LRU entries.
+
+        `sources` describes the nodes the response was synthesized from, so
+        cache hits on the streaming endpoints can replay them.
+
+        Returns:
+            bool: False if the index has been swapped since `version`, in
+            which case the response is stale and is not cached.
+        """
+        if version != self.index_version(engine_type):
+            logger.info(
+                "Not caching %s response from index version %d (now %d).",
+                engine_type,
+                version,
+                self.index_version(engine_type),
+            )
+            return False
+        key = (engine_type, version, normalize_query(query))
+        self._entries[key] = _CacheEntry(
+            response=response,
+            embedding=embedding,
+            created_at=time.monotonic(),
+            sources=sources,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    @staticmethod
+    async def _aembed(query: str) -> np.ndarray:
+        vector = np.asarray(
+            await Settings.embed_model.aget_query_embedding(query), dtype=np.float32
+        )
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+# Shared cache instance for the HRAG and TradRAG query endpoints
+query_cache = QueryResponseCache(
+    max_entries=settings.QUERY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.QUERY_CACHE_TTL_SECONDS,
+    similarity_threshold=settings.QUERY_CACHE_SIMILARITY_THRESHOLD,
+    semantic_enabled=settings.QUERY_CACHE_SEMANTIC_ENABLED,
+)
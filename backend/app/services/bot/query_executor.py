@@ -0,0 +1,100 @@
+"""
+Service module for running RAG queries off the event loop.
+
+Retrieval and LLM synthesis through LlamaIndex are blocking calls. They
+are run on a bounded thread pool so that a slow rulebook question does not
+stall other requests served by the event loop. Admission control caps the
+number of queries in flight: beyond `QUERY_MAX_IN_FLIGHT`, new queries are
+rejected immediately instead of queueing without bound.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
+
+from config.settings import settings
+from logger import logger
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class QueryRejectedError(RuntimeError):
+    """Raised when a query is not admitted because too many are in flight."""
+
+
+class QueryExecutor:
+    """Bounded thread pool for blocking query work, with admission control."""
+
+    def __init__(self, max_workers: int, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="rag-query"
+        )
+        # Only touched from the event loop, so no lock is needed
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def check_admission(self) -> None:
+        """
+        Check that a query would be admitted now, without taking a slot.
+
+        Raises:
+            QueryRejectedError: If all slots are taken.
+        """
+        if self._in_flight >= self.max_in_flight:
+            logger.warning(
+                "Rejecting query: %d queries already in flight.", self._in_flight
+            )
+            raise QueryRejectedError(
+                "Too many queries in progress. Please retry shortly."
+            )
+
+    def acquire(self) -> None:
+        """
+        Take one of the `max_in_flight` query slots.
+
+        Raises:
+            QueryRejectedError: If all slots are taken.
+        """
+        self.check_admission()
+        self._in_flight += 1
+
+    def release(self) -> None:
+        """Return a query slot taken with `acquire`."""
+        self._in_flight -= 1
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """Hold a query slot for the enclosed block (see `acquire`)."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking callable on the query thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def iterate(self, iterator: Iterator[T]) -> AsyncIterator[T]:
+        """Consume a blocking iterator on the query thread pool, item by item."""
+        while True:
+            item = await self.run(next, iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+
+
+# Shared executor for the HRAG and TradRAG query endpoints
+query_executor = QueryExecutor(
+    max_workers=settings.QUERY_WORKERS,
+    max_in_flight=settings.QUERY_MAX_IN_FLIGHT,
+)
@@ -1,9 +1,54 @@
+import asyncio
+import json
 import re
 
+import numpy as np
+from config.settings import settings
 from llama_index.core.settings import Settings
+from logger import logger
+
+from app.prompts.queries import VOLUME_RANKING_PROMPT
 
 from .volume_metadata import VOLUMES
 
+# Row-normalised embedding matrix of the volume descriptions, aligned with VOLUMES
+_volume_embeddings = None
+
+
+def _build_volume_prompt(query, volume):
+    """Build the relevance-scoring prompt for a single volume."""
+    return (
+        f"You are Claude, an expert legal assistant.\n"
+        f"User query: {query}\n"
+        f"Volume: {volume['name']}\n"
+        f"Description: {volume['description']}\n"
+        """
+        FORMAT YOUR RESPONSE EXACTLY LIKE SO:
+        [Your score here (this line is to be excluded from your response) ]
+
+        [CRITICAL: Respond with a score between 0.0 and 1.0, where 1.0 means the query's subject is mntioned in the volume name or description, and 0.0 means it is extremely unlikely to be found in the volume. (this line is to be excluded from your response)]
+        """
+    )
+
+
+def _parse_score(text):
+    """Extract the first numeric score from an LLM response, defaulting to 0.0."""
+    match = re.search(r"\d*\.?\d+", text)
+    return float(match.group()) if match else 0.0
+
+
+def _select_top_volumes(scored_volumes, beam_width):
+    """
+    Apply the beam selection rules to a list of (volume, score) pairs.
+
+    When any volume is a certain match (score 1.0), volumes scoring 0.7 or
+    below are discarded before the top-k (beam_width) volumes are returned.
+    """
+    if any(score == 1.0 for _, score in scored_volumes):
+        scored_volumes = [(v, s) for v, s in scored_volumes if s > 0.7]
+    scored_volumes = sorted(scored_volumes, key=lambda x: x[1], reverse=True)
+    return scored_volumes[:beam_width]
+
 
 def score_volumes_with_llm(query, beam_width):
     """
@@ -13,28 +58,178 @@ def score_volumes_with_llm(query, beam_width):
     llm = Settings.llm
     scored_volumes = []
     for volume in VOLUMES:
-        prompt = (
-            f"You are Claude, an expert legal assistant.\n"
-            f"User query: {query}\n"
-            f"Volume: {volume['name']}\n"
-            f"Description: {volume['description']}\n"
-            """
-            FORMAT YOUR RESPONSE EXACTLY LIKE SO:
-            [Your score here (this line is to be excluded from your response) ]
-
-            [CRITICAL: Respond with a score between 0.0 and 1.0, where 1.0 means the query's subject is mntioned in the volume name or description, and 0.0 means it is extremely unlikely to be found in the volume. (this line is to be excluded from your response)]
-            """
+        response = llm.complete(_build_volume_prompt(query, volume))
+        scored_volumes.append((volume, _parse_score(response.text)))
+
+    return _select_top_volumes(scored_volumes, beam_width)
+
+
+async def ascore_volumes_with_llm(query, beam_width):
+    """
+    Asynchronously score every volume for relevance to the query.
+
+    All volume prompts are sent concurrently from worker threads (the
+    Bedrock LLM has no native async API), bounded by
+    `VOLUME_SCORING_CONCURRENCY`, and each call is limited to
+    `VOLUME_SCORING_TIMEOUT` seconds. A volume whose call fails or times out
+    scores 0.0, and the number of such volumes is logged as an error so that
+    a systematic failure cannot pass for a ranking. Returns the top-k
+    (beam_width) volumes, exactly like `score_volumes_with_llm`.
+    """
+    llm = Settings.llm
+    semaphore = asyncio.Semaphore(settings.VOLUME_SCORING_CONCURRENCY)
+    failed = []
+
+    async def _score(volume):
+        async with semaphore:
+            try:
+                response = await asyncio.wait_for(
+                    asyncio.to_thread(
+                        llm.complete, _build_volume_prompt(query, volume)
+                    ),
+                    timeout=settings.VOLUME_SCORING_TIMEOUT,
+                )
+                return volume, _parse_score(response.text)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Volume scoring timed out for '%s' after %.1fs.",
+                    volume["name"],
+                    settings.VOLUME_SCORING_TIMEOUT,
+                )
+            except Exception as e:
+                logger.error(
+                    "Volume scoring failed for '%s': %s",
+                    volume["name"],
+                    e,
+                    exc_info=True,
+                )
+            failed.append(volume["name"])
+            return volume, 0.0
+
+    scored_volumes = await asyncio.gather(*(_score(volume) for volume in VOLUMES))
+    if failed:
+        logger.error(
+            "Volume scoring failed or timed out for %d of %d volumes; "
+            "they were scored 0.0: %s",
+            len(failed),
+            len(VOLUMES),
+            ", ".join(failed),
         )
-        response = llm.complete(prompt)
-        # logger.info(response)
-        match = re.search(r"\d*\.?\d+", response.text)
-        score = float(match.group()) if match else 0.0
-        scored_volumes.append((volume, score))
-        for v, s in scored_volumes:
-            if s == 1.0:
-                for v, s in scored_volumes:
-                    if s <= 0.7:
-                        scored_volumes.remove((v, s))
-    scored_volumes.sort(key=lambda x: x[1], reverse=True)
+    return _select_top_volumes(list(scored_volumes), beam_width)
 
-    return scored_volumes[:beam_width]
+
+def _parse_batched_scores(text):
+    """
+    Parse the JSON score vector returned by the batched ranking prompt.
+
+    Raises:
+        ValueError: If the response is not a JSON array with one numeric
+        score per volume.
+    """
+    cleaned = re.sub(r"```(?:json)?\n?|\n?```", "", text).strip()
+    scores = json.loads(cleaned)
+    if not isinstance(scores, list) or len(scores) != len(VOLUMES):
+        raise ValueError(
+            f"Expected a JSON array of {len(VOLUMES)} scores, got: {cleaned[:200]}"
+        )
+    return [float(score) for score in scores]
+
+
+async def ascore_volumes_batched(query, beam_width):
+    """
+    Score every volume with a single structured LLM prompt.
+
+    The LLM returns a JSON array with one score per entry in `VOLUMES`.
+    If the call fails or the response cannot be parsed, falls back to
+    per-volume scoring via `ascore_volumes_with_llm`. Returns the top-k
+    (beam_width) volumes.
+    """
+    llm = Settings.llm
+    volume_lines = "\n".join(
+        f"{i}. {volume['name']}: {volume['description']}"
+        for i, volume in enumerate(VOLUMES, start=1)
+    )
+    prompt = VOLUME_RANKING_PROMPT.format(
+        query=query, volumes=volume_lines, count=len(VOLUMES)
+    )
+    try:
+        # Bedrock's LLM has no native acomplete; run the sync call off the loop
+        response = await asyncio.wait_for(
+            asyncio.to_thread(llm.complete, prompt),
+            timeout=settings.VOLUME_SCORING_TIMEOUT,
+        )
+    except Exception as e:
+        logger.error(
+            "Batched volume ranking call failed (%r). "
+            "Falling back to per-volume scoring.",
+            e,
+            exc_info=not isinstance(e, asyncio.TimeoutError),
+        )
+        return await ascore_volumes_with_llm(query, beam_width)
+    try:
+        scores = _parse_batched_scores(response.text)
+    except (TypeError, ValueError) as e:
+        logger.warning(
+            "Unparseable batched volume ranking (%s). "
+            "Falling back to per-volume scoring.",
+            e,
+        )
+        return await ascore_volumes_with_llm(query, beam_width)
+
+    return _select_top_volumes(list(zip(VOLUMES, scores)), beam_width)
+
+
+def initialize_volume_embeddings():
+    """
+    Embed every volume description once with `Settings.embed_model`.
+
+    The vectors are stored as a row-normalised float32 matrix so that ranking
+    a query only needs one query embedding and one matrix-vector product.
+    """
+    global _volume_embeddings
+    texts = [f"{volume['name']}: {volume['description']}" for volume in VOLUMES]
+    vectors = np.asarray(
+        Settings.embed_model.get_text_embedding_batch(texts), dtype=np.float32
+    )
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    _volume_embeddings = vectors / np.where(norms == 0, 1.0, norms)
+    logger.info(
+        "Precomputed %d volume description embeddings (dim=%d).",
+        vectors.shape[0],
+        vectors.shape[1],
+    )
+
+
+async def ascore_volumes_with_embeddings(query, beam_width):
+    """
+    Rank volumes by cosine similarity between the query embedding and the
+    precomputed volume description embeddings, without any LLM call.
+    Returns the top-k (beam_width) volumes as (volume, score) pairs.
+    """
+    if _volume_embeddings is None:
+        await asyncio.to_thread(initialize_volume_embeddings)
+
+    query_vector = np.asarray(
+        await Settings.embed_model.aget_query_embedding(query), dtype=np.float32
+    )
+    norm = np.linalg.norm(query_vector)
+    if norm:
+        query_vector /= norm
+    similarities = _volume_embeddings @ query_vector
+
+    scored_volumes = [
+        (volume, float(score)) for volume, score in zip(VOLUMES, similarities)
+    ]
+    return _select_top_volumes(scored_volumes, beam_width)
+
+
+async def select_volumes(query, beam_width):
+    """
+    Rank volumes for the query using the strategy set by `VOLUME_SCORING_MODE`.
+    Returns the top-k (beam_width) volumes as (volume, score) pairs.
+    """
+    if settings.VOLUME_SCORING_MODE == "batched":
+        return await ascore_volumes_batched(query, beam_width)
+    if settings.VOLUME_SCORING_MODE == "embedding":
+        return await ascore_volumes_with_embeddings(query, beam_width)
+    return await ascore_volumes_with_llm(query, beam_width)
@@ -0,0 +1,129 @@
+"""
+Service module for warming up the backend after startup.
+
+Runs synthetic requests through the embedding model, the LLM, the
+tokenizer and every loaded query engine, so that Bedrock client creation,
+TLS handshakes, lazily built retrieval structures and page-cache misses on
+memory-mapped indexes are paid before the first user request. Warm-up runs
+in the background; the readiness state reports "ready" only once it has
+finished, so load balancers can hold traffic back from cold instances.
+
+The query response cache is not primed: entries are keyed by the exact
+user query, so an answer to the synthetic warm-up query would never be
+served, and priming real queries would need an LLM call per query.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config.settings import settings
+from logger import logger
+
+
+class ReadinessState:
+    """Readiness of the instance and the timings of its warm-up components."""
+
+    def __init__(self):
+        self.status = "starting"
+        self.component_seconds: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == "ready"
+
+
+readiness = ReadinessState()
+
+# Strong reference to the running warm-up task
+_warm_up_task: Optional[asyncio.Task] = None
+
+
+async def _run_component(name: str, warm_up: Callable[[], Awaitable[Any]]) -> None:
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    from .query_executor import QueryRejectedError
+
+    start = time.perf_counter()
+    try:
+        await warm_up()
+    except (BotoCoreError, ClientError, OSError, ValueError, QueryRejectedError) as e:
+        logger.error("Warm-up of %s failed: %s", name, e, exc_info=True)
+        readiness.errors[name] = str(e)
+    readiness.component_seconds[name] = time.perf_counter() - start
+
+
+async def warm_up_application(engines: Dict[str, Any]) -> None:
+    """
+    Warm up the models and query engines, then mark the instance ready.
+
+    Model call and index read failures are logged and reported in the
+    readiness state but do not block readiness, since a retry on the first
+    request would fail the same way. Any other error stops warm-up and
+    leaves the instance not ready.
+
+    Args:
+        engines (Dict[str, Any]): Loaded query engines by engine type.
+    """
+    from llama_index.core.settings import Settings
+    from llama_index.core.utils import get_tokenizer
+
+    from .index_service import warm_up_query_engine
+    from .query_executor import query_executor
+
+    readiness.status = "warming_up"
+    start = time.perf_counter()
+    query = settings.WARMUP_QUERY
+
+    embed_model = Settings.embed_model
+    await _run_component(
+        "embedding_model",
+        lambda: asyncio.gather(
+            # Retrieval embeds with the sync client, caching and routing with
+            # the async one
+            asyncio.to_thread(embed_model.get_query_embedding, query),
+            embed_model.aget_query_embedding(query),
+        ),
+    )
+    await _run_component("tokenizer", lambda: asyncio.to_thread(get_tokenizer(), query))
+    if settings.WARMUP_LLM:
+        await _run_component(
+            "llm",
+            lambda: asyncio.to_thread(Settings.llm.complete, "Reply with OK."),
+        )
+    for engine_type, engine in engines.items():
+        await _run_component(
+            f"{engine_type}_engine",
+            lambda engine=engine: query_executor.run(
+                warm_up_query_engine, engine, query
+            ),
+        )
+
+    readiness.status = "ready"
+    logger.info(
+        "Warm-up finished in %.2fs: %s",
+        time.perf_counter() - start,
+        ", ".join(
+            f"{name} {seconds:.2f}s"
+            for name, seconds in readiness.component_seconds.items()
+        ),
+    )
+
+
+def start_warm_up(engines: Dict[str, Any]) -> None:
+    """Start warm-up in the background, or mark ready at once if it is disabled."""
+    global _warm_up_task
+    if not settings.WARMUP_ENABLED:
+        readiness.status = "ready"
+        return
+    _warm_up_task = asyncio.get_running_loop().create_task(warm_up_application(engines))
+    _warm_up_task.add_done_callback(_log_warm_up_failure)
+
+
+def _log_warm_up_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            "Warm-up stopped; the instance stays not ready.",
+            exc_info=task.exception(),
+        )
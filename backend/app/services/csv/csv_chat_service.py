@@ -29,6 +29,10 @@ from app.services.csv.utils import (
     extract_eda_stats,
     get_dataframe,
 )
+from app.services.stores.embedding_cache import (
+    CachedLangChainEmbeddings,
+    EmbeddingCache,
+)
 
 # Initialize LLM and embedding models
 llm = ChatBedrock(
@@ -39,6 +43,13 @@ llm = ChatBedrock(
 embed_model = BedrockEmbeddings(
     model_id=settings.LANGCHAIN_EMBEDDING_MODEL, region_name=settings.AWS_REGION
 )
+if settings.EMBEDDING_CACHE_ENABLED:
+    embed_model = CachedLangChainEmbeddings(
+        embed_model,
+        EmbeddingCache(
+            settings.EMBEDDING_CACHE_DIR, settings.LANGCHAIN_EMBEDDING_MODEL
+        ),
+    )
 
 
 def _estimate_token_count(text: str) -> int:
@@ -126,6 +137,8 @@ def build_csv_index(df: pd.DataFrame, index_path: Path) -> None:
     docs = chunk_csv_table(df)
     vectorstore = FAISS.from_documents(docs, embedding=embed_model)
     vectorstore.save_local(str(index_path), index_name="index")
+    if isinstance(embed_model, CachedLangChainEmbeddings):
+        logger.info("CSV embedding cache stats: %s", embed_model.cache.stats())
 
 
 def load_csv_query_engine(index_path: Path) -> Runnable:
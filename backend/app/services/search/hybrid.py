@@ -0,0 +1,97 @@
+"""
+Service module for hybrid (BM25 + k-NN) document search.
+
+Provides the dense embeddings stored with each chunk at ingest and used
+for k-NN queries, and the fusion of BM25 and k-NN result lists into one
+ranking. Embeddings come from the LlamaIndex embedding model, which is
+initialized on first use so that deployments serving BM25 search only
+never load it.
+
+Fusion operates on OpenSearch hits (dicts with `_id` and `_score`):
+- Reciprocal rank fusion scores a hit by the weighted sum of
+  `1 / (k + rank)` over the lists it appears in; it ignores raw scores,
+  which are not comparable between BM25 and cosine similarity.
+- Normalized score fusion min-max scales each list's scores to [0, 1]
+  and sums them with the given weights.
+"""
+
+from typing import Dict, List, Sequence
+
+
+async def embed_texts(texts: List[str]) -> List[List[float]]:
+    """Embed chunk texts for storage, served from the embedding cache where possible."""
+    from llama_index.core.settings import Settings
+
+    from services.bot.llm_service import ensure_llm_settings
+
+    ensure_llm_settings()
+    return await Settings.embed_model.aget_text_embedding_batch(texts)
+
+
+async def embed_query(query: str) -> List[float]:
+    """Embed a search query for k-NN retrieval."""
+    from llama_index.core.settings import Settings
+
+    from services.bot.llm_service import ensure_llm_settings
+
+    ensure_llm_settings()
+    return await Settings.embed_model.aget_query_embedding(query)
+
+
+def _fused(hits_by_id: Dict[str, Dict], scores: Dict[str, float]) -> List[Dict]:
+    """Return hits ordered by fused score, with `_score` set to that score."""
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return [{**hits_by_id[hit_id], "_score": score} for hit_id, score in ranked]
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[List[Dict]], weights: Sequence[float], k: int = 60
+) -> List[Dict]:
+    """
+    Fuse ranked hit lists with weighted reciprocal rank fusion.
+
+    Args:
+        result_lists (Sequence[List[Dict]]): Hits of each retriever, best first.
+        weights (Sequence[float]): Weight of each retriever.
+        k (int): Rank constant; larger values flatten the rank discount.
+
+    Returns:
+        List[Dict]: Unique hits ordered by fused score.
+    """
+    hits_by_id: Dict[str, Dict] = {}
+    scores: Dict[str, float] = {}
+    for hits, weight in zip(result_lists, weights):
+        for rank, hit in enumerate(hits, start=1):
+            hits_by_id.setdefault(hit["_id"], hit)
+            scores[hit["_id"]] = scores.get(hit["_id"], 0.0) + weight / (k + rank)
+    return _fused(hits_by_id, scores)
+
+
+def normalized_score_fusion(
+    result_lists: Sequence[List[Dict]], weights: Sequence[float]
+) -> List[Dict]:
+    """
+    Fuse hit lists by a weighted sum of min-max normalized scores.
+
+    A hit missing from a list contributes 0 for it. When all scores in a
+    list are equal, each of its hits contributes the full weight.
+
+    Args:
+        result_lists (Sequence[List[Dict]]): Hits of each retriever.
+        weights (Sequence[float]): Weight of each retriever.
+
+    Returns:
+        List[Dict]: Unique hits ordered by fused score.
+    """
+    hits_by_id: Dict[str, Dict] = {}
+    scores: Dict[str, float] = {}
+    for hits, weight in zip(result_lists, weights):
+        if not hits:
+            continue
+        raw = [hit.get("_score") or 0.0 for hit in hits]
+        low, high = min(raw), max(raw)
+        for hit, score in zip(hits, raw):
+            normalized = (score - low) / (high - low) if high > low else 1.0
+            hits_by_id.setdefault(hit["_id"], hit)
+            scores[hit["_id"]] = scores.get(hit["_id"], 0.0) + weight * normalized
+    return _fused(hits_by_id, scores)
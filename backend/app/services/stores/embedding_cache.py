@@ -0,0 +1,215 @@
+# services/stores/embedding_cache.py
+"""
+Persistent, content-addressed cache of document embeddings.
+
+Embeddings are stored per embedding model as a contiguous float32 matrix
+(`vectors.f32`, read through a NumPy memory map) alongside a parallel file
+of 32-byte SHA-256 digests of the embedded text (`keys.bin`). A cache hit
+skips the call to the embedding provider entirely.
+
+Adapters are provided for both embedding stacks used by the backend:
+`CachedLangChainEmbeddings` here for LangChain (`BedrockEmbeddings`) and
+`services.bot.embedding_service.CachedEmbedding` for LlamaIndex
+(`Settings.embed_model`), kept apart so the CSV feature does not import
+LlamaIndex. Only document embeddings are cached; query embeddings are
+passed through since some models embed queries and documents differently.
+
+The cache files are appended to by a single process; concurrent writers
+from separate processes are not supported.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from logger import logger
+
+KEY_SIZE = 32  # SHA-256 digest length in bytes
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """On-disk float32 embedding cache for a single embedding model."""
+
+    def __init__(self, cache_dir: Path, model_id: str):
+        self.model_id = model_id
+        self.path = Path(cache_dir) / re.sub(r"[^A-Za-z0-9._-]", "_", model_id)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._keys_path = self.path / "keys.bin"
+        self._vectors_path = self.path / "vectors.f32"
+        self._meta_path = self.path / "meta.json"
+
+        self._lock = threading.Lock()
+        self._index: Dict[bytes, int] = {}
+        self._dim: Optional[int] = None
+        self._count = 0
+        self._vectors: Optional[np.memmap] = None
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        """Load the key index and map the vector file, repairing partial writes."""
+        if not self._meta_path.exists():
+            return
+        self._dim = json.loads(self._meta_path.read_text(encoding="utf-8"))["dim"]
+        keys = self._keys_path.read_bytes() if self._keys_path.exists() else b""
+        vector_bytes = (
+            self._vectors_path.stat().st_size if self._vectors_path.exists() else 0
+        )
+        row_bytes = self._dim * 4
+        count = min(len(keys) // KEY_SIZE, vector_bytes // row_bytes)
+
+        # Truncate a trailing partial write so both files stay aligned
+        if len(keys) != count * KEY_SIZE or vector_bytes != count * row_bytes:
+            logger.warning(
+                "Repairing embedding cache at %s to %d entries.", self.path, count
+            )
+            with self._keys_path.open("r+b") as f:
+                f.truncate(count * KEY_SIZE)
+            with self._vectors_path.open("r+b") as f:
+                f.truncate(count * row_bytes)
+
+        self._index = {keys[i * KEY_SIZE : (i + 1) * KEY_SIZE]: i for i in range(count)}
+        self._count = count
+        self._remap()
+        logger.info(
+            "Loaded embedding cache for '%s' with %d entries (dim=%d).",
+            self.model_id,
+            count,
+            self._dim,
+        )
+
+    def _remap(self) -> None:
+        if self._count and self._dim:
+            self._vectors = np.memmap(
+                self._vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(self._count, self._dim),
+            )
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Return the cached embedding for each text, or None on a miss."""
+        with self._lock:
+            results: List[Optional[List[float]]] = []
+            for text in texts:
+                row = self._index.get(_text_key(text))
+                if row is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self.hits += 1
+                    results.append(self._vectors[row].tolist())
+            return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[List[float]]) -> None:
+        """Append embeddings for texts that are not cached yet."""
+        with self._lock:
+            new_keys = []
+            new_rows = []
+            for text, vector in zip(texts, vectors):
+                key = _text_key(text)
+                if key in self._index:
+                    continue
+                row = np.asarray(vector, dtype=np.float32)
+                if self._dim is None:
+                    self._dim = int(row.shape[0])
+                    self._meta_path.write_text(
+                        json.dumps({"model_id": self.model_id, "dim": self._dim}),
+                        encoding="utf-8",
+                    )
+                if row.shape[0] != self._dim:
+                    logger.warning(
+                        "Skipping embedding of dim %d for cache with dim %d.",
+                        row.shape[0],
+                        self._dim,
+                    )
+                    continue
+                self._index[key] = self._count + len(new_rows)
+                new_keys.append(key)
+                new_rows.append(row)
+
+            if not new_rows:
+                return
+            with self._vectors_path.open("ab") as f:
+                f.write(np.stack(new_rows).tobytes())
+            with self._keys_path.open("ab") as f:
+                f.write(b"".join(new_keys))
+            self._count += len(new_rows)
+            self._remap()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of cached entries."""
+        lookups = self.hits + self.misses
+        return {
+            "model_id": self.model_id,
+            "entries": self._count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def embed_with_cache(self, texts: List[str], embed_fn) -> List[List[float]]:
+        """
+        Resolve embeddings from the cache, calling `embed_fn` only for misses.
+
+        Args:
+            texts (List[str]): Texts to embed.
+            embed_fn (Callable[[List[str]], List[List[float]]]): Embeds the
+                texts that are not cached.
+        """
+        results = self.get_many(texts)
+        missing = [i for i, vector in enumerate(results) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            vectors = embed_fn(missing_texts)
+            self.put_many(missing_texts, vectors)
+            for i, vector in zip(missing, vectors):
+                results[i] = list(vector)
+        return results
+
+    async def aembed_with_cache(self, texts: List[str], aembed_fn) -> List[List[float]]:
+        """Async variant of `embed_with_cache`."""
+        results = self.get_many(texts)
+        missing = [i for i, vector in enumerate(results) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            vectors = await aembed_fn(missing_texts)
+            self.put_many(missing_texts, vectors)
+            for i, vector in zip(missing, vectors):
+                results[i] = list(vector)
+        return results
+
+
+class CachedLangChainEmbeddings(Embeddings):
+    """LangChain embeddings wrapper backed by an `EmbeddingCache` for documents."""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.cache.embed_with_cache(texts, self.embeddings.embed_documents)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.cache.aembed_with_cache(
+            texts, self.embeddings.aembed_documents
+        )
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embeddings.aembed_query(text)
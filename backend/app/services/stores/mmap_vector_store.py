@@ -0,0 +1,259 @@
+# services/stores/mmap_vector_store.py
+"""
+Read-only, memory-mapped persisted layout for LlamaIndex vector indexes.
+
+A compact index directory holds:
+- `embeddings.npy`: contiguous float32 (nodes x dim) matrix, opened with mmap
+- `node_ids.npy`: node id of every line in `nodes.jsonl`
+- `norms.npy`: precomputed L2 norm of every embedding row
+- `nodes.jsonl`: one serialized node (without its embedding) per line, in
+  embedding row order, followed by the unembedded nodes of the docstore
+  (such as the parents of hierarchical leaf nodes)
+- `offsets.npy`: int64 byte offsets of each line in `nodes.jsonl`
+- `filter_index.json`: node ids per value of selected metadata fields
+
+Nothing is parsed up front except the small filter index, so loading is
+constant-time and resident memory stays flat as the corpus grows: vectors
+and node text are paged in by the OS only when a query touches them.
+"""
+
+import json
+import mmap
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+from llama_index.core import VectorStoreIndex
+from llama_index.core.schema import BaseNode
+from llama_index.core.storage.docstore.utils import doc_to_json, json_to_doc
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    VectorStoreQuery,
+    VectorStoreQueryResult,
+)
+from logger import logger
+from pydantic import PrivateAttr
+
+from .vector_search import ExactSearch, build_search_backend
+
+EMBEDDINGS_FILENAME = "embeddings.npy"
+NODE_IDS_FILENAME = "node_ids.npy"
+NORMS_FILENAME = "norms.npy"
+NODES_FILENAME = "nodes.jsonl"
+OFFSETS_FILENAME = "offsets.npy"
+FILTER_INDEX_FILENAME = "filter_index.json"
+
+
+def persist_compact_index(
+    index: VectorStoreIndex, persist_dir: str, filter_keys: Iterable[str] = ()
+) -> None:
+    """
+    Write the compact memory-mapped layout for an in-memory vector index.
+
+    The directory is written to a temporary sibling first and swapped in
+    once complete, so readers never observe a partially written layout.
+
+    Args:
+        index (VectorStoreIndex): Index whose docstore and vector store hold
+            the nodes and their embeddings.
+        persist_dir (str): Target directory of the compact layout.
+        filter_keys (Iterable[str]): Metadata fields to build the filter index for.
+    """
+    filter_keys = list(filter_keys)
+    embedded_ids = list(index.index_struct.nodes_dict)
+    embedded = set(embedded_ids)
+    node_ids = embedded_ids + [i for i in index.docstore.docs if i not in embedded]
+    tmp_dir = Path(f"{persist_dir}.tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    embeddings = []
+    offsets = [0]
+    filter_index: Dict[str, Dict[str, List[str]]] = {key: {} for key in filter_keys}
+    with (tmp_dir / NODES_FILENAME).open("wb") as f:
+        for node_id in node_ids:
+            node = index.docstore.get_node(node_id)
+            node_json = doc_to_json(node)
+            node_json["__data__"]["embedding"] = None
+            line = json.dumps(node_json, ensure_ascii=False).encode("utf-8") + b"\n"
+            f.write(line)
+            offsets.append(offsets[-1] + len(line))
+            if node_id not in embedded:
+                continue
+            embeddings.append(index.vector_store.get(node_id))
+            for key in filter_keys:
+                if key in node.metadata:
+                    value = str(node.metadata[key])
+                    filter_index[key].setdefault(value, []).append(node_id)
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    np.save(tmp_dir / EMBEDDINGS_FILENAME, matrix)
+    np.save(tmp_dir / NODE_IDS_FILENAME, np.asarray(node_ids, dtype=str))
+    np.save(tmp_dir / NORMS_FILENAME, np.linalg.norm(matrix, axis=1))
+    np.save(tmp_dir / OFFSETS_FILENAME, np.asarray(offsets, dtype=np.int64))
+    (tmp_dir / FILTER_INDEX_FILENAME).write_text(
+        json.dumps(filter_index), encoding="utf-8"
+    )
+
+    if os.path.exists(persist_dir):
+        shutil.rmtree(persist_dir)
+    os.replace(tmp_dir, persist_dir)
+    logger.info(
+        "Persisted compact index with %d nodes (%d embedded) to %s",
+        len(node_ids),
+        len(embedded_ids),
+        persist_dir,
+    )
+
+
+class MmapVectorStore(BasePydanticVectorStore):
+    """
+    Read-only vector store over the compact memory-mapped layout.
+
+    Stores node text alongside the vectors (`stores_text`), so an index
+    built with `VectorStoreIndex.from_vector_store` retrieves without a
+    docstore. Similarity is cosine, matching `SimpleVectorStore`, computed
+    by the configured search backend (exact search reads the mapped matrix
+    directly; FAISS backends build their index in memory).
+    """
+
+    stores_text: bool = True
+    persist_dir: str
+
+    _node_ids: np.ndarray = PrivateAttr()
+    _search: ExactSearch = PrivateAttr()
+    _offsets: np.ndarray = PrivateAttr()
+    _nodes: mmap.mmap = PrivateAttr()
+    _filter_index: Dict[str, Dict[str, List[str]]] = PrivateAttr()
+    _row_by_id: Optional[Dict[str, int]] = PrivateAttr(default=None)
+
+    def __init__(self, persist_dir: str, backend: Optional[str] = None, **kwargs: Any):
+        super().__init__(persist_dir=str(persist_dir), **kwargs)
+        path = Path(persist_dir)
+        self._node_ids = np.load(path / NODE_IDS_FILENAME, mmap_mode="r")
+        self._search = build_search_backend(
+            np.load(path / EMBEDDINGS_FILENAME, mmap_mode="r"),
+            np.load(path / NORMS_FILENAME, mmap_mode="r"),
+            kind=backend,
+        )
+        self._offsets = np.load(path / OFFSETS_FILENAME, mmap_mode="r")
+        with (path / NODES_FILENAME).open("rb") as f:
+            self._nodes = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._filter_index = json.loads(
+            (path / FILTER_INDEX_FILENAME).read_text(encoding="utf-8")
+        )
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "MmapVectorStore"
+
+    @property
+    def client(self) -> None:
+        return None
+
+    def __len__(self) -> int:
+        return len(self._search)
+
+    @property
+    def docstore(self) -> "CompactDocstore":
+        """Read-only docstore view over every node of the layout."""
+        return CompactDocstore(self)
+
+    def metadata_index(self, keys: Iterable[str]) -> Dict[str, Dict[str, Set[str]]]:
+        """Return node ids per value of each requested metadata field."""
+        return {
+            key: {
+                value: set(ids)
+                for value, ids in self._filter_index.get(key, {}).items()
+            }
+            for key in keys
+        }
+
+    def _get_node(self, row: int) -> BaseNode:
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return json_to_doc(json.loads(self._nodes[start:end]))
+
+    def _row_for_id(self, node_id: str) -> Optional[int]:
+        # Built on first use only; unfiltered queries never need the id lookup
+        if self._row_by_id is None:
+            self._row_by_id = {
+                str(node_id): row for row, node_id in enumerate(self._node_ids)
+            }
+        return self._row_by_id.get(node_id)
+
+    def _rows_for_ids(self, node_ids: List[str]) -> np.ndarray:
+        embedded = len(self)
+        rows = [self._row_for_id(i) for i in node_ids]
+        return np.asarray(
+            sorted(row for row in rows if row is not None and row < embedded),
+            dtype=np.int64,
+        )
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        """Return the top-k nodes by cosine similarity to the query embedding."""
+        if query.filters is not None:
+            raise ValueError(
+                "MmapVectorStore does not support metadata filters; "
+                "restrict the query with node_ids instead."
+            )
+        rows = None
+        if query.node_ids is not None:
+            rows = self._rows_for_ids(query.node_ids)
+        result_rows, similarities = self._search.search(
+            np.asarray(query.query_embedding, dtype=np.float32),
+            query.similarity_top_k,
+            rows,
+        )
+        nodes = [self._get_node(int(row)) for row in result_rows]
+        return VectorStoreQueryResult(
+            nodes=nodes,
+            similarities=[float(s) for s in similarities],
+            ids=[node.node_id for node in nodes],
+        )
+
+    def add(self, nodes: List[BaseNode], **add_kwargs: Any) -> List[str]:
+        raise NotImplementedError("MmapVectorStore is read-only.")
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        raise NotImplementedError("MmapVectorStore is read-only.")
+
+
+class CompactDocstore:
+    """
+    Docstore-style node lookup over a compact layout.
+
+    Implements the read methods used by retrievers (such as auto-merging
+    parent lookups) for nodes that live in the layout rather than in a
+    LlamaIndex docstore.
+    """
+
+    def __init__(self, vector_store: MmapVectorStore):
+        self._vector_store = vector_store
+
+    def get_node(self, node_id: str, raise_error: bool = True) -> Optional[BaseNode]:
+        row = self._vector_store._row_for_id(node_id)
+        if row is None:
+            if raise_error:
+                raise ValueError(f"node_id {node_id} not found.")
+            return None
+        return self._vector_store._get_node(row)
+
+    def get_document(self, doc_id: str, raise_error: bool = True) -> Optional[BaseNode]:
+        return self.get_node(doc_id, raise_error=raise_error)
+
+    def document_exists(self, doc_id: str) -> bool:
+        return self._vector_store._row_for_id(doc_id) is not None
+
+
+def load_compact_index(
+    persist_dir: str, backend: Optional[str] = None
+) -> VectorStoreIndex:
+    """Open a compact index directory as a query-only `VectorStoreIndex`."""
+    vector_store = MmapVectorStore(persist_dir, backend)
+    logger.info(
+        "Opened compact index with %d nodes from %s", len(vector_store), persist_dir
+    )
+    return VectorStoreIndex.from_vector_store(vector_store)
@@ -1,31 +1,293 @@
 # services/search/opensearch.py
-from opensearchpy import NotFoundError, OpenSearch
+import asyncio
+import random
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
+
+import aiohttp
+from opensearchpy import (
+    AIOHttpConnection,
+    AsyncOpenSearch,
+    NotFoundError,
+    TransportError,
+)
+from opensearchpy import ConnectionError as OpenSearchConnectionError
+from opensearchpy._async.http_aiohttp import OpenSearchClientResponse
 
 from app.config.settings import opensearch_config
 from app.logger import logger
+from app.services.search.hybrid import (
+    embed_query,
+    normalized_score_fusion,
+    reciprocal_rank_fusion,
+)
+
+# Item or request statuses worth retrying: overloaded or unavailable cluster
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+
+EMBEDDING_FIELD = "embedding"
+
+SearchMode = Literal["bm25", "vector", "hybrid"]
+FusionMethod = Literal["rrf", "weighted"]
+
+MAX_BATCH_QUERY = {
+    "size": 0,
+    "aggs": {"max_batch": {"max": {"field": "batch_number"}}},
+}
+
+
+def _index_body() -> Dict:
+    """Settings and mappings of a new index, with a k-NN field when embedding."""
+    mapping: Dict[str, Any] = {
+        "properties": {
+            "batch_number": {"type": "integer"},
+            "page_number": {"type": "integer"},
+            "word_count": {"type": "integer"},
+            "timestamp": {"type": "date"},
+        }
+    }
+    if not opensearch_config.INGEST_EMBEDDINGS:
+        return {"mappings": mapping}
+    mapping["properties"][EMBEDDING_FIELD] = {
+        "type": "knn_vector",
+        "dimension": opensearch_config.EMBEDDING_DIMENSION,
+        "method": {"name": "hnsw", "space_type": "cosinesimil", "engine": "lucene"},
+    }
+    return {"settings": {"index": {"knn": True}}, "mappings": mapping}
+
+
+def _has_knn_field(response: Dict) -> bool:
+    """Whether every index of a `get_mapping` response maps a k-NN embedding."""
+    fields = [
+        mapping.get("mappings", {}).get("properties", {}).get(EMBEDDING_FIELD, {})
+        for mapping in response.values()
+    ]
+    return bool(fields) and all(field.get("type") == "knn_vector" for field in fields)
+
+
+# A chunk ID and its serialized action and source lines
+BulkItem = Tuple[str, bytes]
+# Items to retry with their errors, and (chunk ID, error) permanent failures
+BulkFailures = Tuple[List[Tuple[BulkItem, str]], List[Tuple[str, str]]]
+
+
+def _bulk_batches(serializer: Any, chunks: list[dict]) -> Iterator[List[BulkItem]]:
+    """Serialize chunks into `_bulk` batches bounded by count and bytes."""
+    batch: List[BulkItem] = []
+    batch_bytes = 0
+    for chunk in chunks:
+        chunk_id = chunk.get("chunk_id")
+        action = {"index": {"_id": chunk_id} if chunk_id is not None else {}}
+        payload = (f"{serializer.dumps(action)}\n{serializer.dumps(chunk)}\n").encode(
+            "utf-8"
+        )
+        if batch and (
+            len(batch) >= opensearch_config.BULK_MAX_DOCS
+            or batch_bytes + len(payload) > opensearch_config.BULK_MAX_BYTES
+        ):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append((chunk_id or "N/A", payload))
+        batch_bytes += len(payload)
+    if batch:
+        yield batch
+
+
+def _bulk_body(batch: List[BulkItem]) -> bytes:
+    return b"".join(payload for _, payload in batch)
+
+
+def _bulk_request_failures(batch: List[BulkItem], e: TransportError) -> BulkFailures:
+    """Failures of a `_bulk` request that was rejected as a whole."""
+    if isinstance(e, OpenSearchConnectionError) or e.status_code in RETRYABLE_STATUSES:
+        return [(item, str(e)) for item in batch], []
+    return [], [(chunk_id, str(e)) for chunk_id, _ in batch]
+
+
+def _bulk_item_failures(batch: List[BulkItem], response: Dict) -> BulkFailures:
+    """Per-item failures reported in a `_bulk` response."""
+    retry: List[Tuple[BulkItem, str]] = []
+    errors: List[Tuple[str, str]] = []
+    if not response.get("errors"):
+        return retry, errors
+    for item, result in zip(batch, response["items"]):
+        outcome = next(iter(result.values()))
+        if "error" not in outcome:
+            continue
+        if outcome.get("status") in RETRYABLE_STATUSES:
+            retry.append((item, str(outcome["error"])))
+        else:
+            errors.append((item[0], str(outcome["error"])))
+    return retry, errors
+
+
+def _retry_delay(index_name: str, retry: list, batch: list, attempt: int) -> float:
+    """Log a bulk retry and return its backoff delay."""
+    delay = opensearch_config.BULK_RETRY_BASE_DELAY * (2**attempt)
+    delay += random.uniform(0, delay / 2)
+    logger.warning(
+        "Retrying %d of %d chunks for '%s' (attempt %d/%d) in %.1fs.",
+        len(retry),
+        len(batch),
+        index_name,
+        attempt + 1,
+        opensearch_config.BULK_MAX_RETRIES,
+        delay,
+    )
+    return delay
+
+
+def _overrides_refresh(chunks: list[dict]) -> bool:
+    threshold = opensearch_config.BULK_REFRESH_THRESHOLD
+    return bool(threshold) and len(chunks) >= threshold
+
+
+def _refresh_interval(response: Dict, index_name: str) -> Optional[str]:
+    return (
+        response.get(index_name, {})
+        .get("settings", {})
+        .get("index", {})
+        .get("refresh_interval")
+    )
+
+
+def _log_index_result(
+    index_name: str, chunks: list[dict], failed: List[Tuple[str, str]]
+) -> int:
+    """Log failed chunks and the success count; return the indexed count."""
+    for chunk_id, error in failed:
+        logger.error(
+            "Failed to index chunk %s into '%s': %s", chunk_id, index_name, error
+        )
+    indexed_count = len(chunks) - len(failed)
+    logger.info(
+        "Successfully indexed %d out of %d chunks into '%s'.",
+        indexed_count,
+        len(chunks),
+        index_name,
+    )
+    return indexed_count
 
 
-class OpenSearchStore:
+def _search_body(query: str, size: int) -> Dict:
+    return {
+        "query": {"match": {"contents.md": {"query": query, "fuzziness": "AUTO"}}},
+        "size": size,
+        "_source": {"excludes": [EMBEDDING_FIELD]},
+    }
+
+
+def _knn_body(vector: List[float], size: int) -> Dict:
+    return {
+        "query": {"knn": {EMBEDDING_FIELD: {"vector": vector, "k": size}}},
+        "size": size,
+        "_source": {"excludes": [EMBEDDING_FIELD]},
+    }
+
+
+def _map_hits(hits: List[Dict], index_name: str, query: str) -> list[dict]:
+    """Map each hit's `_source` to the SearchResultItem schema."""
+    logger.info(
+        "Found %d hits for query '%s' in index '%s'.",
+        len(hits),
+        query,
+        index_name,
+    )
+    mapped_results = []
+    for hit in hits:
+        src = hit.get("_source", {})
+        mapped_results.append(
+            {
+                "chunk_id": src.get("id") or src.get("chunk_id"),
+                "score": hit.get("_score", 0.0),
+                "text": (
+                    (src.get("contents", {}) or {}).get("md")
+                    if src.get("contents")
+                    else src.get("text", "")
+                ),
+                "page_number": src.get("rule_page") or src.get("page_number") or 0,
+            }
+        )
+    return mapped_results
+
+
+def _next_batch_number(response: Dict, index_name: str) -> int:
+    max_batch = response["aggregations"]["max_batch"]["value"]
+    if max_batch is None:
+        logger.info(
+            "No existing 'batch_number' found in '%s'. Starting with 1.",
+            index_name,
+        )
+        return 1
+    next_batch = int(max_batch) + 1
+    logger.info(
+        "Max batch number found is %d. Next batch will be %d.",
+        int(max_batch),
+        next_batch,
+    )
+    return next_batch
+
+
+class PooledAIOHttpConnection(AIOHttpConnection):
+    """
+    AIOHttpConnection whose connection pool keeps idle connections open for
+    `OPENSEARCH_KEEPALIVE_TIMEOUT` seconds, so bursts of searches reuse
+    TCP/TLS connections instead of reconnecting.
+
+    `_create_aiohttp_session` is a copy of the private method of the same
+    name in opensearch-py, with only the connector's keep-alive changed. It
+    relies on the `opensearch-py==3.0.0` pin; re-check it when upgrading.
+    """
+
+    async def _create_aiohttp_session(self) -> None:
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+        self.session = aiohttp.ClientSession(
+            headers=self.headers,
+            skip_auto_headers=("accept", "accept-encoding"),
+            auto_decompress=True,
+            loop=self.loop,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            response_class=OpenSearchClientResponse,
+            connector=aiohttp.TCPConnector(
+                limit=self._limit,
+                keepalive_timeout=opensearch_config.KEEPALIVE_TIMEOUT,
+                use_dns_cache=True,
+                enable_cleanup_closed=True,
+                ssl=self._ssl_context,
+            ),
+            trust_env=self._trust_env,
+        )
+
+
+class AsyncOpenSearchStore:
+    """
+    OpenSearch index management, bulk ingest and BM25, vector and hybrid search.
+
+    Requests run on the event loop over one shared, pooled connection per
+    host (`OPENSEARCH_MAX_CONNECTIONS`), so concurrent searches are not
+    limited by the size of the worker threadpool. Call `close` on shutdown.
+    """
+
     def __init__(self):
-        self.client: OpenSearch = opensearch_config.get_client()
+        self.client: AsyncOpenSearch = opensearch_config.get_async_client(
+            connection_class=PooledAIOHttpConnection
+        )
+        # Whether each index has a k-NN embedding field, see `supports_knn`
+        self._knn_indexes: Dict[str, bool] = {}
 
-    def create_index(self, index_name: str) -> None:
+    async def close(self) -> None:
+        await self.client.close()
+
+    async def create_index(self, index_name: str) -> None:
         """
         Create an index with the required mapping if it does not exist.
         Logs the result or any errors encountered.
         """
         try:
-            if not self.client.indices.exists(index=index_name):
+            if not await self.client.indices.exists(index=index_name):
                 logger.info("Attempting to create index: %s", index_name)
-                mapping = {
-                    "properties": {
-                        "batch_number": {"type": "integer"},
-                        "page_number": {"type": "integer"},
-                        "word_count": {"type": "integer"},
-                        "timestamp": {"type": "date"},
-                    }
-                }
-                self.client.indices.create(index=index_name, body={"mappings": mapping})
+                await self.client.indices.create(index=index_name, body=_index_body())
+                self._knn_indexes.pop(index_name, None)
                 logger.info("Index '%s' created successfully with mapping.", index_name)
             else:
                 logger.info("Index '%s' already exists. Skipping creation.", index_name)
@@ -33,39 +295,51 @@ class OpenSearchStore:
             logger.error("Error creating index '%s': %s", index_name, e, exc_info=True)
             raise
 
-    def get_next_batch_number(self, index_name: str) -> int:
+    async def supports_knn(self, index_name: str) -> bool:
+        """
+        Whether the index maps the chunk embedding as a `knn_vector` field.
+
+        Indexes created before embeddings were stored lack it, and `index.knn`
+        cannot be enabled on an existing index, so they only serve BM25
+        search until reindexed. The answer is cached per index, so the
+        mapping is read, and the reindex hint logged, once.
+        """
+        if index_name in self._knn_indexes:
+            return self._knn_indexes[index_name]
+        try:
+            response = await self.client.indices.get_mapping(index=index_name)
+        except NotFoundError:
+            return False
+        except TransportError as e:
+            logger.warning("Could not read the mapping of '%s': %s", index_name, e)
+            return False
+        supported = _has_knn_field(response)
+        self._knn_indexes[index_name] = supported
+        if not supported:
+            logger.warning(
+                "Index '%s' has no knn_vector '%s' field; it is indexed and "
+                "searched for BM25 only. Reindex it into a new index to enable "
+                "vector and hybrid search.",
+                index_name,
+                EMBEDDING_FIELD,
+            )
+        return supported
+
+    async def get_next_batch_number(self, index_name: str) -> int:
         """
         Get the next batch number for the given index.
         Returns 1 if the index or batch number does not exist.
         """
         logger.info("Querying for max batch number in index '%s'.", index_name)
         try:
-            if not self.client.indices.exists(index=index_name):
+            if not await self.client.indices.exists(index=index_name):
                 logger.info(
                     "Index '%s' does not exist. Starting with batch number 1.",
                     index_name,
                 )
                 return 1
-            query = {
-                "size": 0,
-                "aggs": {"max_batch": {"max": {"field": "batch_number"}}},
-            }
-            response = self.client.search(index=index_name, body=query)
-            max_batch = response["aggregations"]["max_batch"]["value"]
-            if max_batch is None:
-                logger.info(
-                    "No existing 'batch_number' found in '%s'. Starting with 1.",
-                    index_name,
-                )
-                return 1
-            else:
-                next_batch = int(max_batch) + 1
-                logger.info(
-                    "Max batch number found is %d. Next batch will be %d.",
-                    int(max_batch),
-                    next_batch,
-                )
-                return next_batch
+            response = await self.client.search(index=index_name, body=MAX_BATCH_QUERY)
+            return _next_batch_number(response, index_name)
         except NotFoundError:
             logger.warning(
                 "Index '%s' not found while getting batch number. Returning 1.",
@@ -81,87 +355,146 @@ class OpenSearchStore:
             )
             return 1
 
-    def index_chunks(self, index_name: str, chunks: list[dict]) -> None:
+    async def index_chunks(self, index_name: str, chunks: list[dict]) -> int:
         """
-        Index a list of chunk documents into the specified index.
-        Logs the number of successfully indexed chunks.
+        Index a list of chunk documents into the specified index with the
+        `_bulk` API.
+
+        Chunks are sent in batches bounded by document count and payload
+        size, up to `OPENSEARCH_BULK_WORKERS` batches concurrently. Items
+        rejected with a retryable status (e.g. 429 when the cluster is
+        overloaded) are retried on their own with backoff; other failed items
+        are logged individually. Large ingests disable the index refresh
+        interval until all batches are written.
+
+        Returns:
+            int: The number of successfully indexed chunks.
         """
         if not chunks:
             logger.warning("No chunks provided for indexing in '%s'.", index_name)
-            return
-        indexed_count = 0
-        for chunk in chunks:
-            try:
-                self.client.index(
-                    index=index_name, body=chunk, id=chunk.get("chunk_id")
+            return 0
+        override_refresh = _overrides_refresh(chunks)
+        if override_refresh:
+            previous_refresh = await self._disable_refresh(index_name)
+        try:
+            semaphore = asyncio.Semaphore(opensearch_config.BULK_WORKERS)
+
+            async def send(batch: List[BulkItem]) -> List[Tuple[str, str]]:
+                async with semaphore:
+                    return await self._bulk_with_retry(index_name, batch)
+
+            batch_failures = await asyncio.gather(
+                *(
+                    send(batch)
+                    for batch in _bulk_batches(self.client.transport.serializer, chunks)
                 )
-                indexed_count += 1
-            except Exception as e:
-                logger.error(
-                    "Failed to index chunk %s into '%s': %s",
-                    chunk.get("chunk_id", "N/A"),
-                    index_name,
-                    e,
+            )
+        finally:
+            if override_refresh:
+                await self._restore_refresh(index_name, previous_refresh)
+        failed = [failure for failures in batch_failures for failure in failures]
+        return _log_index_result(index_name, chunks, failed)
+
+    async def _bulk_with_retry(
+        self, index_name: str, batch: List[BulkItem]
+    ) -> List[Tuple[str, str]]:
+        """Send one batch, retrying only its retryable failures with backoff."""
+        failed: List[Tuple[str, str]] = []
+        for attempt in range(opensearch_config.BULK_MAX_RETRIES + 1):
+            try:
+                response = await self.client.bulk(
+                    body=_bulk_body(batch), index=index_name
                 )
-        logger.info(
-            "Successfully indexed %d out of %d chunks into '%s'.",
-            indexed_count,
-            len(chunks),
-            index_name,
-        )
+                retry, errors = _bulk_item_failures(batch, response)
+            except TransportError as e:
+                retry, errors = _bulk_request_failures(batch, e)
+            failed.extend(errors)
+            if not retry:
+                break
+            if attempt >= opensearch_config.BULK_MAX_RETRIES:
+                failed.extend((item[0], error) for item, error in retry)
+                break
+            await asyncio.sleep(_retry_delay(index_name, retry, batch, attempt))
+            batch = [item for item, _ in retry]
+        return failed
+
+    async def _disable_refresh(self, index_name: str) -> Optional[str]:
+        """Disable index refresh; return the previous interval (None if unset)."""
+        try:
+            response = await self.client.indices.get_settings(
+                index=index_name, name="index.refresh_interval"
+            )
+            await self.client.indices.put_settings(
+                index=index_name, body={"index": {"refresh_interval": "-1"}}
+            )
+            logger.info("Disabled refresh on '%s' for bulk indexing.", index_name)
+            return _refresh_interval(response, index_name)
+        except TransportError as e:
+            logger.warning("Could not disable refresh on '%s': %s", index_name, e)
+            return None
 
-    def search_chunks(self, index_name: str, query: str, size: int = 10) -> list[dict]:
+    async def _restore_refresh(self, index_name: str, previous: Optional[str]) -> None:
+        """Restore the refresh interval (the default if it was unset) and refresh."""
+        try:
+            await self.client.indices.put_settings(
+                index=index_name, body={"index": {"refresh_interval": previous}}
+            )
+            await self.client.indices.refresh(index=index_name)
+            logger.info("Restored refresh on '%s'.", index_name)
+        except TransportError as e:
+            logger.error(
+                "Failed to restore refresh interval on '%s': %s",
+                index_name,
+                e,
+                exc_info=True,
+            )
+
+    async def search_chunks(
+        self,
+        index_name: str,
+        query: str,
+        size: int = 10,
+        mode: Optional[SearchMode] = None,
+        fusion: Optional[FusionMethod] = None,
+        bm25_weight: Optional[float] = None,
+        vector_weight: Optional[float] = None,
+    ) -> list[dict]:
         """
-        Executes a match query against the 'text' field and returns the entire
-        _source document for each hit, providing the frontend with all necessary data.
+        Search the index and return the entire _source document for each hit,
+        providing the frontend with all necessary data.
+
+        Modes: "bm25" runs a fuzzy match query against 'contents.md',
+        "vector" a k-NN query over the chunk embeddings, and "hybrid" runs
+        both concurrently and fuses the results with reciprocal rank fusion
+        ("rrf") or normalized scores ("weighted"). Arguments left unset use
+        the `OPENSEARCH_SEARCH_*` defaults. Indexes without a k-NN mapping
+        (see `supports_knn`) are searched with BM25 in every mode, and hybrid
+        searches fall back to the BM25 results when the k-NN query fails.
         """
         if not query:
             logger.warning("Search query is empty. Returning no results.")
             return []
 
+        mode = mode or opensearch_config.SEARCH_MODE
         try:
+            if mode != "bm25" and not await self.supports_knn(index_name):
+                mode = "bm25"
             logger.info(
-                "Searching index '%s' for query: '%s' with size: %d",
+                "Searching index '%s' (%s) for query: '%s' with size: %d",
                 index_name,
+                mode,
                 query,
                 size,
             )
-            search_body = {
-                "query": {
-                    "match": {"contents.md": {"query": query, "fuzziness": "AUTO"}}
-                },
-                "size": size,
-            }
-
-            response = self.client.search(index=index_name, body=search_body)
-
-            hits = response.get("hits", {}).get("hits", [])
-            logger.info(
-                "Found %d hits for query '%s' in index '%s'.",
-                len(hits),
-                query,
-                index_name,
-            )
-
-            # Map each hit to the SearchResultItem schema
-            mapped_results = []
-            for hit in hits:
-                src = hit.get("_source", {})
-                mapped_results.append(
-                    {
-                        "chunk_id": src.get("id") or src.get("chunk_id"),
-                        "score": hit.get("_score", 0.0),
-                        "text": (
-                            (src.get("contents", {}) or {}).get("md")
-                            if src.get("contents")
-                            else src.get("text", "")
-                        ),
-                        "page_number": src.get("rule_page")
-                        or src.get("page_number")
-                        or 0,
-                    }
+            if mode == "bm25":
+                hits = await self._hits(index_name, _search_body(query, size))
+            elif mode == "vector":
+                hits = await self._knn_hits(index_name, query, size)
+            else:
+                hits = await self._hybrid_hits(
+                    index_name, query, size, fusion, bm25_weight, vector_weight
                 )
-            return mapped_results
+            return _map_hits(hits, index_name, query)
 
         except NotFoundError:
             logger.warning(
@@ -177,3 +510,53 @@ class OpenSearchStore:
                 exc_info=True,
             )
             return []
+
+    async def _hits(self, index_name: str, body: Dict) -> List[Dict]:
+        response = await self.client.search(index=index_name, body=body)
+        return response.get("hits", {}).get("hits", [])
+
+    async def _knn_hits(self, index_name: str, query: str, size: int) -> List[Dict]:
+        vector = await embed_query(query)
+        return await self._hits(index_name, _knn_body(vector, size))
+
+    async def _hybrid_hits(
+        self,
+        index_name: str,
+        query: str,
+        size: int,
+        fusion: Optional[FusionMethod],
+        bm25_weight: Optional[float],
+        vector_weight: Optional[float],
+    ) -> List[Dict]:
+        """Run BM25 and k-NN retrieval concurrently and fuse their hits."""
+        candidates = max(size, opensearch_config.SEARCH_CANDIDATES)
+        bm25_hits, knn_hits = await asyncio.gather(
+            self._hits(index_name, _search_body(query, candidates)),
+            self._knn_hits(index_name, query, candidates),
+            return_exceptions=True,
+        )
+        if isinstance(bm25_hits, BaseException):
+            raise bm25_hits
+        if isinstance(knn_hits, BaseException):
+            logger.warning(
+                "k-NN search in '%s' failed; returning BM25 results only: %s",
+                index_name,
+                knn_hits,
+            )
+            return bm25_hits[:size]
+
+        weights = (
+            opensearch_config.SEARCH_BM25_WEIGHT
+            if bm25_weight is None
+            else bm25_weight,
+            opensearch_config.SEARCH_VECTOR_WEIGHT
+            if vector_weight is None
+            else vector_weight,
+        )
+        if (fusion or opensearch_config.SEARCH_FUSION) == "weighted":
+            fused = normalized_score_fusion([bm25_hits, knn_hits], weights)
+        else:
+            fused = reciprocal_rank_fusion(
+                [bm25_hits, knn_hits], weights, opensearch_config.SEARCH_RRF_K
+            )
+        return fused[:size]
@@ -0,0 +1,214 @@
+# services/stores/vector_search.py
+"""
+Similarity search backends for the LlamaIndex query engines.
+
+- `ExactSearch`: brute-force cosine similarity as a single BLAS
+  matrix-vector product over a float32 embedding matrix.
+- `FaissSearch`: approximate search with a FAISS IVF or HNSW index over
+  normalized vectors (inner product equals cosine similarity), for large
+  corpora. Queries restricted to a subset of rows (metadata filters) are
+  answered exactly over that subset.
+
+`ArrayVectorStore` exposes a backend as a read-only LlamaIndex vector
+store built from a persisted `SimpleVectorStore`, so it can replace the
+per-node Python scoring of the default store at query time.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from config.settings import settings
+from llama_index.core.schema import BaseNode
+from llama_index.core.vector_stores import SimpleVectorStore
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    VectorStoreQuery,
+    VectorStoreQueryResult,
+)
+from logger import logger
+from pydantic import PrivateAttr
+
+
+class ExactSearch:
+    """Exact cosine-similarity search over a (nodes x dim) float32 matrix."""
+
+    def __init__(self, embeddings: np.ndarray, norms: Optional[np.ndarray] = None):
+        self.embeddings = embeddings
+        self.norms = norms if norms is not None else np.linalg.norm(embeddings, axis=1)
+
+    def __len__(self) -> int:
+        return len(self.norms)
+
+    def search(
+        self, query: np.ndarray, top_k: int, rows: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the rows and similarities of the top-k most similar embeddings.
+
+        Args:
+            query (np.ndarray): Query embedding.
+            top_k (int): Number of results.
+            rows (Optional[np.ndarray]): Restrict the search to these rows.
+        """
+        embeddings, norms = self.embeddings, self.norms
+        if rows is not None:
+            embeddings, norms = embeddings[rows], norms[rows]
+        top_k = min(top_k, len(norms))
+        if top_k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        denominators = norms * np.linalg.norm(query)
+        similarities = np.divide(
+            embeddings @ query,
+            denominators,
+            out=np.zeros(len(norms), dtype=np.float32),
+            where=denominators != 0,
+        )
+        top = np.argpartition(-similarities, top_k - 1)[:top_k]
+        top = top[np.argsort(-similarities[top])]
+        result_rows = rows[top] if rows is not None else top
+        return result_rows, similarities[top]
+
+
+class FaissSearch(ExactSearch):
+    """Approximate cosine-similarity search with a FAISS IVF or HNSW index."""
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        kind: str,
+        norms: Optional[np.ndarray] = None,
+    ):
+        super().__init__(embeddings, norms)
+        import faiss
+
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32).copy()
+        faiss.normalize_L2(vectors)
+        dim = vectors.shape[1]
+        if kind == "faiss_hnsw":
+            index = faiss.IndexHNSWFlat(
+                dim, settings.FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT
+            )
+            index.hnsw.efSearch = settings.FAISS_HNSW_EF_SEARCH
+        else:
+            nlist = settings.FAISS_IVF_NLIST or int(4 * math.sqrt(len(vectors)))
+            # FAISS needs roughly 39 training points per list
+            nlist = max(1, min(nlist, len(vectors) // 39))
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFFlat(
+                quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(vectors)
+            index.nprobe = min(settings.FAISS_IVF_NPROBE, nlist)
+        index.add(vectors)
+        self.index = index
+
+    def search(
+        self, query: np.ndarray, top_k: int, rows: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if rows is not None:
+            return super().search(query, top_k, rows)
+        top_k = min(top_k, len(self))
+        if top_k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        norm = np.linalg.norm(query)
+        vector = (query / norm if norm else query).astype(np.float32)[np.newaxis, :]
+        similarities, result_rows = self.index.search(vector, top_k)
+        found = result_rows[0] >= 0
+        return result_rows[0][found], similarities[0][found]
+
+
+def build_search_backend(
+    embeddings: np.ndarray,
+    norms: Optional[np.ndarray] = None,
+    kind: Optional[str] = None,
+) -> ExactSearch:
+    """
+    Create the search backend selected by `VECTOR_BACKEND`.
+
+    FAISS backends fall back to exact search below `FAISS_MIN_NODES`, where
+    brute force is both exact and fast enough.
+    """
+    kind = kind or settings.VECTOR_BACKEND
+    if kind.startswith("faiss") and len(embeddings) >= settings.FAISS_MIN_NODES:
+        logger.info("Building %s search index over %d nodes.", kind, len(embeddings))
+        return FaissSearch(embeddings, kind, norms)
+    return ExactSearch(embeddings, norms)
+
+
+class ArrayVectorStore(BasePydanticVectorStore):
+    """
+    Read-only vector store that answers queries with a search backend.
+
+    Holds the embeddings of a persisted `SimpleVectorStore` as one float32
+    matrix. Nodes are resolved from the index docstore, as with the default
+    store.
+    """
+
+    stores_text: bool = False
+    backend: str
+
+    _node_ids: List[str] = PrivateAttr()
+    _row_by_id: Dict[str, int] = PrivateAttr()
+    _search: ExactSearch = PrivateAttr()
+
+    def __init__(
+        self, node_ids: List[str], embeddings: np.ndarray, backend: str, **kwargs: Any
+    ):
+        super().__init__(backend=backend, **kwargs)
+        self._node_ids = node_ids
+        self._row_by_id = {node_id: row for row, node_id in enumerate(node_ids)}
+        self._search = build_search_backend(embeddings, kind=backend)
+
+    @classmethod
+    def from_persist_dir(cls, persist_dir: str, backend: str) -> "ArrayVectorStore":
+        """Load the embeddings of a persisted `SimpleVectorStore`."""
+        embedding_dict = SimpleVectorStore.from_persist_dir(
+            persist_dir
+        ).data.embedding_dict
+        node_ids = list(embedding_dict)
+        embeddings = np.asarray(
+            [embedding_dict[node_id] for node_id in node_ids], dtype=np.float32
+        )
+        return cls(node_ids, embeddings, backend)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ArrayVectorStore"
+
+    @property
+    def client(self) -> None:
+        return None
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        """Return the ids and similarities of the top-k most similar nodes."""
+        if query.filters is not None:
+            raise ValueError(
+                "ArrayVectorStore does not support metadata filters; "
+                "restrict the query with node_ids instead."
+            )
+        rows = None
+        if query.node_ids is not None:
+            rows = np.asarray(
+                sorted(
+                    self._row_by_id[i] for i in query.node_ids if i in self._row_by_id
+                ),
+                dtype=np.int64,
+            )
+        result_rows, similarities = self._search.search(
+            np.asarray(query.query_embedding, dtype=np.float32),
+            query.similarity_top_k,
+            rows,
+        )
+        return VectorStoreQueryResult(
+            similarities=[float(s) for s in similarities],
+            ids=[self._node_ids[int(row)] for row in result_rows],
+        )
+
+    def add(self, nodes: List[BaseNode], **add_kwargs: Any) -> List[str]:
+        raise NotImplementedError("ArrayVectorStore is read-only.")
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        raise NotImplementedError("ArrayVectorStore is read-only.")
@@ -9,14 +9,9 @@ for the FastAPI application.
 import os
 
 from config.settings import settings
-from controllers.chat_controller import set_query_engine
 from fastapi import FastAPI
 from logger import logger
-from services.bot.index_service import (
-    get_hrag_query_engine,
-    get_traditional_query_engine,
-)
-from services.bot.llm_service import initialize_llm_settings
+from services.bot.warmup import readiness
 
 
 async def initialize_application(_app: FastAPI):
@@ -25,19 +20,47 @@ async def initialize_application(_app: FastAPI):
 
     Steps:
     - Initialize LLM and embedding models.
+    - Precompute volume description embeddings when embedding routing is enabled.
     - Verify that the data directory exists.
     - (Index creation is now handled during document upload.)
     - Load the query engine if index exists.
+    - Start warming up the models and loaded query engines in the background.
+
+    All steps belong to the RAG chat feature and are skipped when it is
+    disabled, leaving LlamaIndex unloaded.
 
     Args:
         app (FastAPI): The FastAPI application instance.
     """
     logger.info("Initializing application...")
 
+    if "chat" not in settings.ENABLED_FEATURES:
+        readiness.status = "ready"
+        logger.info("RAG chat disabled; skipped model and index initialization.")
+        return
+
+    _initialize_rag_chat()
+
+
+def _initialize_rag_chat():
+    """Initialize the models and query engines of the RAG chat feature."""
+    from controllers.chat_controller import set_query_engine
+    from services.bot.index_service import (
+        get_hrag_query_engine,
+        get_traditional_query_engine,
+    )
+    from services.bot.index_versions import current_version_path
+    from services.bot.llm_service import initialize_llm_settings
+    from services.bot.volume_selector import initialize_volume_embeddings
+    from services.bot.warmup import start_warm_up
+
     # Initialize LLM and embedding settings
     initialize_llm_settings()
     logger.info("LLM settings initialized.")
 
+    if settings.VOLUME_SCORING_MODE == "embedding":
+        initialize_volume_embeddings()
+
     data_dir = settings.DATA_DIR
     hrag_index_path = settings.HRAG_INDEX_PATH
     trad_rag_index_path = settings.TRAD_RAG_INDEX_PATH
@@ -48,18 +71,42 @@ async def initialize_application(_app: FastAPI):
             "Error: The directory %s does not exist. Please create this directory.",
             data_dir,
         )
+        start_warm_up({})
         return
 
     logger.info("Data directory exists.")
 
-    # Optionally, load existing indexes and query engines if present
-    if os.path.exists(hrag_index_path) and os.listdir(hrag_index_path):
-        query_engine = get_hrag_query_engine(hrag_index_path)
+    # Optionally, load the active index versions and query engines if present
+    engines = {}
+    hrag_version_path = current_version_path(hrag_index_path)
+    if hrag_version_path is not None:
+        query_engine = get_hrag_query_engine(hrag_version_path)
         set_query_engine(query_engine, "HRAG")
-        logger.info("HRAG query engine loaded and set.")
-    if os.path.exists(trad_rag_index_path) and os.listdir(trad_rag_index_path):
-        query_engine = get_traditional_query_engine(trad_rag_index_path)
+        engines["HRAG"] = query_engine
+        logger.info("HRAG query engine loaded and set from %s.", hrag_version_path)
+    trad_rag_version_path = current_version_path(trad_rag_index_path)
+    if trad_rag_version_path is not None:
+        query_engine = get_traditional_query_engine(trad_rag_version_path)
         set_query_engine(query_engine, "TradRAG")
-        logger.info("Traditional RAG query engine loaded and set.")
+        engines["TradRAG"] = query_engine
+        logger.info(
+            "Traditional RAG query engine loaded and set from %s.",
+            trad_rag_version_path,
+        )
+
+    start_warm_up(engines)
+    logger.info("Application initialization complete; warm-up started.")
+
+
+async def shutdown_application(_app: FastAPI):
+    """
+    Releases resources held by enabled features on shutdown.
+
+    Args:
+        app (FastAPI): The FastAPI application instance.
+    """
+    if "search" in settings.ENABLED_FEATURES:
+        from controllers.search_controller import opensearch_store
 
-    logger.info("Application initialization complete.")
+        await opensearch_store.close()
+        logger.info("OpenSearch connection pool closed.")
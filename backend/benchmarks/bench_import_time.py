@@ -0,0 +1,158 @@
+"""
+Benchmark of backend cold-start import time per enabled feature set.
+
+Imports `app.main` in a fresh interpreter under `python -X importtime` for
+each `ENABLED_FEATURES` combination, and reports the median total import
+time, the heavy dependencies that were loaded and the slowest top-level
+packages. Bytecode is compiled by a first unmeasured run, so the timings
+reflect a container restart rather than a first-ever start.
+
+For CI, `--max-seconds` fails the run when the median import time of the
+full feature set exceeds a budget, and `--check-isolation` fails it when a
+feature set loads a heavy dependency that only a disabled feature needs.
+
+Usage (from the backend directory):
+    python benchmarks/bench_import_time.py --runs 5 --top 10
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+FEATURES = ["chat", "search", "csv_chat"]
+
+# Heavy packages that only the given feature should load
+FEATURE_PACKAGES = {
+    "chat": {"llama_index", "faiss"},
+    "search": {"opensearchpy"},
+    "csv_chat": {"pandas", "langchain_aws", "langchain_community", "pdfplumber"},
+}
+HEAVY_PACKAGES = set().union(*FEATURE_PACKAGES.values())
+FIRST_PARTY = {"app"} | {path.stem for path in (BACKEND_DIR / "app").iterdir()}
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_profile(features: List[str]) -> List[Tuple[int, int, str]]:
+    """Import `app.main` in a subprocess; return (cumulative us, depth, module) rows."""
+    env = dict(
+        os.environ,
+        ENABLED_FEATURES=json.dumps(features),
+        PYTHONPATH=os.pathsep.join([str(BACKEND_DIR), str(BACKEND_DIR / "app")]),
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing app.main failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            _, cumulative, indent, module = match.groups()
+            rows.append((int(cumulative), (len(indent) - 1) // 2, module))
+    return rows
+
+
+def summarize(rows: List[Tuple[int, int, str]]) -> Tuple[float, set, Dict[str, int]]:
+    """Total seconds, heavy packages loaded and cumulative us per external package."""
+    total = sum(cumulative for cumulative, depth, _ in rows if depth == 0)
+    loaded = {module.split(".")[0] for _, _, module in rows}
+    # A package's first import is the outermost one; nested re-imports are cached
+    per_package: Dict[str, int] = {}
+    for cumulative, _, module in rows:
+        package = module.split(".")[0]
+        if package in FIRST_PARTY:
+            continue
+        per_package[package] = max(per_package.get(package, 0), cumulative)
+    return total / 1e6, loaded & HEAVY_PACKAGES, per_package
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="Measured runs per set")
+    parser.add_argument(
+        "--top", type=int, default=0, help="Slowest packages listed per set"
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=None,
+        help="Fail if the full feature set's median import time exceeds this",
+    )
+    parser.add_argument(
+        "--check-isolation",
+        action="store_true",
+        help="Fail if a set loads heavy packages of a disabled feature only",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Write results as JSON"
+    )
+    args = parser.parse_args()
+
+    feature_sets = [FEATURES] + [[feature] for feature in FEATURES] + [[]]
+    import_profile(FEATURES)  # compile bytecode
+
+    results = []
+    failures = []
+    print(f"{'features':<24} {'median s':>9} {'min s':>7}  heavy packages loaded")
+    for features in feature_sets:
+        totals = []
+        for _ in range(args.runs):
+            total, heavy, per_package = summarize(import_profile(features))
+            totals.append(total)
+        label = ",".join(features) or "(none)"
+        median = statistics.median(totals)
+        print(
+            f"{label:<24} {median:>9.2f} {min(totals):>7.2f}  "
+            f"{', '.join(sorted(heavy)) or '-'}"
+        )
+        for package, cumulative in sorted(
+            per_package.items(), key=lambda item: item[1], reverse=True
+        )[: args.top]:
+            print(f"    {package:<28} {cumulative / 1e6:>7.3f}s")
+        results.append(
+            {
+                "features": features,
+                "median_seconds": median,
+                "min_seconds": min(totals),
+                "heavy_packages": sorted(heavy),
+            }
+        )
+
+        allowed = set().union(*(FEATURE_PACKAGES[feature] for feature in features))
+        unexpected = heavy - allowed
+        if args.check_isolation and unexpected:
+            failures.append(f"{label} loads {', '.join(sorted(unexpected))}")
+        if (
+            args.max_seconds is not None
+            and features == FEATURES
+            and median > args.max_seconds
+        ):
+            failures.append(
+                f"{label} imports in {median:.2f}s (budget {args.max_seconds:.2f}s)"
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
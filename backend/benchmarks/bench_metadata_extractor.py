@@ -0,0 +1,263 @@
+"""
+Benchmark for rulebook document metadata extraction.
+
+Compares the previous extraction sequence (per-call `re.search` with
+uncompiled patterns and a `text.lower()` copy per keyword check) against
+`RulebookMetadataExtractor.extract_document_metadata` on a synthetic
+rulebook corpus, and verifies both produce identical metadata.
+
+Usage (from the backend directory):
+    python benchmarks/bench_metadata_extractor.py --docs 2000 --pages 40
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(BACKEND_DIR / "app"), str(BACKEND_DIR)]
+
+from services.bot.metadata_extractor import (
+    RulebookMetadataExtractor,
+    determine_hierarchy_level,
+)
+
+MONTHS = [
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+]
+VOLUME_TITLES = [
+    "Conventional Banks",
+    "Islamic Banks",
+    "Insurance",
+    "Investment Business",
+    "Specialised Licensees",
+]
+MODULE_TITLES = [
+    "Capital Adequacy",
+    "Business Conduct",
+    "Reporting Requirements",
+    "Enforcement",
+    "Users Guide",
+    "High-Level Controls",
+]
+FILLER = (
+    "Licensees must ensure that their policies are documented and approved by the "
+    "Board. The requirements in this Section shall apply to all conventional bank "
+    "licensees, and may be supplemented by guidance issued from time to time. "
+    "Capital and risk management arrangements are subject to compliance review, "
+    "reporting to the CBB and periodic governance assessment. "
+)
+
+
+def make_document(rng: random.Random, pages: int) -> str:
+    """Build one synthetic rulebook document of roughly `pages` pages."""
+    module = rng.choice(["CA", "BC", "PD", "EN", "HC", "UG"])
+    chapter = f"{module}-{rng.choice(['A', '1', '2', '3', 'B'])}"
+    lines = []
+    # Headers are placed after some body text so the patterns have to scan
+    body = FILLER * rng.randint(2, 6)
+    lines.append(body)
+    if rng.random() < 0.9:
+        lines.append(
+            f"Volume {rng.randint(1, 7)}: {rng.choice(VOLUME_TITLES)} Rulebook"
+        )
+    if rng.random() < 0.85:
+        lines.append(f"MODULE {module}: {rng.choice(MODULE_TITLES)}")
+    if rng.random() < 0.8:
+        lines.append(f"CHAPTER {chapter}: General Requirements")
+    for page in range(1, pages + 1):
+        if rng.random() < 0.7:
+            lines.append(
+                f"Section {chapter}.{rng.randint(1, 9)}: Page {page} of {pages}"
+            )
+        lines.append(f"{chapter}.{rng.randint(1, 9)}.{rng.randint(1, 30)} " + body)
+        if rng.random() < 0.3:
+            lines.append(f"{rng.choice(MONTHS)} {rng.randint(2005, 2025)}")
+        if rng.random() < 0.05:
+            lines.append("Article 44 of the CBB Law; Regulation issued pursuant to it.")
+        if rng.random() < 0.05:
+            lines.append("Sanctions and penalty provisions apply on enforcement.")
+    return "\n".join(lines)
+
+
+class LegacyExtractor:
+    """Copy of the extraction logic before patterns were precompiled."""
+
+    def __init__(self):
+        self.reference = RulebookMetadataExtractor()
+        self.volume_pattern = self.reference.volume_pattern
+        self.module_pattern = self.reference.module_pattern
+        self.chapter_pattern = self.reference.chapter_pattern
+        self.section_pattern = self.reference.section_pattern
+        self.date_pattern = self.reference.date_pattern
+        self.rule_indicators = self.reference.rule_indicators
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        ref = self.reference
+        metadata: Dict[str, Any] = {}
+
+        m = re.search(self.volume_pattern, text, re.IGNORECASE)
+        if m:
+            metadata["volume_number"] = m.group(1)
+            metadata["volume_type"] = ref._determine_volume_type(m.group(2))
+        m = re.search(self.module_pattern, text, re.IGNORECASE)
+        if m:
+            metadata["module_code"] = m.group(1)
+            metadata["module_category"] = ref._categorize_module(m.group(2))
+        m = re.search(self.chapter_pattern, text, re.IGNORECASE)
+        if m:
+            metadata["chapter_reference"] = m.group(1)
+            metadata["chapter_type"] = ref._determine_chapter_type(m.group(1))
+        m = re.search(self.section_pattern, text, re.IGNORECASE)
+        if m:
+            metadata["section_reference"] = m.group(1)
+            metadata["page_number"] = int(m.group(2))
+            metadata["total_pages"] = int(m.group(3))
+
+        dates = re.findall(self.date_pattern, text)
+        if dates:
+            latest = max(dates, key=lambda x: (int(x[1]), ref._month_to_number(x[0])))
+            metadata["last_updated"] = f"{latest[0]} {latest[1]}"
+            metadata["update_month"] = latest[0]
+            metadata["update_year"] = int(latest[1])
+
+        if "Article" in text and "CBB Law" in text:
+            metadata["legal_basis"] = "CBB Law"
+        if "Regulation" in text and "pursuant to" in text:
+            metadata["instrument_type"] = "Regulation"
+        elif "Directive" in text and "pursuant to" in text:
+            metadata["instrument_type"] = "Directive"
+        if "Islamic bank" in text.lower():
+            metadata["applies_to"] = "Islamic Banks"
+        elif "conventional bank" in text.lower():
+            metadata["applies_to"] = "Conventional Banks"
+        elif "licensee" in text.lower():
+            metadata["applies_to"] = "All Licensees"
+
+        rule_score = sum(
+            1 for indicator in self.rule_indicators if indicator.lower() in text.lower()
+        )
+        if rule_score >= 2:
+            metadata["content_type"] = "Rule"
+        elif "guidance" in text.lower() or "may" in text.lower():
+            metadata["content_type"] = "Guidance"
+        else:
+            metadata["content_type"] = "Unknown"
+
+        metadata["hierarchy_level"] = determine_hierarchy_level(metadata)
+
+        skip_tags = ["Unknown", "Other"]
+        if (
+            metadata.get("content_type") not in skip_tags
+            and metadata.get("volume_type") not in skip_tags
+            and metadata.get("module_category") not in skip_tags
+        ):
+            tags = [
+                metadata[key]
+                for key in (
+                    "volume_type",
+                    "module_category",
+                    "content_type",
+                    "applies_to",
+                    "instrument_type",
+                )
+                if metadata.get(key)
+            ]
+            for term in [
+                "capital",
+                "risk",
+                "compliance",
+                "reporting",
+                "licensing",
+                "governance",
+            ]:
+                if term in text.lower():
+                    tags.append(term.title())
+            metadata["search_tags"] = list(set(tags))
+
+        score = 0.0
+        if metadata.get("content_type") == "Rule":
+            score += 0.3
+        if metadata.get("update_year", 0) >= 2020:
+            score += 0.2
+        if (
+            "enforcement" in text.lower()
+            or "penalty" in text.lower()
+            or "sanction" in text.lower()
+        ):
+            score += 0.2
+        if metadata.get("module_category") == "Prudential":
+            score += 0.2
+        if metadata.get("legal_basis"):
+            score += 0.1
+        metadata["regulatory_importance"] = min(score, 1.0)
+        return metadata
+
+
+def _comparable(metadata: Dict[str, Any]) -> List:
+    """Key order and values, with search tags compared as a set."""
+    return [
+        (key, frozenset(value) if key == "search_tags" else value)
+        for key, value in metadata.items()
+    ]
+
+
+def _time(fn: Callable[[str], Dict[str, Any]], corpus: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=1000, help="Documents in corpus")
+    parser.add_argument("--pages", type=int, default=30, help="Pages per document")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [make_document(rng, args.pages) for _ in range(args.docs)]
+    size_mb = sum(len(text) for text in corpus) / 1e6
+    print(f"Corpus: {args.docs} documents, {size_mb:.1f} MB of text")
+
+    legacy = LegacyExtractor()
+    extractor = RulebookMetadataExtractor()
+
+    mismatches = sum(
+        _comparable(legacy.extract(text))
+        != _comparable(extractor.extract_document_metadata(text))
+        for text in corpus
+    )
+    if mismatches:
+        sys.exit(f"Output mismatch on {mismatches} documents")
+    print("Outputs identical on all documents")
+
+    legacy_s = _time(legacy.extract, corpus, args.repeat)
+    current_s = _time(extractor.extract_document_metadata, corpus, args.repeat)
+    print(f"legacy:   {legacy_s:.3f}s ({args.docs / legacy_s:,.0f} docs/s)")
+    print(f"current:  {current_s:.3f}s ({args.docs / current_s:,.0f} docs/s)")
+    print(f"speedup:  {legacy_s / current_s:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark of query latency versus node count for the vector search backends.
+
+Builds synthetic indexes of random embeddings at several sizes, persists
+them through `index_service` (JSON and, for `--formats mmap`, the compact
+memory-mapped layout), then loads them with `get_hrag_query_engine` and
+`get_traditional_query_engine` under each `VECTOR_BACKEND` and times the
+retrieval step. FAISS recall@k is reported against exact search.
+
+No AWS access is needed: query embeddings are supplied directly and a mock
+LLM is configured for the response synthesizer.
+
+Usage (from the backend directory):
+    python benchmarks/bench_vector_backends.py --nodes 1000 10000 50000
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(BACKEND_DIR / "app"), str(BACKEND_DIR)]
+
+from config.settings import settings
+from llama_index.core import VectorStoreIndex
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.llms import MockLLM
+from llama_index.core.schema import QueryBundle, TextNode
+from llama_index.core.settings import Settings
+from services.bot import index_service
+
+BACKENDS = ["simple", "numpy", "faiss_ivf", "faiss_hnsw"]
+ENGINES = {
+    "hrag": index_service.get_hrag_query_engine,
+    "trad": index_service.get_traditional_query_engine,
+}
+
+
+def build_index(path: str, count: int, dim: int, rng: np.random.Generator) -> None:
+    """Persist an index of `count` nodes with random Gaussian embeddings."""
+    embeddings = rng.standard_normal((count, dim), dtype=np.float32)
+    nodes = [
+        TextNode(
+            text=f"Synthetic rulebook paragraph {i}",
+            metadata={"filename": f"rulebook_vol{i % 7 + 1}.pdf"},
+            embedding=embeddings[i].tolist(),
+        )
+        for i in range(count)
+    ]
+    index_service._persist_index(VectorStoreIndex(nodes), path)
+
+
+def time_engine(loader, path: str, queries, top_k: int):
+    """Load an engine and return (load seconds, latencies in ms, result ids)."""
+    start = time.perf_counter()
+    retriever = loader(path, top_k=top_k).retriever
+    load_s = time.perf_counter() - start
+
+    latencies, results = [], []
+    for embedding in queries:
+        bundle = QueryBundle("benchmark query", embedding=embedding.tolist())
+        start = time.perf_counter()
+        nodes = retriever.retrieve(bundle)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([node.node_id for node in nodes])
+    return load_s, latencies, results
+
+
+def recall(results, reference) -> float:
+    hits = sum(len(set(r) & set(ref)) for r, ref in zip(results, reference))
+    return hits / max(sum(len(ref) for ref in reference), 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--dim", type=int, default=256, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--backends", nargs="+", default=BACKENDS, choices=BACKENDS)
+    parser.add_argument(
+        "--formats", nargs="+", default=["json"], choices=["json", "mmap"]
+    )
+    args = parser.parse_args()
+
+    Settings.embed_model = MockEmbedding(embed_dim=args.dim)
+    Settings.llm = MockLLM()
+    # Exercise FAISS at every size rather than falling back to exact search
+    settings.FAISS_MIN_NODES = 0
+    rng = np.random.default_rng(7)
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+
+    print(
+        f"{'format':<6} {'engine':<6} {'backend':<11} {'nodes':>7} "
+        f"{'load s':>8} {'p50 ms':>8} {'p95 ms':>8} {'recall':>7}"
+    )
+    for storage_format in args.formats:
+        settings.INDEX_STORAGE_FORMAT = storage_format
+        for count in args.nodes:
+            with tempfile.TemporaryDirectory() as path:
+                build_index(path, count, args.dim, rng)
+                for engine_name, loader in ENGINES.items():
+                    reference = None
+                    for backend in args.backends:
+                        settings.VECTOR_BACKEND = backend
+                        load_s, latencies, results = time_engine(
+                            loader, path, queries, args.top_k
+                        )
+                        # Recall is measured against the first exact backend run
+                        if reference is None and not backend.startswith("faiss"):
+                            reference = results
+                        p95 = statistics.quantiles(latencies, n=20)[-1]
+                        print(
+                            f"{storage_format:<6} {engine_name:<6} {backend:<11} "
+                            f"{count:>7} {load_s:>8.2f} "
+                            f"{statistics.median(latencies):>8.2f} {p95:>8.2f} "
+                            f"{recall(results, reference or results):>7.3f}"
+                        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import pytest
+from services.search.hybrid import normalized_score_fusion, reciprocal_rank_fusion
+
+
+def hits(*scored):
+    return [{"_id": hit_id, "_score": score} for hit_id, score in scored]
+
+
+BM25 = hits(("a", 12.0), ("b", 8.0), ("e", 1.0))
+KNN = hits(("b", 0.9), ("c", 0.8), ("d", 0.7))
+
+
+def ids(fused):
+    return [hit["_id"] for hit in fused]
+
+
+def test_rrf_ranks_hits_found_by_both_retrievers_first():
+    fused = reciprocal_rank_fusion([BM25, KNN], [1.0, 1.0], k=60)
+
+    assert ids(fused)[0] == "b"
+    assert fused[0]["_score"] == pytest.approx(1 / 62 + 1 / 61)
+    assert sorted(ids(fused)) == ["a", "b", "c", "d", "e"]
+
+
+def test_rrf_weights_favour_a_retriever():
+    fused = reciprocal_rank_fusion([BM25, KNN], [1.0, 0.0])
+    assert ids(fused)[:3] == ["a", "b", "e"]
+
+
+def test_rrf_ignores_raw_scores():
+    rescaled = [{**hit, "_score": hit["_score"] * 1000} for hit in BM25]
+    assert ids(reciprocal_rank_fusion([rescaled, KNN], [1, 1])) == ids(
+        reciprocal_rank_fusion([BM25, KNN], [1, 1])
+    )
+
+
+def test_normalized_score_fusion():
+    fused = normalized_score_fusion([BM25, KNN], [0.5, 0.5])
+    scores = {hit["_id"]: hit["_score"] for hit in fused}
+
+    # b: BM25 (8 - 1) / 11 and k-NN (0.9 - 0.7) / 0.2
+    assert scores["b"] == pytest.approx(0.5 * 7 / 11 + 0.5)
+    assert scores["a"] == pytest.approx(0.5)
+    assert scores["d"] == scores["e"] == 0
+    assert ids(fused)[0] == "b"
+
+
+def test_normalized_score_fusion_with_equal_scores():
+    fused = normalized_score_fusion([hits(("a", 3.0), ("b", 3.0)), []], [1.0, 1.0])
+    assert [hit["_score"] for hit in fused] == [1.0, 1.0]
+
+
+def test_fusion_keeps_hit_source():
+    bm25 = [{"_id": "a", "_score": 1.0, "_source": {"text": "capital"}}]
+    fused = reciprocal_rank_fusion([bm25, []], [1.0, 1.0])
+    assert fused[0]["_source"] == {"text": "capital"}
@@ -0,0 +1,56 @@
+import pytest
+from services.bot.index_versions import (
+    activate_version,
+    create_version,
+    current_version_path,
+    gc_versions,
+)
+
+
+def make_version(root, name):
+    path = root / "versions" / name
+    path.mkdir(parents=True)
+    (path / "docstore.json").write_text("{}", encoding="utf-8")
+    return path
+
+
+def test_no_index_has_no_current_version(tmp_path):
+    assert current_version_path(tmp_path) is None
+
+
+def test_legacy_root_is_served_until_a_version_is_active(tmp_path):
+    (tmp_path / "docstore.json").write_text("{}", encoding="utf-8")
+    assert current_version_path(tmp_path) == tmp_path
+
+    version = create_version(tmp_path, copy_from=tmp_path)
+    assert (version / "docstore.json").exists()
+    assert not (version / "versions").exists()
+    activate_version(tmp_path, version)
+
+    assert current_version_path(tmp_path) == version
+    gc_versions(tmp_path, retain=2)
+    assert not (tmp_path / "docstore.json").exists()
+
+
+def test_gc_keeps_newest_versions(tmp_path):
+    versions = [make_version(tmp_path, f"2026010{i}-000000-aaaa") for i in range(1, 5)]
+    activate_version(tmp_path, versions[-1])
+
+    gc_versions(tmp_path, retain=2)
+
+    assert [path.exists() for path in versions] == [False, False, True, True]
+
+
+@pytest.mark.parametrize("retain", [1, 2])
+def test_gc_retains_the_serving_version(tmp_path, retain):
+    # A newer version was built but not activated, e.g. its engine swap failed
+    serving = make_version(tmp_path, "20260101-000000-aaaa")
+    make_version(tmp_path, "20260102-000000-bbbb")
+    make_version(tmp_path, "20260103-000000-cccc")
+    activate_version(tmp_path, serving)
+
+    gc_versions(tmp_path, retain=retain)
+
+    assert serving.exists()
+    assert current_version_path(tmp_path) == serving
+    assert len(list((tmp_path / "versions").iterdir())) == retain
@@ -0,0 +1,42 @@
+from services.bot.ingestion_manifest import (
+    diff_manifest,
+    load_manifest,
+    save_manifest,
+)
+
+
+def test_diff_manifest():
+    manifest = {
+        "rulebook_vol1.pdf": {"hash": "h1", "doc_ids": ["d1"]},
+        "rulebook_vol2.pdf": {"hash": "h2", "doc_ids": ["d2"]},
+        "rulebook_vol3.pdf": {"hash": "h3", "doc_ids": ["d3"]},
+    }
+    file_hashes = {
+        "rulebook_vol1.pdf": "h1",
+        "rulebook_vol2.pdf": "h2-new",
+        "rulebook_vol4.pdf": "h4",
+    }
+
+    diff = diff_manifest(manifest, file_hashes)
+
+    assert diff.added == ["rulebook_vol4.pdf"]
+    assert diff.changed == ["rulebook_vol2.pdf"]
+    assert diff.removed == ["rulebook_vol3.pdf"]
+    assert diff.has_changes
+
+
+def test_diff_manifest_without_changes():
+    manifest = {"rulebook_vol1.pdf": {"hash": "h1", "doc_ids": []}}
+    assert not diff_manifest(manifest, {"rulebook_vol1.pdf": "h1"}).has_changes
+
+
+def test_manifest_round_trip(tmp_path):
+    manifest = {"rulebook_vol1.pdf": {"hash": "h1", "doc_ids": ["d1", "d2"]}}
+    save_manifest(str(tmp_path), manifest)
+    assert load_manifest(str(tmp_path)) == manifest
+
+
+def test_missing_or_unreadable_manifest_is_empty(tmp_path):
+    assert load_manifest(str(tmp_path)) == {}
+    (tmp_path / "ingestion_manifest.json").write_text("{", encoding="utf-8")
+    assert load_manifest(str(tmp_path)) == {}
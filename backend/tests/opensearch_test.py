@@ -0,0 +1,63 @@
+from opensearchpy import ConnectionError as OpenSearchConnectionError
+from opensearchpy import TransportError
+from services.stores.opensearch import (
+    _bulk_item_failures,
+    _bulk_request_failures,
+    _has_knn_field,
+)
+
+BATCH = [("c1", b"1"), ("c2", b"2"), ("c3", b"3")]
+
+
+def test_bulk_without_errors_has_no_failures():
+    response = {"errors": False, "items": [{"index": {"status": 201}}] * 3}
+    assert _bulk_item_failures(BATCH, response) == ([], [])
+
+
+def test_bulk_item_failures_split_retryable_from_permanent():
+    response = {
+        "errors": True,
+        "items": [
+            {"index": {"status": 201}},
+            {"index": {"status": 429, "error": "too many requests"}},
+            {"index": {"status": 400, "error": "mapper_parsing_exception"}},
+        ],
+    }
+
+    retry, errors = _bulk_item_failures(BATCH, response)
+
+    assert retry == [(("c2", b"2"), "too many requests")]
+    assert errors == [("c3", "mapper_parsing_exception")]
+
+
+def test_bulk_request_failures():
+    retry, errors = _bulk_request_failures(BATCH, TransportError(503, "unavailable"))
+    assert [item for item, _ in retry] == BATCH and errors == []
+
+    retry, errors = _bulk_request_failures(
+        BATCH, OpenSearchConnectionError("N/A", "refused", None)
+    )
+    assert len(retry) == 3
+
+    retry, errors = _bulk_request_failures(BATCH, TransportError(400, "bad request"))
+    assert retry == [] and [chunk_id for chunk_id, _ in errors] == ["c1", "c2", "c3"]
+
+
+def mapping(embedding_type):
+    properties = {"text": {"type": "text"}}
+    if embedding_type:
+        properties["embedding"] = {"type": embedding_type, "dimension": 1024}
+    return {"mappings": {"properties": properties}}
+
+
+def test_has_knn_field():
+    assert _has_knn_field({"docs": mapping("knn_vector")})
+    # Indexes created before hybrid search: dynamically mapped or unmapped
+    assert not _has_knn_field({"docs": mapping("float")})
+    assert not _has_knn_field({"docs": mapping(None)})
+    assert not _has_knn_field({})
+
+
+def test_has_knn_field_requires_every_aliased_index():
+    response = {"docs-v1": mapping("float"), "docs-v2": mapping("knn_vector")}
+    assert not _has_knn_field(response)
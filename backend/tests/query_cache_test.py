@@ -0,0 +1,135 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from services.bot import query_cache as query_cache_module
+from services.bot.query_cache import QueryResponseCache, normalize_query
+
+
+@pytest.fixture
+def fx_cache():
+    return QueryResponseCache(
+        max_entries=3, ttl_seconds=60.0, similarity_threshold=0.95
+    )
+
+
+@pytest.fixture
+def fx_semantic_cache(monkeypatch):
+    vectors = {
+        "what is capital": [1.0, 0.0],
+        "define capital": [0.99, 0.14],
+        "what is leverage": [0.6, 0.8],
+    }
+
+    class FakeEmbedModel:
+        async def aget_query_embedding(self, query):
+            return vectors[normalize_query(query)]
+
+    settings = SimpleNamespace(embed_model=FakeEmbedModel())
+    monkeypatch.setattr(query_cache_module, "Settings", settings)
+    return QueryResponseCache(
+        max_entries=3,
+        ttl_seconds=60.0,
+        similarity_threshold=0.95,
+        semantic_enabled=True,
+    )
+
+
+def lookup(cache, engine_type, query):
+    return asyncio.run(cache.alookup(engine_type, query))
+
+
+def store_with_embedding(cache, engine_type, query, response):
+    result = lookup(cache, engine_type, query)
+    return cache.store(engine_type, query, response, result.version, result.embedding)
+
+
+def test_normalize_query():
+    assert normalize_query("  What IS   Capital?? ") == "what is capital"
+
+
+def test_exact_hit_ignores_case_and_punctuation(fx_cache):
+    version = lookup(fx_cache, "HRAG", "What is capital?").version
+    assert fx_cache.store("HRAG", "What is capital?", "answer", version)
+
+    result = lookup(fx_cache, "HRAG", "what is capital")
+    assert result.response == "answer"
+    assert lookup(fx_cache, "TradRAG", "what is capital").response is None
+
+
+def test_semantic_tier_is_off_by_default(fx_cache):
+    assert fx_cache.semantic_enabled is False
+
+
+def test_near_duplicate_query_is_a_semantic_hit(fx_semantic_cache):
+    store_with_embedding(fx_semantic_cache, "HRAG", "What is capital?", "answer")
+
+    result = lookup(fx_semantic_cache, "HRAG", "Define capital")
+
+    assert result.response == "answer"
+    assert result.embedding is not None
+
+
+def test_query_below_similarity_threshold_misses(fx_semantic_cache):
+    store_with_embedding(fx_semantic_cache, "HRAG", "What is capital?", "answer")
+
+    assert lookup(fx_semantic_cache, "HRAG", "What is leverage?").response is None
+
+
+def test_invalidate_drops_semantic_entries(fx_semantic_cache):
+    store_with_embedding(fx_semantic_cache, "HRAG", "What is capital?", "answer")
+
+    fx_semantic_cache.invalidate("HRAG")
+
+    assert lookup(fx_semantic_cache, "HRAG", "Define capital").response is None
+    assert lookup(fx_semantic_cache, "HRAG", "What is capital?").response is None
+
+
+def test_store_after_index_swap_is_rejected(fx_cache):
+    # A query answered from the old index finishes after the engine swap
+    in_flight = lookup(fx_cache, "HRAG", "capital")
+    fx_cache.invalidate("HRAG")
+
+    assert not fx_cache.store("HRAG", "capital", "stale", in_flight.version)
+    assert lookup(fx_cache, "HRAG", "capital").response is None
+
+
+def test_invalidate_drops_entries_of_engine_only(fx_cache):
+    fx_cache.store("HRAG", "q", "hrag answer", lookup(fx_cache, "HRAG", "q").version)
+    fx_cache.store(
+        "TradRAG", "q", "trad answer", lookup(fx_cache, "TradRAG", "q").version
+    )
+
+    fx_cache.invalidate("HRAG")
+
+    assert lookup(fx_cache, "HRAG", "q").response is None
+    assert lookup(fx_cache, "TradRAG", "q").response == "trad answer"
+
+
+def test_sources_are_replayed(fx_cache):
+    sources = [{"node_id": "n1", "filename": "rulebook_vol1.pdf"}]
+    fx_cache.store("HRAG", "q", "answer", 0, sources=sources)
+
+    assert lookup(fx_cache, "HRAG", "q").sources == sources
+
+
+def test_least_recently_used_entry_is_evicted(fx_cache):
+    for query in ("a", "b", "c"):
+        fx_cache.store("HRAG", query, query.upper(), 0)
+    lookup(fx_cache, "HRAG", "a")  # "b" is now the least recently used
+
+    fx_cache.store("HRAG", "d", "D", 0)
+
+    assert lookup(fx_cache, "HRAG", "b").response is None
+    assert [lookup(fx_cache, "HRAG", q).response for q in "acd"] == ["A", "C", "D"]
+
+
+def test_expired_entries_are_not_served(fx_cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(query_cache_module.time, "monotonic", lambda: now[0])
+    fx_cache.store("HRAG", "q", "answer", 0)
+
+    now[0] += 59
+    assert lookup(fx_cache, "HRAG", "q").response == "answer"
+    now[0] += 2
+    assert lookup(fx_cache, "HRAG", "q").response is None
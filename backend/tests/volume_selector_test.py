@@ -0,0 +1,100 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from services.bot import volume_selector
+from services.bot.volume_metadata import VOLUMES
+from services.bot.volume_selector import (
+    _parse_batched_scores,
+    _parse_score,
+    _select_top_volumes,
+)
+
+
+class FakeLLM:
+    """Sync-only LLM, like Bedrock: `acomplete` is not implemented."""
+
+    def __init__(self, complete):
+        self._complete = complete
+
+    def complete(self, prompt):
+        return SimpleNamespace(text=self._complete(prompt))
+
+    async def acomplete(self, prompt):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def fx_llm(monkeypatch):
+    def install(complete):
+        settings = SimpleNamespace(llm=FakeLLM(complete))
+        monkeypatch.setattr(volume_selector, "Settings", settings)
+
+    return install
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("0.8", 0.8), ("Score: 1.0\n", 1.0), (".5", 0.5), ("no score", 0.0)],
+)
+def test_parse_score(text, expected):
+    assert _parse_score(text) == expected
+
+
+def test_select_top_volumes_orders_by_score():
+    scored = [("a", 0.2), ("b", 0.9), ("c", 0.5), ("d", 0.7)]
+    assert _select_top_volumes(scored, 3) == [("b", 0.9), ("d", 0.7), ("c", 0.5)]
+
+
+def test_select_top_volumes_drops_weak_matches_after_certain_match():
+    scored = [("a", 1.0), ("b", 0.7), ("c", 0.8), ("d", 0.2)]
+    assert _select_top_volumes(scored, 3) == [("a", 1.0), ("c", 0.8)]
+
+
+def test_parse_batched_scores_strips_code_fences():
+    scores = [0.1] * len(VOLUMES)
+    text = "```json\n" + str(scores) + "\n```"
+    assert _parse_batched_scores(text) == scores
+
+
+def test_parse_batched_scores_rejects_wrong_length():
+    with pytest.raises(ValueError):
+        _parse_batched_scores("[0.5]")
+
+
+def test_volumes_are_scored_with_sync_llm(fx_llm):
+    best = VOLUMES[-1]["name"]
+    fx_llm(lambda prompt: "0.9" if best in prompt else "0.1")
+
+    top = asyncio.run(volume_selector.ascore_volumes_with_llm("query", 3))
+
+    assert top[0] == (VOLUMES[-1], 0.9)
+
+
+def test_failed_volume_scores_are_counted(fx_llm, caplog):
+    def complete(prompt):
+        raise RuntimeError("throttled")
+
+    fx_llm(complete)
+
+    top = asyncio.run(volume_selector.ascore_volumes_with_llm("query", 3))
+
+    assert [score for _, score in top] == [0.0, 0.0, 0.0]
+    assert f"for {len(VOLUMES)} of {len(VOLUMES)} volumes" in caplog.text
+
+
+def test_batched_ranking_uses_one_call(fx_llm):
+    prompts = []
+    scores = [0.1] * len(VOLUMES)
+    scores[2] = 0.8
+
+    def complete(prompt):
+        prompts.append(prompt)
+        return str(scores)
+
+    fx_llm(complete)
+
+    top = asyncio.run(volume_selector.ascore_volumes_batched("query", 1))
+
+    assert top == [(VOLUMES[2], 0.8)]
+    assert len(prompts) == 1